@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark of the calevent id allocation.
+
+The insertion time per event should not depend on the number of events
+already stored. For comparison, the former allocation (max(ids) + 1) is
+also timed on smaller sizes since it is quadratic.
+
+Usage: python -m benchmarks.calevent_ids
+"""
+
+from datetime import date, timedelta
+from timeit import default_timer
+
+from tkcalendar.eventstore import EventStore
+
+START = date(2000, 1, 1)
+
+
+def bench_store(n):
+    store = EventStore()
+    t0 = default_timer()
+    for i in range(n):
+        store.add(START + timedelta(days=i % 3650), 'event', [])
+    return default_timer() - t0
+
+
+def bench_max_id(n):
+    events = {}
+    t0 = default_timer()
+    for i in range(n):
+        ev_id = max(events) + 1 if events else 0
+        events[ev_id] = {'date': START + timedelta(days=i % 3650), 'text': 'event', 'tags': []}
+    return default_timer() - t0
+
+
+if __name__ == '__main__':
+    print('%10s %12s %16s' % ('events', 'total (s)', 'per event (µs)'))
+    print('EventStore.add')
+    for n in (10000, 100000, 1000000):
+        t = bench_store(n)
+        print('%10i %12.3f %16.3f' % (n, t, t / n * 1e6))
+    print('max(ids) + 1')
+    for n in (1000, 10000, 20000):
+        t = bench_max_id(n)
+        print('%10i %12.3f %16.3f' % (n, t, t / n * 1e6))
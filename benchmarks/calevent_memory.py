@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark of the memory used by the calevent records.
+
+The former records ({'date': ..., 'text': ..., 'tags': [...]} dictionaries)
+are compared to the CalEvent records with shared tag tuples. The dates and
+texts are shared between the events so that only the records are measured.
+
+Usage: python -m benchmarks.calevent_memory
+"""
+
+import tracemalloc
+from datetime import date, timedelta
+
+from tkcalendar.eventstore import CalEvent
+
+START = date(2000, 1, 1)
+DATES = [START + timedelta(days=i) for i in range(3650)]
+TAGS = [['birthday'], ['holiday', 'family'], ['work'], []]
+
+
+def measure(make_records, n):
+    """Return the memory in bytes allocated by make_records(n)."""
+    tracemalloc.start()
+    records = make_records(n)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def dict_records(n):
+    return {i: {'date': DATES[i % 3650], 'text': 'event', 'tags': list(TAGS[i % 4])}
+            for i in range(n)}
+
+
+def calevent_records(n):
+    tag_tuples = {}
+    records = {}
+    for i in range(n):
+        tags = tuple(TAGS[i % 4])
+        records[i] = CalEvent(DATES[i % 3650], 'event', tag_tuples.setdefault(tags, tags))
+    return records
+
+
+if __name__ == '__main__':
+    print('%10s %16s %18s %10s' % ('events', 'dict (B/event)', 'CalEvent (B/event)', 'ratio'))
+    for n in (10000, 100000, 500000):
+        old = measure(dict_records, n)
+        new = measure(calevent_records, n)
+        print('%10i %16.1f %18.1f %10.2f' % (n, old / n, new / n, old / new))
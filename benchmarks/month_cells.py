@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark of the computation of the displayed cells, without display.
+
+The CalendarModel goes through the months of ten years with see() and
+next_month(), like the widget, for stores with an increasing number of
+events spread over the ten years. The display tags of the event days are
+read from the index kept up to date by the store, so the first display
+of a month costs the same as the next ones.
+
+Usage: python -m benchmarks.month_cells
+"""
+
+import timeit
+from datetime import date, timedelta
+
+from tkcalendar.model import CalendarModel
+
+START = date(2010, 1, 1)
+TAGS = [['birthday'], ['holiday', 'family'], ['work'], []]
+
+
+def make_model(n):
+    model = CalendarModel(2010, 1, selection=START)
+    model.store.add_many([(START + timedelta(days=i % 3650), 'event', TAGS[i % 4], None, None)
+                          for i in range(n)])
+    return model
+
+
+def display_months(model):
+    model.see(START)
+    model.cells()
+    for i in range(119):
+        model.next_month()
+        model.cells()
+
+
+if __name__ == '__main__':
+    print('%10s %20s' % ('events', 'µs per month'))
+    for n in (0, 1000, 10000, 100000):
+        model = make_model(n)
+        duration = min(timeit.repeat(lambda: display_months(model), number=5, repeat=3)) / 5 / 120
+        print('%10i %20.1f' % (n, duration * 1e6))
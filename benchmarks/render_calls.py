@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark of the cost of sending the widget updates of a redraw to Tcl.
+
+A Calendar goes through the months of ten years with _next_month, once
+sending all the commands of a month change in a single
+::tkcalendar::eval_commands call, as it does, and once with a subclass
+sending each command with its own call. The idle tasks are processed
+after each month change so that the time includes the redraw of the
+labels. A display is needed.
+
+Usage: python -m benchmarks.render_calls
+"""
+
+import timeit
+import tkinter as tk
+from contextlib import contextmanager
+from datetime import date
+
+from tkcalendar import Calendar
+
+MONTHS = 120
+
+
+class CountingCalendar(Calendar):
+    """Calendar counting the Tcl commands of its display updates."""
+    nb_commands = 0
+
+    def _tk_command(self, *args):
+        CountingCalendar.nb_commands += 1
+        Calendar._tk_command(self, *args)
+
+
+class UnbatchedCalendar(CountingCalendar):
+    """Calendar sending each Tcl command with its own call."""
+    @contextmanager
+    def _tk_batch(self):
+        yield
+
+
+def go_through_months(cal):
+    cal.selection_clear()
+    cal.see(date(2010, 1, 1))
+    cal.update_idletasks()
+    for i in range(MONTHS):
+        cal._next_month()
+        cal.update_idletasks()
+
+
+if __name__ == '__main__':
+    root = tk.Tk()
+    print('%24s %18s %14s' % ('', 'commands per change', 'µs per change'))
+    for name, cls in [('one call per change', CountingCalendar),
+                      ('one call per command', UnbatchedCalendar)]:
+        cal = cls(root, year=2010, month=1, day=1)
+        cal.pack()
+        root.update()
+        go_through_months(cal)  # warm up the caches
+        CountingCalendar.nb_commands = 0
+        duration = min(timeit.repeat(lambda: go_through_months(cal), number=1, repeat=5))
+        nb_commands = CountingCalendar.nb_commands / 5 / (MONTHS + 1)
+        print('%24s %18.1f %14.1f' % (name, nb_commands, duration / (MONTHS + 1) * 1e6))
+        cal.destroy()
+    root.destroy()
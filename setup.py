@@ -29,6 +29,12 @@ setup(name='tkcalendar',
       keywords=['tkinter', 'calendar', 'date'],
       install_requires=["babel"],
       py_modules=["tkcalendar.calendar_",
+                  "tkcalendar.canvascalendar",
                   "tkcalendar.dateentry",
+                  "tkcalendar.eventstore",
+                  "tkcalendar.ical",
+                  "tkcalendar.model",
+                  "tkcalendar.recurrence",
+                  "tkcalendar.sqlitestore",
                   "tkcalendar.tooltip"],
       packages=["tkcalendar"])
@@ -21,8 +21,14 @@ Test
 
 
 from tests import BaseWidgetTest, TestEvent, tk, ttk, format_date
-from tkcalendar import Calendar
+from tkcalendar import Calendar, DateEntry, Recurrence, EventStore, SQLiteEventStore
+from tkcalendar.model import CalendarModel
 from datetime import date, datetime
+import os
+import shutil
+import tempfile
+import threading
+import time
 from babel import UnknownLocaleError
 
 
@@ -316,10 +322,14 @@ class TestCalendar(BaseWidgetTest):
                    'headersforeground',
                    'disableddaybackground',
                    'disableddayforeground',
+                   'sharedstyle',
                    'tooltipbackground',
                    'tooltipforeground',
                    'tooltipalpha',
-                   'tooltipdelay']
+                   'tooltipdelay',
+                   'eventprovider',
+                   'eventproviderworkers',
+                   'eventstore']
 
         self.assertEqual(sorted(widget.keys()), sorted(options))
 
@@ -446,6 +456,12 @@ class TestCalendar(BaseWidgetTest):
         self.assertEqual(widget["date_pattern"], 'MM/dd/yyyy')
         with self.assertRaises(ValueError):
             widget.config(date_pattern="mm-dd-cc")
+        # "short" is resolved with the locale given in the same call
+        locale = widget['locale']
+        widget.configure(locale='fr_FR', date_pattern='short')
+        self.assertEqual(widget["date_pattern"], 'dd/MM/y')
+        widget.configure(locale=locale, date_pattern='MM/dd/yyyy')
+        self.assertEqual(widget["date_pattern"], 'MM/dd/yyyy')
         with self.assertRaises(AttributeError):
             widget.config(test="test")
         dic = {op: "yellow" for op in options[12:-4]}
@@ -487,6 +503,17 @@ class TestCalendar(BaseWidgetTest):
                                               date=evdate + widget.timedelta(days=-2)), ())
         with self.assertRaises(TypeError):
             widget.get_calevents(date='12/12/2012')
+        self.assertEqual(widget.get_calevents(start=evdate), (0, 1, 3))
+        self.assertEqual(widget.get_calevents(end=evdate), (2, 0, 1))
+        self.assertEqual(widget.get_calevents(start=evdate + widget.timedelta(days=-2),
+                                              end=datetime.combine(evdate, datetime.min.time())),
+                         (2, 0, 1))
+        self.assertEqual(widget.get_calevents(start=evdate, tag='message'), (0, 3))
+        self.assertEqual(widget.get_calevents(start=evdate + widget.timedelta(days=4)), ())
+        with self.assertRaises(TypeError):
+            widget.get_calevents(start='12/12/2012')
+        with self.assertRaises(TypeError):
+            widget.get_calevents(end='12/12/2012')
 
         # cget / configure
         self.assertEqual(widget.calevent_cget(1, 'tags'), ['reminder'])
@@ -544,9 +571,19 @@ class TestCalendar(BaseWidgetTest):
             widget.tag_cget('test', 'text')
         with self.assertRaises(ValueError):
             widget.tag_delete('birthday')
+        widget.calevent_configure(3, tags=['reminder', 'message'])
+        self.assertEqual(widget.get_calevents(tag='message'), (0, 3))
+        w, d = widget._get_day_coords(evdate + widget.timedelta(days=5))
+        if w is not None:
+            self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('message'))
         widget.tag_delete('message')
         self.assertEqual(set(widget.tag_names()), set(('new', 'reminder', 'test')))
         self.assertEqual(widget.calevent_cget(0, 'tags'), [])
+        self.assertEqual(widget.calevent_cget(3, 'tags'), ['reminder'])
+        self.assertEqual(widget.get_calevents(tag='message'), ())
+        if w is not None:
+            self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('reminder'))
+        widget.calevent_configure(3, tags=[])
 
         # remove
         widget.calevent_remove(0)
@@ -570,6 +607,702 @@ class TestCalendar(BaseWidgetTest):
         widget.calevent_remove('all')
         self.assertEqual(widget.get_calevents(), ())
 
+    def test_calendar_calevents_bulk(self):
+        widget = Calendar(self.window, year=2019, month=7, day=1)
+        widget.pack()
+        self.window.update()
+        evdate = date(2019, 7, 10)
+        ev_ids = widget.calevent_create_many([(evdate, 'Hello World', 'message'),
+                                              (datetime(2019, 7, 12, 10), 'Reminder', ['reminder', 'test']),
+                                              (evdate, 'No tag')])
+        self.assertEqual(ev_ids, [0, 1, 2])
+        self.assertEqual(widget.get_calevents(date=evdate), (0, 2))
+        self.assertEqual(widget.calevent_cget(1, 'date'), date(2019, 7, 12))
+        self.assertEqual(widget.calevent_cget(1, 'tags'), ['reminder', 'test'])
+        self.assertEqual(widget.calevent_cget(2, 'tags'), [])
+        self.assertEqual(set(widget.tag_names()), set(('message', 'reminder', 'test')))
+        w, d = widget._get_day_coords(evdate)
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('message'))
+        self.assertEqual(widget.calevent_create_many([]), [])
+        with self.assertRaises(TypeError):
+            widget.calevent_create_many([('12/12/2012', 'a')])
+        self.assertEqual(widget.get_calevents(), (0, 1, 2))
+
+        widget.calevent_remove_many([0, 2, 7])
+        self.assertEqual(widget.get_calevents(), (1,))
+        self.assertNotIn(evdate, widget._calevent_dates)
+        self.assertNotEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('message'))
+        widget.calevent_create_many([(evdate, 'a'), (evdate, 'b')])
+        widget.calevent_remove('all')
+        self.assertEqual(widget.get_calevents(), ())
+
+    def test_calendar_calevents_recurrence(self):
+        widget = Calendar(self.window, year=2019, month=7, day=1)
+        widget.pack()
+        self.window.update()
+        ev0 = widget.calevent_create(date(2019, 7, 3), 'Single', 'single')
+        ev1 = widget.calevent_create(date(2019, 7, 1), 'Weekly', 'weekly',
+                                     recurrence=Recurrence('weekly', byweekday=[0, 2]))
+        self.assertEqual(widget.calevent_cget(ev1, 'recurrence'), Recurrence('weekly', byweekday=[0, 2]))
+        self.assertIsNone(widget.calevent_cget(ev0, 'recurrence'))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 3)), (ev0, ev1))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 17)), (ev1,))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 18)), ())
+        self.assertEqual(widget.get_calevents(start=date(2019, 7, 2), end=date(2019, 7, 10)), (ev0, ev1))
+        self.assertEqual(widget.get_calevents(tag='weekly'), (ev1,))
+        w, d = widget._get_day_coords(date(2019, 7, 17))
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('weekly'))
+        self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        with self.assertRaises(TypeError):
+            widget.calevent_create(date(2019, 7, 1), 'a', recurrence='weekly')
+        with self.assertRaises(ValueError):
+            widget.calevent_raise(ev1)
+        with self.assertRaises(ValueError):
+            widget.calevent_lower(ev1)
+
+        widget.calevent_configure(ev1, recurrence=Recurrence('weekly', byweekday=[0]))
+        self.assertNotEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('weekly'))
+        self.assertIsNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 15)), (ev1,))
+        widget.calevent_configure(ev1, date=date(2019, 7, 2))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 1)), ())
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 8)), (ev1,))
+        widget.calevent_configure(ev1, recurrence=None)
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 8)), ())
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 2)), (ev1,))
+        widget.calevent_configure(ev0, recurrence=Recurrence('daily', count=2))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 4)), (ev0,))
+        widget.tag_delete('single')
+        self.assertEqual(widget.calevent_cget(ev0, 'tags'), [])
+        w, d = widget._get_day_coords(date(2019, 7, 4))
+        self.assertNotEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('single'))
+        widget.calevent_remove(ev0)
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 4)), ())
+        self.assertIsNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+
+    def test_calendar_calevents_enddate(self):
+        widget = Calendar(self.window, year=2019, month=7, day=1)
+        widget.pack()
+        self.window.update()
+        ev0 = widget.calevent_create(date(2019, 7, 3), 'Single', 'single')
+        ev1 = widget.calevent_create(date(2019, 7, 1), 'Vacation', 'vacation',
+                                     enddate=datetime(2019, 7, 14, 18))
+        self.assertEqual(widget.calevent_cget(ev1, 'enddate'), date(2019, 7, 14))
+        self.assertIsNone(widget.calevent_cget(ev0, 'enddate'))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 3)), (ev0, ev1))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 14)), (ev1,))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 15)), ())
+        self.assertEqual(widget.get_calevents(start=date(2019, 7, 2), end=date(2019, 7, 10)), (ev1, ev0))
+        self.assertEqual(widget.get_calevents(tag='vacation'), (ev1,))
+        for day in (1, 3, 14):
+            w, d = widget._get_day_coords(date(2019, 7, day))
+            self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('vacation'))
+            self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        with self.assertRaises(ValueError):
+            widget.calevent_create(date(2019, 7, 1), 'a', enddate=date(2019, 6, 30))
+        with self.assertRaises(ValueError):
+            widget.calevent_create(date(2019, 7, 1), 'a', recurrence=Recurrence(), enddate=date(2019, 7, 2))
+        with self.assertRaises(TypeError):
+            widget.calevent_create(date(2019, 7, 1), 'a', enddate='2019-07-02')
+        with self.assertRaises(ValueError):
+            widget.calevent_raise(ev1)
+
+        # move the whole event
+        widget.calevent_configure(ev1, date=date(2019, 7, 8))
+        self.assertEqual(widget.calevent_cget(ev1, 'enddate'), date(2019, 7, 21))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 3)), (ev0,))
+        w, d = widget._get_day_coords(date(2019, 7, 1))
+        self.assertNotEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('vacation'))
+        self.assertIsNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        w, d = widget._get_day_coords(date(2019, 7, 21))
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('vacation'))
+        widget.calevent_configure(ev1, enddate=date(2019, 7, 9))
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 10)), ())
+        widget.calevent_configure(ev0, date=date(2019, 7, 30), enddate=date(2019, 8, 2))
+        self.assertEqual(widget.get_calevents(date=date(2019, 8, 1)), (ev0,))
+        widget.calevent_configure(ev0, enddate=None)
+        self.assertEqual(widget.get_calevents(date=date(2019, 8, 1)), ())
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 30)), (ev0,))
+        widget.calevent_remove(ev1)
+        self.assertEqual(widget.get_calevents(date=date(2019, 7, 8)), ())
+        w, d = widget._get_day_coords(date(2019, 7, 8))
+        self.assertIsNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+
+    def test_calendar_eventprovider(self):
+        calls = []
+
+        def provider(start, end):
+            calls.append((start, end))
+            return [(date(2019, 7, 3), 'Provided', 'provided'),
+                    (datetime(2019, 7, 10, 12), 'Meeting'),
+                    (date(2019, 7, 15), 'Phase', [], None, date(2019, 7, 17))]
+
+        widget = Calendar(self.window, year=2019, month=7, day=1, eventprovider=provider)
+        widget.pack()
+        self.window.update()
+        self.assertEqual(calls, [(date(2019, 7, 1), date(2019, 8, 11))])
+        self.assertIn('provided', widget.tag_names())
+        # provided events are displayed but are not calendar events
+        self.assertEqual(widget.get_calevents(), ())
+        w, d = widget._get_day_coords(date(2019, 7, 3))
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('provided'))
+        self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        w, d = widget._get_day_coords(date(2019, 7, 16))
+        self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        widget.tag_config('local', background='red')
+        ev = widget.calevent_create(date(2019, 7, 3), 'Local', 'local')
+        w, d = widget._get_day_coords(date(2019, 7, 3))
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('local'))
+        widget.calevent_remove(ev)
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('provided'))
+        self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+
+        # results are cached per month
+        widget._next_month()
+        widget._prev_month()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[-1], (date(2019, 7, 29), date(2019, 9, 8)))
+        self.assertEqual(list(widget._provided), [(2019, 8), (2019, 7)])
+        widget.eventprovider_invalidate(2019, 9)
+        self.assertEqual(list(widget._provided), [(2019, 7)])
+        widget.eventprovider_invalidate(2019, 7)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(list(widget._provided), [(2019, 7)])
+        widget.eventprovider_invalidate(2018)
+        self.assertEqual(len(calls), 3)
+        widget.eventprovider_invalidate()
+        self.assertEqual(len(calls), 4)
+
+        # the cache is bounded
+        for i in range(widget.eventprovider_cache_size + 2):
+            widget._next_month()
+        self.assertEqual(len(widget._provided), widget.eventprovider_cache_size)
+
+        widget['eventprovider'] = None
+        self.assertEqual(len(widget._provided), 0)
+        self.assertEqual(set(widget.tooltip_wrapper.widgets.values()), {None})
+        with self.assertRaises(TypeError):
+            widget['eventprovider'] = 'provider'
+
+    def test_calendar_eventprovider_workers(self):
+        release = threading.Event()
+        threads = []
+
+        def provider(start, end):
+            threads.append(threading.current_thread())
+            if end.month == 8:  # july
+                release.wait(5)
+            return [(start, 'Provided', 'provided')]
+
+        def wait_loading(widget):
+            t = time.time()
+            while widget._provider_pending and time.time() - t < 5:
+                self.window.update()
+                time.sleep(0.01)
+
+        widget = Calendar(self.window, year=2019, month=6, day=1, eventprovider=provider,
+                          eventproviderworkers=2)
+        widget.pack()
+        self.window.update()
+        # the month is displayed before the events are loaded
+        self.assertEqual(set(widget.tooltip_wrapper.widgets.values()), {None})
+        wait_loading(widget)
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertEqual(list(widget._provided), [(2019, 6)])
+        self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[0][0])])
+        self.assertEqual(widget._calendar[0][0].cget('style'), widget._tag_styles.get('provided'))
+
+        # stale results are dropped
+        widget._next_month()
+        self.assertIn((2019, 7), widget._provider_pending)
+        widget._next_month()
+        self.assertNotIn((2019, 7), widget._provider_pending)
+        release.set()
+        wait_loading(widget)
+        self.window.update()
+        self.assertEqual(list(widget._provided), [(2019, 6), (2019, 8)])
+
+        with self.assertRaises(ValueError):
+            widget['eventproviderworkers'] = -1
+        widget['eventproviderworkers'] = 0
+        widget._prev_month()
+        self.assertEqual(list(widget._provided), [(2019, 6), (2019, 8), (2019, 7)])
+        widget.destroy()
+        self.assertIsNone(widget._provider_executor)
+
+    def test_calendar_eventstore(self):
+        tmpdir = tempfile.mkdtemp()
+        filename = os.path.join(tmpdir, 'events.db')
+        try:
+            store = SQLiteEventStore(filename)
+            widget = Calendar(self.window, year=2019, month=7, day=1, eventstore=store)
+            widget.pack()
+            self.window.update()
+            evdate = date(2019, 7, 10)
+            ev0 = widget.calevent_create(evdate, 'Hello', 'message')
+            ev1, ev2 = widget.calevent_create_many([(evdate, 'World'),
+                                                    (date(2019, 7, 20), 'Vacation', 'vacation',
+                                                     None, date(2019, 7, 25))])
+            widget.calevent_raise(ev1)
+            self.assertEqual(widget._calevent_dates[evdate], [ev1, ev0])
+            widget.calevent_configure(ev0, text='Hi')
+            self.assertEqual(widget.calevent_cget(ev0, 'text'), 'Hi')
+            self.assertEqual(widget.get_calevents(tag='vacation'), (ev2,))
+            w, d = widget._get_day_coords(evdate)
+            self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('message'))
+            self.assertIs(widget['eventstore'], store)
+            widget.destroy()
+            store.close()
+
+            # the events are still there in a new session
+            store = SQLiteEventStore(filename)
+            widget = Calendar(self.window, year=2019, month=7, day=1, eventstore=store)
+            widget.pack()
+            self.window.update()
+            self.assertEqual(widget.get_calevents(), (ev0, ev1, ev2))
+            self.assertEqual(widget.get_calevents(date=date(2019, 7, 22)), (ev2,))
+            self.assertEqual(widget.calevent_cget(ev0, 'text'), 'Hi')
+            self.assertEqual(set(widget.tag_names()), {'message', 'vacation'})
+            w, d = widget._get_day_coords(evdate)
+            self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('message'))
+            self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+
+            widget['eventstore'] = EventStore()
+            self.assertEqual(widget.get_calevents(), ())
+            self.assertIsNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+            with self.assertRaises(TypeError):
+                widget['eventstore'] = {}
+            store.close()
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_calendar_calevent_import(self):
+        consumed = []
+        result = []
+
+        def events():
+            for i in range(25):
+                consumed.append(i)
+                yield date(2019, 7, 1 + i), 'Event %i' % i, 'imported'
+
+        widget = Calendar(self.window, year=2019, month=7, day=1)
+        widget.pack()
+        self.window.update()
+        widget.calevent_import(events(), chunksize=10, callback=result.append)
+        # nothing is added before the GUI is idle
+        self.assertEqual(consumed, [])
+        self.assertEqual(widget.get_calevents(), ())
+        t = time.time()
+        while not result and time.time() - t < 5:
+            self.window.update()
+        self.assertEqual(result, [list(range(25))])
+        self.assertEqual(widget.get_calevents(tag='imported'), tuple(range(25)))
+        w, d = widget._get_day_coords(date(2019, 7, 25))
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('imported'))
+
+        with self.assertRaises(ValueError):
+            widget.calevent_import([], chunksize=0)
+        # pending imports are cancelled on destruction
+        widget.calevent_import(events(), chunksize=10)
+        del consumed[:]
+        widget.destroy()
+        self.window.update()
+        self.assertEqual(consumed, [])
+
+    def test_calendar_tooltip_text(self):
+        widget = Calendar(self.window, year=2019, month=7, day=1)
+        widget.pack()
+        self.window.update()
+        evdate = date(2019, 7, 10)
+        widget.calevent_create_many([(evdate, 'a'), (evdate, 'b'), (date(2019, 7, 11), 'c')])
+        w, d = widget._get_day_coords(evdate)
+        name = str(widget._calendar[w][d])
+        # the text is only built when the tooltip is displayed
+        self.assertTrue(callable(widget.tooltip_wrapper.widgets[name]))
+        self.assertEqual(widget._tooltip_texts, {})
+        self.assertEqual(widget.tooltip_wrapper.widgets[name](), '➢ a\n➢ b')
+        self.assertEqual(widget._tooltip_texts, {evdate: '➢ a\n➢ b'})
+        # the cached text is kept when redisplaying the month
+        redraws = widget._redraw_count
+        widget.configure(showothermonthdays=False)
+        self.assertEqual(widget._redraw_count, redraws + 1)
+        self.assertEqual(widget._tooltip_texts, {evdate: '➢ a\n➢ b'})
+        # and discarded when changing month
+        widget._next_month()
+        widget._prev_month()
+        self.assertEqual(widget._tooltip_texts, {})
+        self.assertEqual(widget.tooltip_wrapper.widgets[name](), '➢ a\n➢ b')
+        # or when the events of the day change
+        ev_id = widget.calevent_create(evdate, 'c')
+        self.assertEqual(widget._tooltip_texts, {})
+        self.assertEqual(widget.tooltip_wrapper.widgets[name](), '➢ a\n➢ b\n➢ c')
+        widget.calevent_configure(ev_id, text='d')
+        self.assertEqual(widget.tooltip_wrapper.widgets[name](), '➢ a\n➢ b\n➢ d')
+        widget.calevent_create(date(2019, 7, 9), 'span', enddate=date(2019, 7, 11))
+        self.assertEqual(widget.tooltip_wrapper.widgets[name](), '➢ a\n➢ b\n➢ d\n➢ span')
+
+    def test_calendar_batch(self):
+        widget = Calendar(self.window, year=2019, month=7, day=10)
+        widget.pack()
+        self.window.update()
+        widget.calevent_create(date(2019, 7, 3), 'old', 'old')
+        redraw_count = widget._redraw_count
+
+        with widget.batch():
+            widget.calevent_remove('all')
+            with widget.batch():
+                for day in range(1, 20):
+                    widget.calevent_create(date(2019, 7, day), 'Event %i' % day, 'new')
+                widget.calevent_create(date(2019, 7, 22), 'Span', 'new', enddate=date(2019, 7, 24))
+            widget.tag_config('new', background='red')
+            widget.configure(mindate=date(2019, 7, 5), maxdate=date(2019, 7, 25))
+            widget.selection_set(date(2019, 7, 12))
+            # nothing is redrawn inside the block
+            self.assertEqual(widget._redraw_count, redraw_count)
+        self.assertEqual(widget._redraw_count, redraw_count + 1)
+        self.assertEqual(widget._dirty, set())
+        # the tooltips are updated when the block exits
+        w, d = widget._get_day_coords(date(2019, 7, 3))
+        self.assertEqual(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])](), '➢ Event 3')
+        w, d = widget._get_day_coords(date(2019, 7, 20))
+        self.assertIsNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        w, d = widget._get_day_coords(date(2019, 7, 23))
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('new'))
+        w, d = widget._get_day_coords(date(2019, 7, 12))
+        self.assertEqual(widget._calendar[w][d].cget('style'), 'sel.%s.TLabel' % widget._style_prefixe)
+        w, d = widget._get_day_coords(date(2019, 7, 3))
+        self.assertIn('disabled', widget._calendar[w][d].state())
+        self.assertIn('disabled', widget._l_month.state())
+
+        # single day changes only redraw these days
+        with widget.batch():
+            ev_id = widget.calevent_create(date(2019, 7, 30), 'Hello', 'new')
+            widget.calevent_configure(ev_id, date=date(2019, 7, 29))
+            self.assertEqual(widget._dirty, {date(2019, 7, 29), date(2019, 7, 30)})
+        self.assertEqual(widget._redraw_count, redraw_count + 1)
+        w, d = widget._get_day_coords(date(2019, 7, 29))
+        self.assertIsNotNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+        w, d = widget._get_day_coords(date(2019, 7, 30))
+        self.assertIsNone(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])])
+
+    def test_calendar_configure_coalesced(self):
+        widget = Calendar(self.window, year=2019, month=7, day=10)
+        widget.pack()
+        self.window.update()
+        redraw_count = widget._redraw_count
+        styles = []
+        style_configure = widget.style.configure
+
+        def counted_style_configure(name, **kw):
+            styles.append(name)
+            return style_configure(name, **kw)
+
+        widget.style.configure = counted_style_configure
+        try:
+            widget.configure(mindate=date(2019, 6, 5), maxdate=date(2019, 8, 25), firstweekday='sunday',
+                             weekenddays=[1, 7], showothermonthdays=False,
+                             normalbackground='red', background='blue', foreground='white')
+            self.assertEqual(widget._redraw_count, redraw_count + 1)
+            self.assertEqual(sorted(styles), sorted(set(styles)))
+            self.assertEqual(widget.style.lookup('normal.%s.TLabel' % widget._style_prefixe, 'background'), 'red')
+            self.assertEqual(widget.style.lookup('main.%s.TLabel' % widget._style_prefixe, 'background'), 'blue')
+            self.assertEqual(widget.style.lookup('main.%s.TLabel' % widget._style_prefixe, 'foreground'), 'white')
+            # nothing is changed if one of the values is invalid
+            with self.assertRaises(ValueError):
+                widget.configure(firstweekday='monday', normalbackground='green', weekenddays=[0])
+            self.assertEqual(widget['firstweekday'], 'sunday')
+            self.assertEqual(widget['normalbackground'], 'red')
+            self.assertEqual(widget._redraw_count, redraw_count + 1)
+        finally:
+            del widget.style.configure
+
+    def test_calendar_diff_rendering(self):
+        widget = Calendar(self.window, year=2019, month=7, day=10, maxdate=date(2019, 8, 30))
+        widget.pack()
+        self.window.update()
+        calls = []
+
+        def tk_command(*args):
+            calls.append(args)
+            Calendar._tk_command(widget, *args)
+
+        widget._tk_command = tk_command
+        # nothing changed
+        widget._display_calendar()
+        self.assertEqual(calls, [])
+        # only the day of the new event is updated
+        evdate = date(2019, 7, 18)
+        ev_id = widget.calevent_create(evdate, 'Hello', 'message')
+        w, d = widget._get_day_coords(evdate)
+        self.assertEqual(calls, [(str(widget._calendar[w][d]), 'configure', '-style',
+                                  widget._tag_styles.get('message'))])
+        del calls[:]
+        widget.calevent_configure(ev_id, text='Hi')
+        widget._display_calendar()
+        self.assertEqual(calls, [])
+        self.assertEqual(widget.tooltip_wrapper.widgets[str(widget._calendar[w][d])](), '➢ Hi')
+        # the shadow model matches the labels
+        widget._next_month()
+        widget._prev_month()
+        for week, shown_week in zip(widget._calendar, widget._shown_days):
+            for label, (text, style, disabled) in zip(week, shown_week):
+                self.assertEqual(label.cget('text'), text)
+                self.assertEqual(label.cget('style'), style)
+                self.assertEqual('disabled' in label.state(), disabled)
+        widget._next_month()
+        w, d = widget._get_day_coords(date(2019, 8, 31))
+        self.assertIn('disabled', widget._calendar[w][d].state())
+
+    def test_calendar_display_styles(self):
+        widget = Calendar(self.window, year=2019, month=7, day=10)
+        widget.pack()
+        self.window.update()
+        evdate = date(2019, 7, 18)
+        w, d = widget._get_day_coords(evdate)
+        label = widget._calendar[w][d]
+
+        def style(tag):
+            return widget._tag_styles.get(tag)
+
+        for tag, color in zip(['t1', 't2', 't3', 't4', 't5'], ['red', 'green', 'blue', 'cyan', 'gray']):
+            widget.tag_config(tag, background=color)
+
+        ev1 = widget.calevent_create(evdate, 'a', ['t1'])
+        ev2 = widget.calevent_create(evdate, 'b', ['t2', 't3'])
+        ev3 = widget.calevent_create(evdate, 'c')
+        self.assertEqual(widget._model.store._day_tags.get(evdate), 't3')
+        self.assertEqual(label.cget('style'), style('t3'))
+        widget.calevent_lower(ev1)
+        self.assertEqual(widget._model.store._day_tags.get(evdate), 't1')
+        self.assertEqual(label.cget('style'), style('t1'))
+        widget.calevent_raise(ev1)
+        self.assertEqual(label.cget('style'), style('t3'))
+        widget.calevent_configure(ev3, tags=['t4'])
+        self.assertEqual(label.cget('style'), style('t4'))
+        widget.calevent_configure(ev3, tags=[])
+        widget.tag_delete('t3')
+        self.assertEqual(widget._model.store._day_tags.get(evdate), 't2')
+        self.assertEqual(label.cget('style'), style('t2'))
+        widget.tag_delete('t2')
+        self.assertEqual(label.cget('style'), style('t1'))
+        widget.calevent_configure(ev1, tags=[])
+        self.assertIsNone(widget._model.store._day_tags.get(evdate))
+        self.assertEqual(label.cget('style'), 'normal.%s.TLabel' % widget._style_prefixe)
+        # the display tags are kept when changing month
+        widget.calevent_configure(ev1, tags=['t1'])
+        widget._next_month()
+        widget._prev_month()
+        self.assertEqual(widget._model.store._day_tags.get(evdate), 't1')
+        self.assertEqual(label.cget('style'), style('t1'))
+        widget.calevent_remove(ev2)
+        widget.calevent_create(evdate, 'd', ['t5'], enddate=date(2019, 7, 19))
+        self.assertEqual(label.cget('style'), style('t5'))
+
+    def test_calendar_shared_style(self):
+        families = Calendar._style_families
+        nb_families = len(families)
+        cal1 = Calendar(self.window, sharedstyle=True, year=2019, month=7, day=10)
+        cal2 = Calendar(self.window, sharedstyle=True, year=2019, month=7)
+        cal3 = Calendar(self.window, sharedstyle=True, background='red')
+        cal4 = Calendar(self.window)
+        for cal in (cal1, cal2, cal3, cal4):
+            cal.pack()
+        self.window.update()
+        self.assertEqual(cal1._style_prefixe, cal2._style_prefixe)
+        self.assertNotEqual(cal1._style_prefixe, cal3._style_prefixe)
+        self.assertNotIn(cal4._style_prefixe, [cal1._style_prefixe, cal3._style_prefixe])
+        self.assertNotIn(cal4._style_family.key, families)
+        self.assertEqual(cal1._style_family.users, 2)
+        self.assertEqual(len(families), nb_families + 2)
+        self.assertEqual(cal1._calendar[1][2].cget('style'), 'sel.%s.TLabel' % cal1._style_prefixe)
+        # tag styles shared by the tags with the same options
+        evdate = date(2019, 7, 18)
+        w, d = cal1._get_day_coords(evdate)
+        cal1.calevent_create(evdate, 'a', ['birthday'])
+        cal2.calevent_create(evdate, 'b', ['holiday'])
+        self.assertEqual(cal1._tag_styles['birthday'], cal2._tag_styles['holiday'])
+        cal2.tag_config('holiday', background='red')
+        self.assertNotEqual(cal1._tag_styles['birthday'], cal2._tag_styles['holiday'])
+        self.assertEqual(cal2._calendar[w][d].cget('style'), cal2._tag_styles['holiday'])
+        self.assertEqual(cal2.style.lookup(cal2._tag_styles['holiday'], 'background'), 'red')
+        self.assertEqual(cal1.style.lookup(cal1._tag_styles['birthday'], 'background'), 'royal blue')
+        # changing a style option moves the calendar to the matching styles
+        prefix = cal1._style_prefixe
+        cal2.configure(background='red')
+        self.window.update()
+        self.assertEqual(cal2._style_prefixe, cal3._style_prefixe)
+        self.assertEqual(cal2._header.cget('style'), 'main.%s.TFrame' % cal3._style_prefixe)
+        self.assertEqual(cal2._calendar[w][d].cget('style'), cal2._tag_styles['holiday'])
+        self.assertEqual(cal1.style.lookup('main.%s.TFrame' % prefix, 'background'), 'gray30')
+        self.assertEqual(cal1._style_family.users, 1)
+        # same with item assignment
+        cal4['sharedstyle'] = True
+        self.window.update()
+        self.assertEqual(cal4._style_prefixe, cal1._style_prefixe)
+        cal4['background'] = 'red'
+        self.window.update()
+        self.assertEqual(cal4._style_prefixe, cal3._style_prefixe)
+        self.assertEqual(cal1.style.lookup('main.%s.TFrame' % prefix, 'background'), 'gray30')
+        cal4.destroy()
+        # leaving the shared mode
+        cal3.configure(sharedstyle=False)
+        self.window.update()
+        self.assertNotEqual(cal3._style_prefixe, cal2._style_prefixe)
+        self.assertEqual(cal3.style.lookup('main.%s.TFrame' % cal3._style_prefixe, 'background'), 'red')
+        self.assertEqual(cal2._style_family.users, 1)
+        # the styles are released with the last calendar using them
+        cal1.destroy()
+        self.assertNotIn(prefix, [family.prefix for family in families.values()])
+        cal2.destroy()
+        cal3.destroy()
+        self.assertEqual(len(families), nb_families)
+        # and their names reused
+        cal = Calendar(self.window, sharedstyle=True)
+        self.assertIn(cal._style_prefixe, [prefix, cal2._style_prefixe, cal3._style_prefixe])
+
+    def test_calendar_theme_change(self):
+        style = ttk.Style(self.window)
+        theme = style.theme_use()
+        cals = [Calendar(self.window, sharedstyle=True, year=2019, month=7) for i in range(3)]
+        cals.append(Calendar(self.window, year=2019, month=7))
+        cals.append(DateEntry(self.window))
+        cals[0].tag_config('shared', background='red')
+        cals[3].tag_config('private', background='green')
+        cals[0].calevent_create(date(2019, 7, 18), 'a', ['shared'])
+        cals[3].calevent_create(date(2019, 7, 18), 'b', ['private'])
+        for cal in cals:
+            cal.pack()
+        self.window.update()
+        setups = []
+
+        def record(widget, method):
+            func = getattr(widget, method)
+
+            def wrapper():
+                setups.append(widget)
+                func()
+
+            setattr(widget, method, wrapper)
+
+        for cal in cals[:4]:
+            record(cal, '_setup_style')
+        record(cals[4], '_copy_combobox_style')
+        try:
+            # several switches before the display is updated
+            style.theme_use('alt')
+            style.theme_use('clam')
+            self.assertEqual(setups, [])
+            self.window.update()
+            # once for the shared styles, the private ones and the DateEntry style
+            self.assertEqual(setups, [cals[0], cals[3], cals[4]])
+            self.assertEqual(style.lookup(cals[0]._tag_styles['shared'], 'background'), 'red')
+            self.assertEqual(style.lookup(cals[3]._tag_styles['private'], 'background'), 'green')
+            self.assertEqual(style.layout('DateEntry'), style.layout('TCombobox'))
+        finally:
+            style.theme_use(theme)
+
+    def test_calendar_destroy(self):
+        interp = self.window.tk
+        var = tk.StringVar(self.window)
+
+        def create_destroy(n):
+            for i in range(n):
+                cal = Calendar(self.window, textvariable=var, sharedstyle=bool(i % 2),
+                               year=2019, month=7, day=10)
+                cal.pack()
+                cal.calevent_create(date(2019, 7, 18), 'a', ['tag'])
+                cal.tag_config('tag', background='red')
+                # draw the days so that the tag style and the tooltips are used
+                self.window.update()
+                self.assertEqual(list(cal._tag_styles), ['tag'])
+                cal.destroy()
+            self.window.update()
+
+        def counts():
+            return (len(interp.call('info', 'commands')),
+                    len(interp.call('font', 'names')),
+                    len(interp.call('after', 'info')),
+                    len(var.trace_info()),
+                    len(self.window.winfo_children()),
+                    # style names in use or released for reuse
+                    len(Calendar._style_families),
+                    len(Calendar._free_style_families.get(interp.interpaddr(), [])))
+
+        create_destroy(10)
+        before = counts()
+        create_destroy(300)
+        self.assertEqual(counts(), before)
+
+    def test_calendar_tag_styles(self):
+        widget = Calendar(self.window, year=2019, month=7)
+        widget.pack()
+        self.window.update()
+        widget.calevent_create(date(2019, 7, 18), 'a', ['t1'])
+        widget.calevent_create(date(2019, 9, 18), 'b', ['t2'])
+        widget.tag_config('t3', background='red')
+        # only the displayed tags have a style
+        self.assertEqual(list(widget._tag_styles), ['t1'])
+        # the tags with the same options share their style
+        widget.calevent_create(date(2019, 7, 19), 'c', ['t4'])
+        self.assertEqual(widget._tag_styles['t4'], widget._tag_styles['t1'])
+        self.assertEqual(len(widget._style_family.tags), 1)
+        # the styles of the tags no longer displayed are released
+        name = widget._tag_styles['t1']
+        widget.see(date(2019, 9, 1))
+        self.window.update()
+        self.assertEqual(list(widget._tag_styles), ['t2'])
+        self.assertEqual(widget._tag_styles['t2'], name)
+        w, d = widget._get_day_coords(date(2019, 9, 18))
+        self.assertEqual(widget._calendar[w][d].cget('style'), name)
+        widget.calevent_create(date(2019, 9, 20), 'd', ['t3'])
+        self.assertNotEqual(widget._tag_styles['t3'], name)
+        self.assertEqual(widget.style.lookup(widget._tag_styles['t3'], 'background'), 'red')
+        # and their names reused
+        widget.tag_config('t2', background='green')
+        self.assertEqual(widget._tag_styles['t2'], name)
+        self.assertEqual(widget.style.lookup(name, 'background'), 'green')
+        # the style of a tag is released when its last day stops showing it
+        widget.tag_config('t5', background='blue', font='Arial 20')
+        ev_id = widget.calevent_create(date(2019, 9, 25), 'e', ['t5'])
+        name = widget._tag_styles['t5']
+        widget.calevent_remove(ev_id)
+        self.assertNotIn('t5', widget._tag_styles)
+        self.assertIn(name, widget._style_family.free_tags)
+        w, d = widget._get_day_coords(date(2019, 9, 25))
+        self.assertNotEqual(widget._calendar[w][d].cget('style'), name)
+        # and the options of the previous tag are reset when the name is reused
+        widget.calevent_create(date(2019, 9, 26), 'f', ['t6'])
+        self.assertEqual(widget._tag_styles['t6'], name)
+        self.assertEqual(widget.style.lookup(name, 'font'),
+                         widget.style.lookup('normal.%s.TLabel' % widget._style_prefixe, 'font'))
+        self.assertEqual(widget.style.lookup(name, 'background'), 'royal blue')
+        # the options may be unhashable
+        widget.tag_config('t7', background='yellow', font=['Arial', 12])
+        widget.calevent_create(date(2019, 9, 27), 'g', ['t7'])
+        self.assertEqual(widget.style.lookup(widget._tag_styles['t7'], 'background'), 'yellow')
+
+    def test_calendar_single_tcl_call(self):
+        widget = Calendar(self.window, year=2019, month=7, day=10)
+        widget.pack()
+        self.window.update()
+        calls = []
+        cmd = widget.register(lambda *args: calls.append(args))
+        widget.tk.call('trace', 'add', 'execution', '::tkcalendar::eval_commands', 'enter', cmd)
+        try:
+            widget._next_month()
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(widget._shown_header, ('August', '2019'))
+            self.assertEqual(widget._header_month.cget('text'), 'August')
+            w, d = widget._get_day_coords(date(2019, 8, 1))
+            self.assertEqual(widget._calendar[w][d].cget('text'), '1')
+            # a single change is sent directly
+            del calls[:]
+            widget.calevent_create(date(2019, 8, 18), 'Hello', 'message')
+            self.assertEqual(calls, [])
+        finally:
+            widget.tk.call('trace', 'remove', 'execution', '::tkcalendar::eval_commands', 'enter', cmd)
+            widget.deletecommand(cmd)
+
     def test_calendar_virtual_events(self):
         widget = Calendar(self.window, year=2010, month=1, day=3)
         widget.pack()
@@ -603,6 +1336,103 @@ class TestCalendar(BaseWidgetTest):
         self.window.update()
         self.assertTrue(self.event_triggered)
 
+    def test_calendar_month_layout_cache(self):
+        widget = Calendar(self.window, year=2019, month=7, day=10)
+        widget2 = Calendar(self.window, year=2019, month=7, day=10)
+        widget.pack()
+        widget2.pack()
+        self.window.update()
+        # the layouts are shared by the calendars
+        self.assertIs(widget._model.month_layout(), widget2._model.month_layout())
+        self.assertIs(CalendarModel._layouts[2019, 7, 0, True], widget._model.month_layout())
+        widget2.configure(firstweekday='sunday', showothermonthdays=False)
+        self.assertIn((2019, 7, 6, False), CalendarModel._layouts)
+        for i in range(2 * CalendarModel.layout_cache_size):
+            widget._next_month()
+        self.assertEqual(len(CalendarModel._layouts), CalendarModel.layout_cache_size)
+        self.assertNotIn((2019, 7, 6, False), CalendarModel._layouts)
+        # rebuilt when needed
+        self.assertEqual(widget2._get_day_coords(date(2019, 7, 6)), (0, 6))
+        self.assertEqual(widget2._get_day_coords(date(2019, 8, 6)), (None, None))
+
+    def test_calendar_hidden(self):
+        widget = Calendar(self.window, year=2019, month=7, day=10)
+        # nothing is displayed before the calendar is mapped
+        widget.calevent_create(date(2019, 7, 12), 'Hello', 'message')
+        widget.selection_set(date(2019, 7, 20))
+        self.assertEqual(widget._redraw_count, 0)
+        widget.pack()
+        self.window.update()
+        self.assertEqual(widget._redraw_count, 1)
+        w, d = widget._get_day_coords(date(2019, 7, 12))
+        self.assertEqual(widget._calendar[w][d].cget('style'), widget._tag_styles.get('message'))
+        w, d = widget._get_day_coords(date(2019, 7, 20))
+        self.assertEqual(widget._calendar[w][d].cget('style'), 'sel.%s.TLabel' % widget._style_prefixe)
+        # hidden calendar
+        widget.pack_forget()
+        self.window.update()
+        widget.selection_set(date(2019, 9, 2))
+        widget.configure(normalbackground='red', showothermonthdays=False)
+        widget.calevent_create(date(2019, 9, 3), 'Hi', 'message')
+        widget._next_month()
+        self.assertEqual(widget._redraw_count, 1)
+        self.assertEqual(widget._calendar[0][0].cget('text'), '1')
+        widget.pack()
+        self.window.update()
+        self.assertEqual(widget._redraw_count, 2)
+        self.assertEqual(widget.get_displayed_month(), (10, 2019))
+        self.assertEqual(widget._calendar[0][0].cget('text'), '')
+        # the bindings of the user do not replace the calendar ones
+        maps = []
+        widget.bind('<Map>', maps.append)
+        widget.bind('<Unmap>', maps.append)
+        widget.pack_forget()
+        self.window.update()
+        widget._next_month()
+        self.assertEqual(widget._redraw_count, 2)
+        widget.pack()
+        self.window.update()
+        self.assertEqual(len(maps), 2)
+        self.assertEqual(widget._redraw_count, 3)
+        self.assertEqual(widget.get_displayed_month(), (11, 2019))
+        # calendars in notebook pages, directly or in a frame
+        notebook = ttk.Notebook(self.window)
+        page = ttk.Frame(notebook)
+        cal1 = Calendar(notebook, year=2019, month=7)
+        cal2 = Calendar(page, year=2019, month=7)
+        cal2.pack()
+        notebook.add(cal1)
+        notebook.add(page)
+        notebook.pack()
+        self.window.update()
+        for cal in (cal1, cal2):
+            notebook.select(1 if cal is cal1 else 0)
+            self.window.update()
+            cal.calevent_create(date(2019, 7, 12), 'Hello', 'message')
+            cal._next_month()
+            notebook.select(0 if cal is cal1 else 1)
+            self.window.update()
+            self.assertEqual(cal.get_displayed_month(), (8, 2019))
+            self.assertEqual(cal._header_month.cget('text'), cal._month_names[8].title())
+            for week, shown_week in zip(cal._calendar, cal._shown_days):
+                for label, (text, style, disabled) in zip(week, shown_week):
+                    self.assertEqual(label.cget('text'), text)
+                    self.assertEqual(label.cget('style'), style)
+            cal._prev_month()
+            self.window.update()
+            w, d = cal._get_day_coords(date(2019, 7, 12))
+            self.assertEqual(cal._calendar[w][d].cget('style'), cal._tag_styles.get('message'))
+        # the drop-down calendar of a DateEntry
+        entry = DateEntry(self.window, year=2019, month=7, day=10)
+        entry.pack()
+        self.window.update()
+        entry.set_date(date(2019, 8, 3))
+        entry._calendar.calevent_create(date(2019, 8, 4), 'Hi')
+        self.assertEqual(entry._calendar._redraw_count, 0)
+        entry.drop_down()
+        self.window.update()
+        self.assertEqual(entry._calendar._redraw_count, 1)
+
     def test_calendar_other_fcts(self):
         widget = Calendar(self.window, mindate=date(2018, 1, 6), maxdate=date(2018, 9, 8))
         widget.pack()
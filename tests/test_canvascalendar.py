@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Test
+"""
+
+
+from tests import BaseWidgetTest, TestEvent
+from tkcalendar import CanvasCalendar
+from datetime import date
+
+
+class TestCanvasCalendar(BaseWidgetTest):
+    def click(self, widget, x, y):
+        widget._on_canvas_click(TestEvent(x=x, y=y))
+        self.window.update()
+
+    def click_day(self, widget, w, d):
+        (x0, y0), (cw, ch) = widget._grid_origin, widget._cell_size
+        self.click(widget, x0 + (d + 0.5) * cw, y0 + (w + 0.5) * ch)
+
+    def click_button(self, widget, button):
+        x0, y0, x1, y1 = widget._button_boxes[button]
+        self.click(widget, (x0 + x1) / 2, (y0 + y1) / 2)
+
+    def test_canvascalendar_init(self):
+        widget = CanvasCalendar(self.window, year=2019, month=7, day=10, showweeknumbers=False)
+        widget.pack()
+        self.window.update()
+        # only the canvas and the tooltip
+        self.assertEqual(sorted(child.winfo_class() for child in widget.winfo_children()), ['Canvas', 'Toplevel'])
+        self.assertEqual(widget._canvas.itemcget('month', 'text'), 'July')
+        self.assertEqual(widget._canvas.itemcget('year', 'text'), '2019')
+        w, d = widget._get_day_coords(date(2019, 7, 10))
+        text = widget._day_items[w][d][1]
+        self.assertEqual(widget._canvas.itemcget(text, 'text'), '10')
+        self.assertEqual(widget._canvas.itemcget(text, 'fill'),
+                         widget.style.lookup('sel.%s.TLabel' % widget._style_prefixe, 'foreground'))
+        self.assertEqual(widget._canvas.itemcget('weeknb', 'state'), 'hidden')
+        widget.configure(showweeknumbers=True)
+        self.assertEqual(widget._canvas.itemcget('weeknb', 'state'), '')
+        self.assertEqual(widget._canvas.itemcget(widget._week_nb_items[0][1], 'text'), '27')
+
+    def test_canvascalendar_click(self):
+        widget = CanvasCalendar(self.window, year=2010, month=1, day=3, maxdate=date(2010, 2, 20))
+        widget.pack()
+        self.window.update()
+        events = []
+        widget.bind('<<CalendarSelected>>', lambda e: events.append('selected'))
+        widget.bind('<<CalendarMonthChanged>>', lambda e: events.append('month'))
+        w, d = widget._get_day_coords(date(2010, 1, 12))
+        self.click_day(widget, w, d)
+        self.assertEqual(widget.selection_get(), date(2010, 1, 12))
+        self.assertEqual(events, ['selected'])
+        del events[:]
+        # day of the next month
+        self.click_day(widget, 5, 6)
+        self.assertEqual(widget.get_displayed_month(), (2, 2010))
+        self.assertEqual(widget.selection_get(), date(2010, 2, 7))
+        self.assertEqual(events, ['month', 'selected'])
+        del events[:]
+        # disabled day
+        w, d = widget._get_day_coords(date(2010, 2, 25))
+        self.click_day(widget, w, d)
+        self.assertEqual(widget.selection_get(), date(2010, 2, 7))
+        self.assertEqual(events, [])
+        # buttons
+        self.click_button(widget, 'r_month')
+        self.assertEqual(widget.get_displayed_month(), (2, 2010))
+        self.click_button(widget, 'l_month')
+        self.assertEqual(widget.get_displayed_month(), (1, 2010))
+        self.click_button(widget, 'l_year')
+        self.assertEqual(widget.get_displayed_month(), (1, 2009))
+        self.assertEqual(events, ['month', 'month'])
+        widget.configure(selectmode='none', state='disabled')
+        w, d = widget._get_day_coords(date(2009, 1, 12))
+        self.click_day(widget, w, d)
+        self.click_button(widget, 'r_year')
+        self.assertEqual(widget.selection_get(), date(2010, 2, 7))
+        self.assertEqual(widget.get_displayed_month(), (1, 2009))
+
+    def test_canvascalendar_calevents(self):
+        widget = CanvasCalendar(self.window, year=2019, month=7, day=10)
+        widget.pack()
+        self.window.update()
+        widget.tag_config('message', background='red', foreground='yellow')
+        ev_id = widget.calevent_create(date(2019, 7, 18), 'Hello', 'message')
+        self.window.update()
+        w, d = widget._get_day_coords(date(2019, 7, 18))
+        rect, text = widget._day_items[w][d]
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'red')
+        self.assertEqual(widget._canvas.itemcget(text, 'fill'), 'yellow')
+        widget._hovered = (w, d)
+        self.assertEqual(widget._get_hovered_tooltip(), '➢ Hello')
+        widget._hovered = (0, 0)
+        self.assertIsNone(widget._get_hovered_tooltip())
+        widget.calevent_remove(ev_id)
+        self.window.update()
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'),
+                         widget.style.lookup('normal.%s.TLabel' % widget._style_prefixe, 'background'))
+        widget.configure(normalbackground='blue')
+        self.window.update()
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'blue')
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Test
+"""
+
+import unittest
+from datetime import date, timedelta
+
+from tkcalendar.eventstore import CalEvent, EventStore
+from tkcalendar.recurrence import Recurrence
+
+
+class TestEventStore(unittest.TestCase):
+    def test_eventstore_index(self):
+        store = EventStore()
+        d = date(2019, 7, 1)
+        self.assertEqual(store.add(d, 'a', []), 0)
+        self.assertEqual(store.add(d + timedelta(days=10), 'b', ['tag']), 1)
+        self.assertEqual(store.add(d - timedelta(days=3), 'c', []), 2)
+        self.assertEqual(store.add(d, 'd', []), 3)
+        self.assertEqual(len(store), 4)
+        self.assertIn(2, store)
+        self.assertEqual(store.dates[d], [0, 3])
+        self.assertEqual(store.date_range(), [d - timedelta(days=3), d, d + timedelta(days=10)])
+
+        self.assertEqual(store.remove(0), d)
+        self.assertEqual(store.dates[d], [3])
+        self.assertEqual(store.remove(3), d)
+        self.assertNotIn(d, store.dates)
+        self.assertEqual(store.date_range(), [d - timedelta(days=3), d + timedelta(days=10)])
+        with self.assertRaises(KeyError):
+            store.remove(3)
+
+        self.assertEqual(store.move(2, d + timedelta(days=10)), d - timedelta(days=3))
+        self.assertEqual(store.events[2]['date'], d + timedelta(days=10))
+        self.assertEqual(store.dates[d + timedelta(days=10)], [1, 2])
+        self.assertEqual(store.date_range(), [d + timedelta(days=10)])
+
+    def test_eventstore_range(self):
+        store = EventStore()
+        d = date(2019, 1, 1)
+        for i in range(100):
+            store.add(d + timedelta(days=(37 * i) % 100), str(i), [])
+        start = d + timedelta(days=10)
+        end = d + timedelta(days=19)
+        days = store.days(start, end)
+        self.assertEqual(sorted(days), [start + timedelta(days=i) for i in range(10)])
+        ids = store.ids(start, end)
+        self.assertEqual(len(ids), 10)
+        self.assertEqual([store.events[i]['date'] for i in ids],
+                         [start + timedelta(days=i) for i in range(10)])
+        self.assertEqual(len(store.ids(end=start)), 11)
+        self.assertEqual(len(store.ids(start=end)), 81)
+        self.assertEqual(len(store.ids()), 100)
+        self.assertEqual(store.ids(date(2020, 1, 1), date(2020, 2, 1)), [])
+
+    def test_eventstore_bulk(self):
+        store = EventStore()
+        d = date(2019, 7, 1)
+        store.add(d, 'a', [])
+        ev_ids = store.add_many([(d + timedelta(days=2), 'b', []),
+                                 (d, 'c', ['tag']),
+                                 (d - timedelta(days=2), 'd', [])])
+        self.assertEqual(ev_ids, [1, 2, 3])
+        self.assertEqual(store.dates[d], [0, 2])
+        self.assertEqual(store.date_range(), [d - timedelta(days=2), d, d + timedelta(days=2)])
+        ev_ids = store.dates[d]
+        self.assertEqual(store.remove_many([0, 1, 5]), {d, d + timedelta(days=2)})
+        self.assertIs(store.dates[d], ev_ids)
+        self.assertEqual(store.dates[d], [2])
+        self.assertEqual(sorted(store.events), [2, 3])
+        self.assertEqual(store.date_range(), [d - timedelta(days=2), d])
+        self.assertEqual(store.remove_many([]), set())
+
+    def test_eventstore_ids(self):
+        store = EventStore()
+        d = date(2019, 7, 1)
+        for i in range(3):
+            store.add(d, str(i), [])
+        store.remove(2)
+        # ids are not reused
+        self.assertEqual(store.add(d, 'a', []), 3)
+        store.remove_many([0, 3])
+        self.assertEqual(store.add_many([(d, 'b', [])]), [4])
+        # unless the store is emptied
+        store.remove_many([1, 4])
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.add(d, 'c', []), 0)
+        store.remove(0)
+        self.assertEqual(store.add(d, 'd', []), 0)
+
+    def test_eventstore_tags(self):
+        store = EventStore()
+        d = date(2019, 7, 1)
+        store.add(d, 'a', ['message'])
+        store.add_many([(d, 'b', ['reminder', 'message']),
+                        (d + timedelta(days=1), 'c', [])])
+        store.add(d + timedelta(days=2), 'd', ['reminder'])
+        self.assertEqual(store.tag_ids('message'), [0, 1])
+        self.assertEqual(store.tag_ids('reminder'), [1, 3])
+        self.assertEqual(store.tag_ids('test'), [])
+        self.assertTrue(store.has_tag(1, 'reminder'))
+        self.assertFalse(store.has_tag(0, 'reminder'))
+        self.assertFalse(store.has_tag(0, 'test'))
+        # display tag: last tag of the last event of the day having tags
+        self.assertEqual(store.day_tags(d, d + timedelta(days=3)),
+                         {d: 'message', d + timedelta(days=1): None, d + timedelta(days=2): 'reminder'})
+        store.set_day_order(d, [1, 0])
+        self.assertEqual(store.day_tags(d, d), {d: 'message'})
+
+        store.set_tags(2, ['test', 'message'])
+        store.set_tags(0, [])
+        self.assertEqual(store.tag_ids('message'), [1, 2])
+        self.assertEqual(store.tag_ids('test'), [2])
+        self.assertEqual(store.day_tags(d, d + timedelta(days=1)),
+                         {d: 'message', d + timedelta(days=1): 'message'})
+
+        store.remove(1)
+        store.remove_many([3])
+        self.assertEqual(store.tag_ids('message'), [2])
+        self.assertEqual(store.tag_ids('reminder'), [])
+
+        self.assertEqual(store.delete_tag('message'), [2])
+        self.assertEqual(store.events[2]['tags'], ['test'])
+        self.assertEqual(store.day_tags(d, d + timedelta(days=2)), {d: None, d + timedelta(days=1): 'test'})
+        store.add(d + timedelta(days=1), 'e', ['other'], enddate=d + timedelta(days=2))
+        self.assertEqual(store.day_tags(d + timedelta(days=1), d + timedelta(days=2)),
+                         {d + timedelta(days=1): 'other', d + timedelta(days=2): 'other'})
+        self.assertEqual(store.tag_ids('message'), [])
+        self.assertEqual(store.delete_tag('message'), [])
+
+    def test_eventstore_recurrence(self):
+        store = EventStore()
+        d = date(2019, 7, 1)  # monday
+        store.add(d, 'a', [])
+        weekly = Recurrence('weekly')
+        ev1 = store.add(d, 'weekly', ['tag'], weekly)
+        ev2, ev3 = store.add_many([(d + timedelta(days=2), 'b', []),
+                                   (d + timedelta(days=1), 'daily', [], Recurrence('daily', count=3))])
+        self.assertTrue(store.is_recurring(ev1))
+        self.assertFalse(store.is_recurring(ev2))
+        self.assertIs(store.events[ev1]['recurrence'], weekly)
+        self.assertEqual(store.ids(), [0, ev1, ev3, ev2])
+        self.assertEqual(store.date_range(), [d, d + timedelta(days=2)])
+        self.assertEqual(store.tag_ids('tag'), [ev1])
+
+        days = store.days(d, d + timedelta(days=13))
+        self.assertEqual(days, {d: [0, ev1], d + timedelta(days=1): [ev3],
+                                d + timedelta(days=2): [ev2, ev3],
+                                d + timedelta(days=3): [ev3],
+                                d + timedelta(days=7): [ev1]})
+        self.assertEqual(store.dates[d], [0])
+        self.assertIs(store.days(d, d + timedelta(days=13))[d + timedelta(days=1)],
+                      days[d + timedelta(days=1)])  # cached
+        self.assertEqual(store.day(d + timedelta(days=14)), [ev1])
+        self.assertEqual(store.day(d - timedelta(days=7)), [])
+        # single day queries are not cached
+        self.assertEqual(list(store._occurrences), [(d, d + timedelta(days=13))])
+        self.assertEqual(store.day(d + timedelta(days=2)), [ev2, ev3])
+        self.assertEqual(store.ids(d + timedelta(days=2)), [ev2, ev3, ev1])
+        self.assertEqual(store.ids(end=d + timedelta(days=1)), [0, ev1, ev3])
+
+        store.move(ev1, d + timedelta(days=1))
+        self.assertEqual(store.day(d), [0])
+        self.assertEqual(store.day(d + timedelta(days=8)), [ev1])
+        store.set_recurrence(ev1, None)
+        self.assertFalse(store.is_recurring(ev1))
+        self.assertNotIn('recurrence', store.events[ev1])
+        self.assertEqual(store.day(d + timedelta(days=1)), [ev1, ev3])
+        self.assertEqual(store.day(d + timedelta(days=8)), [])
+        store.set_recurrence(ev2, Recurrence('monthly'))
+        self.assertEqual(store.date_range(), [d, d + timedelta(days=1)])
+        self.assertEqual(store.day(date(2019, 8, 3)), [ev2])
+
+        self.assertEqual(store.remove(ev3), d + timedelta(days=1))
+        self.assertEqual(store.day(d + timedelta(days=2)), [ev2])
+        self.assertEqual(store.remove_many([ev2, ev1]), {d + timedelta(days=1), d + timedelta(days=2)})
+        self.assertEqual(store.day(date(2019, 8, 3)), [])
+        self.assertEqual(list(store.events), [0])
+
+    def test_eventstore_spans(self):
+        store = EventStore()
+        d = date(2019, 7, 1)
+        ev0 = store.add(d + timedelta(days=1), 'a', [])
+        ev1 = store.add(d, 'vacation', ['tag'], enddate=d + timedelta(days=13))
+        ev2, ev3 = store.add_many([(d + timedelta(days=3), 'phase', [], None, d + timedelta(days=4)),
+                                   (d + timedelta(days=20), 'b', [])])
+        self.assertTrue(store.is_span(ev1))
+        self.assertFalse(store.is_span(ev0))
+        self.assertEqual(store._max_span, 13)
+        # spans are stored once, not in the date index
+        self.assertEqual(store.date_range(), [d + timedelta(days=1), d + timedelta(days=20)])
+        self.assertEqual(store.day(d), [ev1])
+        self.assertEqual(store.day(d + timedelta(days=1)), [ev0, ev1])
+        self.assertEqual(store.day(d + timedelta(days=4)), [ev1, ev2])
+        self.assertEqual(store.day(d + timedelta(days=14)), [])
+        days = store.days(d + timedelta(days=12), d + timedelta(days=20))
+        self.assertEqual(days, {d + timedelta(days=12): [ev1], d + timedelta(days=13): [ev1],
+                                d + timedelta(days=20): [ev3]})
+        self.assertEqual(store.ids(), [ev1, ev0, ev2, ev3])
+        self.assertEqual(store.ids(d + timedelta(days=2), d + timedelta(days=3)), [ev1, ev2])
+        self.assertEqual(store.ids(d + timedelta(days=5)), [ev1, ev3])
+        self.assertEqual(store.ids(end=d), [ev1])
+
+        # moving a span shifts it as a whole
+        self.assertEqual(store.move(ev1, d + timedelta(days=7)), d)
+        self.assertEqual(store.events[ev1]['enddate'], d + timedelta(days=20))
+        self.assertEqual(store.day(d + timedelta(days=1)), [ev0])
+        self.assertEqual(store.day(d + timedelta(days=20)), [ev3, ev1])
+        store.set_enddate(ev1, None)
+        self.assertEqual(store.day(d + timedelta(days=8)), [])
+        self.assertEqual(store.date_range(), [d + timedelta(days=1), d + timedelta(days=7),
+                                              d + timedelta(days=20)])
+        self.assertEqual(store._max_span, 1)
+        store.set_enddate(ev0, d + timedelta(days=2))
+        self.assertEqual(store.day(d + timedelta(days=2)), [ev0])
+        store.set_recurrence(ev2, Recurrence('weekly'))
+        self.assertFalse(store.is_span(ev2))
+        self.assertEqual(store.day(d + timedelta(days=10)), [ev2])
+        self.assertEqual(store.remove_many([ev0, ev2]), {d + timedelta(days=1), d + timedelta(days=3)})
+        self.assertEqual(store._spans, [])
+        self.assertEqual(store._max_span, 0)
+        self.assertEqual(store.day(d + timedelta(days=2)), [])
+
+    def test_eventstore_records(self):
+        store = EventStore()
+        d = date(2019, 7, 1)
+        ev0, ev1, ev2 = store.add_many([(d, 'a', ['x', 'y']),
+                                        (d, 'b', ['x', 'y']),
+                                        (d, 'c', [], None, d + timedelta(days=2))])
+        ev = store.events[ev0]
+        self.assertIsInstance(ev, CalEvent)
+        self.assertFalse(hasattr(ev, '__dict__'))
+        # identical tags are shared
+        self.assertIs(ev.tags, store.events[ev1].tags)
+        store.set_tags(ev1, ['y'])
+        store.delete_tag('x')
+        self.assertIs(ev.tags, store.events[ev1].tags)
+        # the records still behave like the former dictionaries
+        self.assertEqual(ev, {'date': d, 'text': 'a', 'tags': ['y']})
+        self.assertEqual(store.events[ev2], {'date': d, 'text': 'c', 'tags': [],
+                                             'enddate': d + timedelta(days=2)})
+        self.assertNotIn('recurrence', store.events[ev2])
+        self.assertIsNone(store.events[ev2].recurrence)
+        self.assertEqual(store.events[ev2].get('recurrence'), None)
+        with self.assertRaises(KeyError):
+            ev['recurrence']
+        with self.assertRaises(KeyError):
+            ev['color']
+        ev['tags'].append('z')
+        self.assertEqual(ev.tags, ('y',))
+        store.remove_many([ev0, ev1, ev2])
+        self.assertEqual(store._tag_tuples, {})
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Test
+"""
+
+import io
+import unittest
+from datetime import date
+
+from tkcalendar.ical import read_ics, write_ics
+from tkcalendar.eventstore import EventStore
+from tkcalendar.recurrence import Recurrence
+
+
+ICS = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+PRODID:-//test//test//EN\r
+BEGIN:VEVENT\r
+UID:1\r
+DTSTART;VALUE=DATE:20190701\r
+DTEND;VALUE=DATE:20190702\r
+SUMMARY:Meeting\\, room 2\\nBring\r
+  the slides\r
+CATEGORIES:work,important\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:2\r
+DTSTART;TZID="Europe/Paris":20190710T090000\r
+DTEND;TZID="Europe/Paris":20190712T170000\r
+SUMMARY:Conference\r
+BEGIN:VALARM\r
+ACTION:DISPLAY\r
+SUMMARY:Alarm\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:3\r
+DTSTART;VALUE=DATE:20190715\r
+DURATION:P2W\r
+SUMMARY:Vacation\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:4\r
+DTSTART:20190701T100000Z\r
+DTEND:20190701T110000Z\r
+RRULE:FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20190831T000000Z;WKST=MO\r
+EXDATE:20190703T100000Z,20190708T100000Z\r
+SUMMARY:Standup\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:5\r
+DTSTART;VALUE=DATE:20190705\r
+RRULE:FREQ=MONTHLY;BYSETPOS=-1;BYDAY=FR\r
+SUMMARY:Unsupported rule\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:6\r
+SUMMARY:No date\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+
+class TestIcal(unittest.TestCase):
+    def test_read_ics(self):
+        events = list(read_ics(io.StringIO(ICS)))
+        self.assertEqual(events, [
+            (date(2019, 7, 1), 'Meeting, room 2\nBring the slides', ['work', 'important'], None, None),
+            (date(2019, 7, 10), 'Conference', [], None, date(2019, 7, 12)),
+            (date(2019, 7, 15), 'Vacation', [], None, date(2019, 7, 28)),
+            (date(2019, 7, 1), 'Standup', [],
+             Recurrence('weekly', byweekday=[0, 2], until=date(2019, 8, 31),
+                        exceptions=[date(2019, 7, 3), date(2019, 7, 8)]), None),
+            (date(2019, 7, 5), 'Unsupported rule', [], None, None)])
+
+    def test_read_ics_lazy(self):
+        def lines():
+            # the line following END:VEVENT is needed to unfold it
+            for line in ICS.splitlines(True)[:12]:
+                yield line
+            raise AssertionError('read too far')
+
+        class LazyFile(object):
+            def __init__(self):
+                self.read = None
+                self._lines = lines()
+
+            def __iter__(self):
+                return self._lines
+
+        events = read_ics(LazyFile())
+        self.assertEqual(next(events)[1], 'Meeting, room 2\nBring the slides')
+
+    def test_write_ics(self):
+        store = EventStore()
+        store.add_many([(date(2019, 7, 1), 'Meeting, room 2\nBring the slides; ' + 'x' * 80, ['work', 'a,b']),
+                        (date(2019, 7, 10), 'Conférence', [], None, date(2019, 7, 12)),
+                        (date(2019, 7, 1), 'Standup', [],
+                         Recurrence('weekly', byweekday=[0, 2], exceptions=[date(2019, 7, 3)], count=5)),
+                        (date(2019, 7, 1), 'Until', [],
+                         Recurrence('daily', interval=2, until=date(2019, 7, 31), count=3))])
+        out = io.StringIO()
+        write_ics(out, store.events.values())
+        text = out.getvalue()
+        self.assertTrue(text.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in text.split('\r\n')))
+        self.assertIn('RRULE:FREQ=WEEKLY;BYDAY=MO,WE;COUNT=5\r\n', text)
+        self.assertIn('RRULE:FREQ=DAILY;INTERVAL=2;UNTIL=20190705\r\n', text)
+        events = list(read_ics(io.StringIO(text)))
+        self.assertEqual(events, [
+            (date(2019, 7, 1), 'Meeting, room 2\nBring the slides; ' + 'x' * 80, ['work', 'a,b'], None, None),
+            (date(2019, 7, 10), 'Conférence', [], None, date(2019, 7, 12)),
+            (date(2019, 7, 1), 'Standup', [],
+             Recurrence('weekly', byweekday=[0, 2], exceptions=[date(2019, 7, 3)], count=5), None),
+            (date(2019, 7, 1), 'Until', [], Recurrence('daily', interval=2, until=date(2019, 7, 5)), None)])
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Test
+"""
+
+import unittest
+from datetime import date, timedelta
+
+from tkcalendar.eventstore import EventStore
+from tkcalendar.model import CalendarModel
+
+
+class TestCalendarModel(unittest.TestCase):
+    def test_model_month_layout(self):
+        # sunday first: 2017-12-31 is a sunday, week 52 of 2017
+        layout = CalendarModel._make_month_layout(2018, 1, 6, True)
+        self.assertEqual(layout.dates[0], date(2017, 12, 31))
+        self.assertEqual(layout.dates[41], date(2018, 2, 10))
+        self.assertEqual(layout.texts[:3], ('31', '1', '2'))
+        self.assertEqual(layout.in_month[:2], (False, True))
+        self.assertEqual(layout.week_nbs, ('1', '2', '3', '4', '5', '6'))
+        self.assertEqual(layout.coords[date(2018, 1, 2)], (0, 2))
+        self.assertEqual(layout.coords[date(2018, 2, 10)], (5, 6))
+        self.assertNotIn(date(2018, 2, 11), layout.coords)
+        # without the other months' days
+        layout = CalendarModel._make_month_layout(2015, 2, 6, False)
+        self.assertEqual(layout.texts[:7], ('1', '2', '3', '4', '5', '6', '7'))
+        self.assertEqual(layout.texts[28:], ('',) * 14)
+        self.assertEqual(layout.week_nbs, ('6', '7', '8', '9', '', ''))
+        self.assertEqual(layout.coords[date(2015, 2, 28)], (3, 6))
+
+    def test_model_cells(self):
+        model = CalendarModel(2019, 7, selection=date(2019, 7, 10),
+                              mindate=date(2019, 7, 3), maxdate=date(2019, 8, 5))
+        model.store.add(date(2019, 7, 18), 'a', ['t1'])
+        model.store.add(date(2019, 7, 18), 'b', [])
+        model.store.add(date(2019, 7, 10), 'c', ['t2'])
+        model.store.add(date(2019, 8, 1), 'd', [])
+        provided = EventStore()
+        provided.add(date(2019, 7, 18), 'e', ['p'])
+        provided.add(date(2019, 7, 20), 'f', ['p'])
+        cells, week_nbs = model.cells(provided)
+        self.assertEqual(week_nbs, ('27', '28', '29', '30', '31', '32'))
+        self.assertEqual(len(cells), 42)
+        self.assertEqual(cells[0], ('1', 'normal', True, None))
+        self.assertEqual(cells[2], ('3', 'normal', False, None))
+        self.assertEqual(cells[5], ('6', 'we', False, None))
+        self.assertEqual(cells[9], ('10', 'sel', False, date(2019, 7, 10)))
+        # the events of the store are displayed after the provided ones
+        self.assertEqual(cells[17], ('18', 'tag_t1', False, date(2019, 7, 18)))
+        self.assertEqual([ev.text for ev in model.day_events(date(2019, 7, 18), provided)], ['e', 'a', 'b'])
+        self.assertEqual(cells[19], ('20', 'tag_p', False, date(2019, 7, 20)))
+        self.assertEqual(cells[31], ('1', 'normal_om', False, date(2019, 8, 1)))
+        self.assertEqual(cells[33], ('3', 'we_om', False, None))
+        self.assertEqual(cells[36], ('6', 'normal_om', True, None))
+        # without the other months' days
+        model.showothermonthdays = False
+        model.weekenddays = [1, 2]
+        cells, week_nbs = model.cells()
+        self.assertEqual(week_nbs, ('27', '28', '29', '30', '31', ''))
+        self.assertEqual(cells[0], ('1', 'we', True, None))
+        self.assertEqual(cells[5], ('6', 'normal', False, None))
+        self.assertEqual(cells[19], ('20', 'normal', False, None))
+        self.assertEqual(cells[31], ('', 'normal', False, None))
+
+    def test_model_visible_tags(self):
+        model = CalendarModel(2019, 7)
+        d = date(2019, 7, 18)
+        ev1 = model.store.add(d, 'a', ['t1'])
+        ev2 = model.store.add(d, 'b', ['t2', 't3'])
+        model.store.add(d, 'c', [])
+        self.assertEqual(model.visible_tags(d, d), {d: 't3'})
+        self.assertEqual(model.cells()[0][17][1], 'tag_t3')
+        # updated with the events of the day
+        model.store.set_day_order(d, [2, ev2, ev1])
+        self.assertEqual(model.visible_tags(d, d), {d: 't1'})
+        model.store.set_tags(ev1, [])
+        self.assertEqual(model.visible_tags(d, d), {d: 't3'})
+        self.assertEqual(model.day_style(d), 'normal')
+        # and kept by the store when changing month
+        model.next_month()
+        model.prev_month()
+        self.assertEqual(model.store._day_tags, {d: 't3'})
+        self.assertEqual(model.cells()[0][17][1], 'tag_t3')
+        # the tags of the store events win over the provided ones
+        provided = EventStore()
+        provided.add(d, 'p', ['p'])
+        provided.add(d + timedelta(days=1), 'q', ['p'])
+        model.store.add(d + timedelta(days=1), 'e', [])
+        self.assertEqual(model.visible_tags(d, d + timedelta(days=1), provided),
+                         {d: 't3', d + timedelta(days=1): 'p'})
+
+    def test_model_date_range(self):
+        model = CalendarModel(2019, 7, selection=date(2019, 9, 1),
+                              mindate=date(2019, 7, 3), maxdate=date(2019, 8, 5))
+        self.assertEqual(model.check_date_range(date(2019, 7, 1)), date(2019, 7, 3))
+        self.assertEqual(model.check_date_range(date(2019, 7, 10)), date(2019, 7, 10))
+        self.assertEqual(model.check_date_range(date(2020, 1, 1)), date(2019, 8, 5))
+        self.assertTrue(model.check_selection())
+        self.assertEqual(model.selection, date(2019, 8, 5))
+        self.assertFalse(model.check_selection())
+        self.assertEqual(model.navigation_state(),
+                         {'l_month': True, 'l_year': True, 'r_month': False, 'r_year': True})
+        model.next_month()
+        self.assertEqual(model.date, date(2019, 8, 1))
+        self.assertEqual(model.navigation_state(),
+                         {'l_month': False, 'l_year': True, 'r_month': True, 'r_year': True})
+        model.next_year()
+        self.assertTrue(model.check_month())
+        self.assertEqual(model.date, date(2019, 8, 1))
+        self.assertFalse(model.check_month())
+        model.mindate = None
+        self.assertEqual(model.navigation_state(), {'r_month': True, 'r_year': True})
+        model.maxdate = None
+        self.assertEqual(model.navigation_state(), {})
+
+    def test_model_navigation(self):
+        model = CalendarModel(2019, 1, firstweekday=6, weekenddays=[1, 7])
+        model.prev_month()
+        self.assertEqual(model.date, date(2018, 12, 1))
+        model.next_month()
+        model.next_month()
+        self.assertEqual(model.date, date(2019, 2, 1))
+        model.prev_year()
+        self.assertEqual(model.date, date(2018, 2, 1))
+        model.see(date(2019, 6, 30))
+        self.assertEqual(model.date, date(2019, 6, 1))
+        self.assertEqual(model.weekdays(), [6, 0, 1, 2, 3, 4, 5])
+        model.date = date(2019, 7, 1)
+        self.assertEqual(model.grid_range(), (date(2019, 6, 30), date(2019, 8, 10)))
+        self.assertEqual(model.day_coords(date(2019, 7, 6)), (0, 6))
+        self.assertEqual(model.day_coords(date(2019, 8, 11)), (None, None))
+        self.assertEqual(model.day_style(date(2019, 6, 30)), 'we_om')
+        self.assertEqual(model.day_style(date(2019, 7, 1)), 'normal')
+        self.assertEqual(model.day_style(date(2019, 7, 6)), 'we')
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Test
+"""
+
+import unittest
+from datetime import date, datetime
+
+from tkcalendar import Recurrence
+
+
+class TestRecurrence(unittest.TestCase):
+    def test_recurrence_init(self):
+        r = Recurrence('daily', interval=2, byweekday=[4, 0, 0],
+                       until=datetime(2019, 8, 1, 10), exceptions=[datetime(2019, 7, 5)])
+        self.assertEqual(r.byweekday, (0, 4))
+        self.assertEqual(r.until, date(2019, 8, 1))
+        self.assertEqual(r.exceptions, frozenset([date(2019, 7, 5)]))
+        self.assertEqual(r, Recurrence('daily', 2, (0, 4), date(2019, 8, 1), exceptions=[date(2019, 7, 5)]))
+        self.assertNotEqual(r, Recurrence('daily', 2, (0, 4)))
+        self.assertEqual(repr(Recurrence('monthly', count=3)), "Recurrence('monthly', count=3)")
+
+        with self.assertRaises(ValueError):
+            Recurrence('hourly')
+        with self.assertRaises(ValueError):
+            Recurrence(interval=0)
+        with self.assertRaises(ValueError):
+            Recurrence(interval='a')
+        with self.assertRaises(ValueError):
+            Recurrence('monthly', byweekday=[1])
+        with self.assertRaises(ValueError):
+            Recurrence(byweekday=[7])
+        with self.assertRaises(ValueError):
+            Recurrence(byweekday=[])
+        with self.assertRaises(TypeError):
+            Recurrence(byweekday=1)
+        with self.assertRaises(TypeError):
+            Recurrence(until='2019-01-01')
+        with self.assertRaises(ValueError):
+            Recurrence(count=0)
+        with self.assertRaises(TypeError):
+            Recurrence(exceptions=1)
+
+    def test_recurrence_between(self):
+        start = date(2019, 7, 3)  # wednesday
+        r = Recurrence('daily', interval=3)
+        self.assertEqual(r.between(start, date(2019, 7, 1), date(2019, 7, 12)),
+                         [date(2019, 7, 3), date(2019, 7, 6), date(2019, 7, 9), date(2019, 7, 12)])
+        r = Recurrence('daily', byweekday=[5, 6], exceptions=[date(2019, 7, 7)])
+        self.assertEqual(r.between(start, date(2019, 7, 1), date(2019, 7, 14)),
+                         [date(2019, 7, 6), date(2019, 7, 13), date(2019, 7, 14)])
+        r = Recurrence('weekly', interval=2, byweekday=[0, 2])
+        self.assertEqual(r.between(start, date(2019, 7, 1), date(2019, 7, 31)),
+                         [date(2019, 7, 3), date(2019, 7, 15), date(2019, 7, 17), date(2019, 7, 29), date(2019, 7, 31)])
+        r = Recurrence('weekly', count=3)
+        self.assertEqual(r.between(start, date(2019, 7, 10), date(2019, 12, 31)),
+                         [date(2019, 7, 10), date(2019, 7, 17)])
+        r = Recurrence('monthly', until=date(2020, 3, 31))
+        start = date(2019, 10, 31)
+        self.assertEqual(r.between(start, date(2019, 1, 1), date(2020, 12, 31)),
+                         [date(2019, 10, 31), date(2019, 12, 31), date(2020, 1, 31), date(2020, 3, 31)])
+        r = Recurrence('yearly')
+        self.assertEqual(r.between(date(2016, 2, 29), date(2017, 1, 1), date(2024, 12, 31)),
+                         [date(2020, 2, 29), date(2024, 2, 29)])
+        self.assertEqual(r.between(date(2016, 2, 29), date(2015, 1, 1), date(2016, 1, 1)), [])
+
+    def test_recurrence_first(self):
+        r = Recurrence('weekly', byweekday=[0], exceptions=[date(2019, 7, 8)])
+        start = date(2019, 7, 1)
+        self.assertEqual(r.first(start), date(2019, 7, 1))
+        self.assertEqual(r.first(start, date(2019, 7, 2)), date(2019, 7, 15))
+        self.assertIsNone(r.first(start, date(2019, 7, 2), date(2019, 7, 14)))
+        self.assertIsNone(Recurrence('daily', count=2).first(start, date(2019, 7, 3)))
+        self.assertEqual(Recurrence('daily').first(date(9999, 12, 30), date(9999, 12, 31)),
+                         date(9999, 12, 31))
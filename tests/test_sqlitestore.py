@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Test
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from tkcalendar.eventstore import EventStore
+from tkcalendar.sqlitestore import SQLiteEventStore
+from tkcalendar.recurrence import Recurrence
+
+
+class TestSQLiteEventStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def assertSameStores(self, store, ref):
+        self.assertEqual(len(store), len(ref))
+        self.assertEqual(dict(store.events), ref.events)
+        self.assertEqual(list(store.events), list(ref.events))
+        self.assertEqual(dict(store.dates), ref.dates)
+        self.assertEqual(store.date_range(), ref.date_range())
+        self.assertEqual(sorted(store.tag_names()), sorted(ref.tag_names()))
+        self.assertEqual(store.ids(), ref.ids())
+
+    def test_sqlitestore_same_behavior(self):
+        rnd = random.Random(7)
+        d0 = date(2019, 7, 1)
+        rules = [Recurrence('weekly'), Recurrence('daily', count=3), Recurrence('monthly', interval=2)]
+        tags = ['a', 'b', 'c']
+        store = SQLiteEventStore()
+        ref = EventStore()
+
+        def random_date():
+            return d0 + timedelta(days=rnd.randint(0, 60))
+
+        def random_event():
+            ev_date = random_date()
+            kind = rnd.random()
+            recurrence = rnd.choice(rules) if kind < 0.15 else None
+            enddate = ev_date + timedelta(days=rnd.randint(1, 20)) if 0.15 <= kind < 0.35 else None
+            return (ev_date, 'event %i' % rnd.randint(0, 99), rnd.sample(tags, rnd.randint(0, 2)),
+                    recurrence, enddate)
+
+        for step in range(400):
+            ev_ids = list(ref.events)
+            op = rnd.random()
+            if op < 0.3 or not ev_ids:
+                event = random_event()
+                self.assertEqual(store.add(*event), ref.add(*event))
+            elif op < 0.4:
+                events = [random_event() for i in range(rnd.randint(0, 5))]
+                self.assertEqual(store.add_many(events), ref.add_many(events))
+            elif op < 0.5:
+                ev_id = rnd.choice(ev_ids)
+                self.assertEqual(store.remove(ev_id), ref.remove(ev_id))
+            elif op < 0.55:
+                removed = rnd.sample(ev_ids, min(len(ev_ids), 3)) + [1000]
+                self.assertEqual(store.remove_many(removed), ref.remove_many(removed))
+            elif op < 0.65:
+                ev_id, new_date = rnd.choice(ev_ids), random_date()
+                self.assertEqual(store.move(ev_id, new_date), ref.move(ev_id, new_date))
+            elif op < 0.7:
+                ev_id, rule = rnd.choice(ev_ids), rnd.choice(rules + [None])
+                store.set_recurrence(ev_id, rule)
+                ref.set_recurrence(ev_id, rule)
+            elif op < 0.75:
+                ev_id = rnd.choice(ev_ids)
+                ev_date = ref.events[ev_id]['date']
+                enddate = rnd.choice([None, ev_date + timedelta(days=rnd.randint(1, 9))])
+                store.set_enddate(ev_id, enddate)
+                ref.set_enddate(ev_id, enddate)
+            elif op < 0.8:
+                ev_id, new_tags = rnd.choice(ev_ids), rnd.sample(tags, rnd.randint(0, 3))
+                store.set_tags(ev_id, list(new_tags))
+                ref.set_tags(ev_id, list(new_tags))
+            elif op < 0.83:
+                tag = rnd.choice(tags)
+                self.assertEqual(store.delete_tag(tag), ref.delete_tag(tag))
+            elif op < 0.9:
+                ev_date = rnd.choice(ref.date_range() or [d0])
+                order = ref.day_order(ev_date)
+                self.assertEqual(store.day_order(ev_date), order)
+                rnd.shuffle(order)
+                if order:
+                    store.set_day_order(ev_date, order)
+                    ref.set_day_order(ev_date, order)
+            else:
+                ev_id = rnd.choice(ev_ids)
+                store.set_text(ev_id, 'text %i' % step)
+                ref.set_text(ev_id, 'text %i' % step)
+            start = random_date()
+            end = start + timedelta(days=rnd.randint(0, 41))
+            self.assertEqual(store.days(start, end), ref.days(start, end))
+            self.assertEqual(store.day_events(start, end), ref.day_events(start, end))
+            # the display tags kept up to date by the changes match the events
+            day_tags = {ev_date: next((ev.tags[-1] for ev in reversed(evs) if ev.tags), None)
+                        for ev_date, evs in ref.day_events(start, end).items()}
+            self.assertEqual(ref.day_tags(start, end), day_tags)
+            self.assertEqual(store.day_tags(start, end), day_tags)
+            self.assertEqual(store.ids(start, end), ref.ids(start, end))
+            self.assertEqual(store.ids(start), ref.ids(start))
+            self.assertEqual(store.ids(end=end), ref.ids(end=end))
+            for tag in tags:
+                self.assertEqual(store.tag_ids(tag), ref.tag_ids(tag))
+            if ev_ids:
+                ev_id = rnd.choice(ev_ids)
+                if ev_id in ref:
+                    self.assertEqual(store.is_span(ev_id), ref.is_span(ev_id))
+                    self.assertEqual(store.is_recurring(ev_id), ref.is_recurring(ev_id))
+                    self.assertEqual(store.has_tag(ev_id, 'a'), ref.has_tag(ev_id, 'a'))
+                else:
+                    self.assertNotIn(ev_id, store)
+            if step % 50 == 0:
+                self.assertSameStores(store, ref)
+        self.assertSameStores(store, ref)
+        with self.assertRaises(KeyError):
+            store.remove(1000)
+        with self.assertRaises(KeyError):
+            store.move(1000, d0)
+
+    def test_sqlitestore_persistence(self):
+        filename = os.path.join(self.tmpdir, 'events.db')
+        d = date(2019, 7, 1)
+        store = SQLiteEventStore(filename)
+        ev0 = store.add(d, 'a', ['tag'])
+        ev1, ev2, ev3 = store.add_many([(d, 'b', []),
+                                        (d, 'weekly', ['tag2'],
+                                         Recurrence('weekly', until=date(2019, 8, 1), exceptions=[date(2019, 7, 8)])),
+                                        (d, 'span', [], None, d + timedelta(days=3))])
+        store.set_day_order(d, [ev1, ev0])
+        store.remove(ev3)
+        store.close()
+
+        store = SQLiteEventStore(filename)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.events[ev2]['recurrence'],
+                         Recurrence('weekly', until=date(2019, 8, 1), exceptions=[date(2019, 7, 8)]))
+        self.assertEqual(store.day(d), [ev1, ev0, ev2])
+        self.assertEqual(store.day(d + timedelta(days=7)), [])
+        self.assertEqual(store.day(d + timedelta(days=14)), [ev2])
+        self.assertEqual(sorted(store.tag_names()), ['tag', 'tag2'])
+        # ids are not reused
+        self.assertEqual(store.add(d, 'c', []), ev3 + 1)
+        store.remove_many(list(store.events))
+        self.assertEqual(store.add(d, 'd', []), 0)
+        store.close()
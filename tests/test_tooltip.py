@@ -82,3 +82,22 @@ class TestTooltipWrapper(BaseWidgetTest):
         test(b1)
         self.window.after(11, lambda: test(b2))
         self.window.after(22, removal_tests)
+
+    def test_tooltipwrapper_text_callback(self):
+        b = ttk.Button(self.window, text='Button')
+        b.pack()
+        self.window.update()
+        calls = []
+
+        def get_text():
+            calls.append(1)
+            return 'tooltip'
+
+        tw = TooltipWrapper(self.window, delay=1)
+        tw.add_tooltip(b, get_text)
+        self.assertEqual(calls, [])
+        tw.current_widget = b
+        tw.display_tooltip()
+        self.assertEqual(calls, [1])
+        self.assertEqual(tw.tooltip['text'], 'tooltip')
+        tw.tooltip.withdraw()
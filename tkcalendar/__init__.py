@@ -25,5 +25,10 @@ tkcalendar module providing Calendar and DateEntry widgets
 
 from tkcalendar.dateentry import DateEntry
 from tkcalendar.calendar_ import Calendar
+from tkcalendar.canvascalendar import CanvasCalendar
+from tkcalendar.model import CalendarModel
+from tkcalendar.recurrence import Recurrence
+from tkcalendar.eventstore import EventStore
+from tkcalendar.sqlitestore import SQLiteEventStore
 
 __version__ = '1.5.0'
@@ -25,27 +25,141 @@ Calendar widget
 
 
 import calendar
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice, count
+from concurrent.futures import ThreadPoolExecutor
 try:
     from tkinter import ttk
     from tkinter.font import Font
 except ImportError:
     import ttk
     from tkFont import Font
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 from babel import default_locale
 from babel.dates import format_date, parse_date, get_day_names, get_month_names, get_date_format
 from tkcalendar.tooltip import TooltipWrapper
+from tkcalendar.eventstore import EventStore
+from tkcalendar.sqlitestore import SQLiteEventStore
+from tkcalendar.recurrence import Recurrence
+from tkcalendar.model import CalendarModel
 import re
 
 
+# Tcl procedure evaluating a list of commands, so that the widget updates of
+# a whole redraw cost a single call to the Tcl interpreter
+_TCL_EVAL_COMMANDS = """
+namespace eval ::tkcalendar {
+    proc eval_commands {commands} {
+        foreach command $commands {
+            {*}$command
+        }
+    }
+}
+"""
+
+
+class _StyleFamily(object):
+    """
+    Styles of a calendar, or shared by the calendars in sharedstyle mode
+    whose style options are identical: prefix of the style names, key of
+    the style options (None for the styles of a single calendar), number of
+    calendars using them and refcounted styles of the displayed tags.
+    """
+    __slots__ = ('prefix', 'key', 'users', 'tags', 'tag_keys', 'free_tags')
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.key = None
+        self.users = 0
+        self.tags = {}  # {tag options key: [style name, number of users, tag options]}
+        self.tag_keys = {}  # {style name: tag options key}
+        self.free_tags = []  # tag style names no longer used
+
+
+class _ThemeCoordinator(object):
+    """
+    Update the styles of the registered widgets after a theme change, in a
+    single idle callback per theme switch for all the widgets of an
+    interpreter instead of one callback per widget.
+
+    The registered widgets must have an _update_theme(done) method, done
+    being the set of the keys of the styles already updated during the
+    callback, so that the styles shared by several widgets are only
+    updated once.
+    """
+    _coordinators = {}  # {interpreter: _ThemeCoordinator}
+    _bindtag = 'TkcalendarThemeChanged'
+
+    def __init__(self, root):
+        self.root = root
+        self.widgets = OrderedDict()  # {widget name: widget}
+        self._after_id = None
+        # <<ThemeChanged>> is sent to all the widgets, only handle the one of the
+        # root window, with a bindtag so that the bindings of the user are kept
+        root.bind_class(self._bindtag, '<<ThemeChanged>>', self._on_theme_changed)
+        root.bindtags(root.bindtags() + (self._bindtag,))
+
+    @classmethod
+    def register(cls, widget):
+        """Call widget._update_theme after each theme switch."""
+        root = widget._root()
+        coordinator = cls._coordinators.get(widget.tk.interpaddr())
+        if coordinator is None or coordinator.root is not root:
+            coordinator = cls._coordinators[widget.tk.interpaddr()] = cls(root)
+        coordinator.widgets[str(widget)] = widget
+
+    @classmethod
+    def unregister(cls, widget):
+        """Stop updating widget after the theme switches."""
+        coordinator = cls._coordinators.get(widget.tk.interpaddr())
+        if coordinator is not None:
+            coordinator.widgets.pop(str(widget), None)
+
+    def _on_theme_changed(self, event):
+        if self._after_id is None:
+            self._after_id = self.root.after_idle(self._update_theme)
+
+    def _update_theme(self):
+        self._after_id = None
+        done = set()
+        for widget in list(self.widgets.values()):
+            widget._update_theme(done)
+
+
 class Calendar(ttk.Frame):
     """Calendar widget."""
     date = calendar.datetime.date
     datetime = calendar.datetime.datetime
     timedelta = calendar.datetime.timedelta
+
+    eventprovider_cache_size = 12  # number of months whose provided events are cached
+    eventprovider_poll_delay = 20  # delay in ms between two checks of the events loaded in the background
     strptime = calendar.datetime.datetime.strptime
     strftime = calendar.datetime.datetime.strftime
 
+    # options determining the styles, the calendars having the same values
+    # share their styles in sharedstyle mode
+    _style_options = ('background', 'foreground', 'disabledbackground', 'disabledforeground',
+                      'bordercolor', 'headersbackground', 'headersforeground',
+                      'selectbackground', 'selectforeground', 'disabledselectbackground',
+                      'disabledselectforeground', 'normalbackground', 'normalforeground',
+                      'weekendbackground', 'weekendforeground', 'othermonthforeground',
+                      'othermonthbackground', 'othermonthweforeground', 'othermonthwebackground',
+                      'disableddaybackground', 'disableddayforeground',
+                      'tooltipforeground', 'tooltipbackground')
+    _style_families = {}  # {(interpreter, style options): _StyleFamily} of the shared styles in use
+    # {interpreter: [_StyleFamily, ...]} released families, ttk styles cannot be deleted
+    # so their names are reused by the next calendars
+    _free_style_families = {}
+    _style_family_ids = count()
+    _map_bindtag = 'TkcalendarMap'  # bindtag of the calendars handling <Map> and <Unmap>
+
     def __init__(self, master=None, **kw):
         """
         Construct a Calendar with parent master.
@@ -116,6 +230,27 @@ class Calendar(ttk.Frame):
         textvariable : StringVar
             connect the currently selected date to the variable.
 
+        eventprovider : None (default) or callable
+            function giving events to display in addition to the ones
+            created with calevent_create. It is called with the first and
+            last visible dates (datetime.date) when a month is displayed and
+            should return an iterable of (date, text, tags, recurrence, enddate)
+            tuples, like the events argument of calevent_create_many.
+            The results are cached for the last visited months, use
+            eventprovider_invalidate when the underlying data change.
+
+        eventproviderworkers : int
+            number of worker threads calling the eventprovider in the
+            background. If 0 (default), the eventprovider is called directly,
+            blocking the display until it returns. Otherwise, the month is
+            displayed immediately and its provided events are added once
+            loaded. In this case, the eventprovider must not use Tkinter.
+
+        eventstore : EventStore or SQLiteEventStore
+            storage of the events created with calevent_create, by default
+            a new in-memory EventStore. Use a SQLiteEventStore to keep the
+            events in a database file between sessions.
+
         Style Options
         -------------
 
@@ -182,6 +317,12 @@ class Calendar(ttk.Frame):
         disableddayforeground : str
             foreground color of days in disabled state
 
+        sharedstyle : bool (default is False)
+            whether to share the ttk styles with the other calendars having
+            the same style options instead of creating styles for this
+            calendar only. The shared styles are released when the last
+            calendar using them is destroyed or reconfigured.
+
         Tooltip Options (for calevents)
         -------------------------------
 
@@ -222,8 +363,6 @@ class Calendar(ttk.Frame):
         classname = kw.pop('class_', "Calendar")
         name = kw.pop('name', None)
         ttk.Frame.__init__(self, master, class_=classname, cursor=curs, name=name)
-        self._style_prefixe = str(self)
-        ttk.Frame.configure(self, style='main.%s.TFrame' % self._style_prefixe)
 
         self._textvariable = kw.pop("textvariable", None)
 
@@ -243,11 +382,9 @@ class Calendar(ttk.Frame):
         firstweekday = kw.pop('firstweekday', 'monday')
         if firstweekday not in ["monday", "sunday"]:
             raise ValueError("'firstweekday' option should be 'monday' or 'sunday'.")
-        self._cal = calendar.TextCalendar((firstweekday == 'sunday') * 6)
-
         weekenddays = kw.pop("weekenddays", None)
         if not weekenddays:
-            l = list(self._cal.iterweekdays())
+            l = [((firstweekday == 'sunday') * 6 + i) % 7 for i in range(7)]
             weekenddays = [l.index(5) + 1, l.index(6) + 1]  # saturday and sunday
         self._check_weekenddays(weekenddays)
 
@@ -265,11 +402,11 @@ class Calendar(ttk.Frame):
         if self._textvariable is not None:
             # the variable overrides day, month and year keywords
             try:
-                self._sel_date = parse_date(self._textvariable.get(), locale)
-                month = self._sel_date.month
-                year = self._sel_date.year
+                sel_date = parse_date(self._textvariable.get(), locale)
+                month = sel_date.month
+                year = sel_date.year
             except IndexError:
-                self._sel_date = None
+                sel_date = None
                 self._textvariable.set('')
                 month = kw.pop("month", today.month)
                 year = kw.pop('year', today.year)
@@ -277,17 +414,15 @@ class Calendar(ttk.Frame):
             if (("month" in kw) or ("year" in kw)) and ("day" not in kw):
                 month = kw.pop("month", today.month)
                 year = kw.pop('year', today.year)
-                self._sel_date = None  # selected day
+                sel_date = None  # selected day
             else:
                 day = kw.pop('day', today.day)
                 month = kw.pop("month", today.month)
                 year = kw.pop('year', today.year)
                 try:
-                    self._sel_date = self.date(year, month, day)  # selected day
+                    sel_date = self.date(year, month, day)  # selected day
                 except ValueError:
-                    self._sel_date = None
-
-        self._date = self.date(year, month, 1)  # (year, month) displayed by the calendar
+                    sel_date = None
 
         # --- date limits
         maxdate = kw.pop('maxdate', None)
@@ -306,14 +441,30 @@ class Calendar(ttk.Frame):
             raise ValueError("mindate should be smaller than maxdate.")
 
         # --- selectmode
+        eventprovider = kw.pop('eventprovider', None)
+        if not (eventprovider is None or callable(eventprovider)):
+            raise TypeError("'eventprovider' option should be callable or None.")
+        eventproviderworkers = self._check_workers(kw.pop('eventproviderworkers', 0))
+        eventstore = kw.pop('eventstore', None)
+        if eventstore is None:
+            eventstore = EventStore()
+        elif not isinstance(eventstore, EventStore):
+            raise TypeError("expected %s or %s for the 'eventstore' option." % (EventStore, SQLiteEventStore))
+
         selectmode = kw.pop("selectmode", "day")
         if selectmode not in ("none", "day"):
             raise ValueError("'selectmode' option should be 'none' or 'day'.")
+        showothermonthdays = kw.pop('showothermonthdays', True)
+        # displayed month, selection, date range and events
+        self._model = CalendarModel(year, month, sel_date, (firstweekday == 'sunday') * 6, weekenddays,
+                                    mindate, maxdate, showothermonthdays, eventstore)
         # --- show week numbers
         showweeknumbers = kw.pop('showweeknumbers', True)
 
         # --- style
         self.style = ttk.Style(self)
+        # {(method, style name): {option: value}} style changes of the ongoing configure call
+        self._style_changes = None
         active_bg = self.style.lookup('TEntry', 'selectbackground', ('focus',))
         dis_active_bg = self.style.lookup('TEntry', 'selectbackground', ('disabled',))
         dis_bg = self.style.lookup('TLabel', 'background', ('disabled',))
@@ -355,10 +506,14 @@ class Calendar(ttk.Frame):
                    'headersforeground',
                    'disableddaybackground',
                    'disableddayforeground',
+                   'sharedstyle',
                    'tooltipforeground',
                    'tooltipbackground',
                    'tooltipalpha',
-                   'tooltipdelay']
+                   'tooltipdelay',
+                   'eventprovider',
+                   'eventproviderworkers',
+                   'eventstore']
 
         keys = list(kw.keys())
         for option in keys:
@@ -378,7 +533,7 @@ class Calendar(ttk.Frame):
                             'mindate': mindate,
                             'maxdate': maxdate,
                             'showweeknumbers': showweeknumbers,
-                            'showothermonthdays': kw.pop('showothermonthdays', True),
+                            'showothermonthdays': showothermonthdays,
                             'selectbackground': active_bg,
                             'selectforeground': 'white',
                             'disabledselectbackground': dis_active_bg,
@@ -400,22 +555,102 @@ class Calendar(ttk.Frame):
                             'headersforeground': 'black',
                             'disableddaybackground': dis_bg,
                             'disableddayforeground': dis_fg,
+                            'sharedstyle': False,
                             'tooltipforeground': 'gray90',
                             'tooltipbackground': 'black',
                             'tooltipalpha': 0.8,
-                            'tooltipdelay': 2000}
+                            'tooltipdelay': 2000,
+                            'eventprovider': eventprovider,
+                            'eventproviderworkers': eventproviderworkers,
+                            'eventstore': eventstore}
         self._properties.update(kw)
 
+        # --- style names
+        self._style_family = None  # _StyleFamily giving the style names
+        self._tag_styles = {}  # {tag: style name} for the displayed tags
+        setup_style = self._acquire_style_family()
+        ttk.Frame.configure(self, style='main.%s.TFrame' % self._style_prefixe)
+
         # --- calevents
-        self.calevents = {}  # special events displayed in colors and with tooltips to show content
-        self._calevent_dates = {}  # list of event ids for each date
         self._tags = {}  # tags to format event display
+        self._set_calevent_store(eventstore)
+        # {(year, month): EventStore} LRU cache of the events given by the eventprovider
+        self._provided = OrderedDict()
+        # background loading of the provided events
+        self._provider_executor = None
+        self._provider_queue = queue.Queue()  # futures of the finished loadings
+        self._provider_pending = {}  # {(year, month): future}
+        self._provider_poll_id = None
+        self._imports = {}  # {events iterator: after id} of the ongoing calevent_import calls
+        self._tooltip_texts = {}  # {date: tooltip text}, built when the tooltip is first displayed
+        self._tooltip_month = None  # month whose tooltip texts are in self._tooltip_texts
+        # number of nested batch() blocks, plus one while the calendar is unmapped:
+        # the display of a hidden calendar is deferred until it is mapped
+        self._batch_level = 1
+        self._unmapped = True
+        # display updates recorded during a batch: dates of the days to redraw
+        # and 'calendar', 'selection' or 'buttons'
+        self._dirty = set()
+        self._redraw_count = 0  # number of times the whole calendar has been displayed
+        self._tk_commands = None  # Tcl commands collected inside a _tk_batch block
+        if not self.tk.call('info', 'commands', '::tkcalendar::eval_commands'):
+            self.tk.eval(_TCL_EVAL_COMMANDS)
         self.tooltip_wrapper = TooltipWrapper(self,
                                               alpha=self._properties['tooltipalpha'],
                                               style=self._style_prefixe + '.tooltip.TLabel',
                                               delay=self._properties['tooltipdelay'])
 
         # --- init calendar
+        # last (text, style, disabled state) sent to Tk for each day label,
+        # to only send the changes when redisplaying the calendar
+        self._shown_days = [[['', 'normal.%s.TLabel' % self._style_prefixe, False] for j in range(7)]
+                            for i in range(6)]
+        self._shown_week_nbs = [''] * 6
+        self._shown_header = ('', '')
+        self._create_widgets(showweeknumbers, selectmode, bd)
+
+        self.config(state=state)
+
+        # --- bindings
+        _ThemeCoordinator.register(self)
+        # on a bindtag so that the bindings of the user do not replace them
+        if not self.bind_class(self._map_bindtag):
+            self.bind_class(self._map_bindtag, '<Map>', lambda event: event.widget._on_map(event))
+            self.bind_class(self._map_bindtag, '<Unmap>', lambda event: event.widget._on_unmap(event))
+        self.bindtags((self._map_bindtag,) + self.bindtags())
+
+        if setup_style:
+            self._setup_style()
+        self._display_calendar()
+        self._btns_date_range()
+        self._check_sel_date()
+
+        if self._textvariable is not None:
+            try:
+                self._textvariable_trace_id = self._textvariable.trace_add('write', self._textvariable_trace)
+            except AttributeError:
+                self._textvariable_trace_id = self._textvariable.trace('w', self._textvariable_trace)
+
+    @property
+    def _date(self):
+        """First day of the displayed month."""
+        return self._model.date
+
+    @_date.setter
+    def _date(self, date):
+        self._model.date = date
+
+    @property
+    def _sel_date(self):
+        """Selected date."""
+        return self._model.selection
+
+    @_sel_date.setter
+    def _sel_date(self, date):
+        self._model.selection = date
+
+    def _create_widgets(self, showweeknumbers, selectmode, bd):
+        """Create the header, the week day names, the week numbers and the day labels."""
         # --- *-- header: month - year
         self._header = ttk.Frame(self, style='main.%s.TFrame' % self._style_prefixe)
 
@@ -457,7 +692,7 @@ class Calendar(ttk.Frame):
                                                                         sticky="eswn")
         # week day names
         self._week_days = []
-        for i, day in enumerate(self._cal.iterweekdays()):
+        for i, day in enumerate(self._model.weekdays()):
             d = self._day_names[day % 7]
             self._cal_frame.columnconfigure(i + 1, weight=1)
             self._week_days.append(ttk.Label(self._cal_frame,
@@ -483,6 +718,8 @@ class Calendar(ttk.Frame):
                                   font=self._font, anchor="center")
                 self._calendar[-1].append(label)
                 label.grid(row=i, column=j, padx=(0, 1), pady=(0, 1), sticky="nsew")
+                # the tooltip text is set when the day has events
+                self.tooltip_wrapper.add_tooltip(label, None)
                 if selectmode == "day":
                     label.bind("<1>", self._on_click)
 
@@ -490,21 +727,44 @@ class Calendar(ttk.Frame):
         self._header.pack(fill="x", padx=2, pady=2)
         self._cal_frame.pack(fill="both", expand=True, padx=bd, pady=bd)
 
-        self.config(state=state)
-
-        # --- bindings
-        self.bind('<<ThemeChanged>>', self._setup_style)
+    def _bind_days(self, bind):
+        """Bind or unbind the selection of the day on click."""
+        for week in self._calendar:
+            for day in week:
+                if bind:
+                    day.bind("<1>", self._on_click)
+                else:
+                    day.unbind("<1>")
 
-        self._setup_style()
-        self._display_calendar()
-        self._btns_date_range()
-        self._check_sel_date()
+    def _show_week_numbers(self, show):
+        for wlabel in self._week_nbs:
+            if show:
+                wlabel.grid()
+            else:
+                wlabel.grid_remove()
 
-        if self._textvariable is not None:
-            try:
-                self._textvariable_trace_id = self._textvariable.trace_add('write', self._textvariable_trace)
-            except AttributeError:
-                self._textvariable_trace_id = self._textvariable.trace('w', self._textvariable_trace)
+    def _set_borderwidth(self, bd):
+        self._cal_frame.pack_configure(padx=bd, pady=bd)
+
+    def _set_state(self, disabled):
+        """Disable or enable all the widgets of the calendar."""
+        state = '!' * (not disabled) + 'disabled'
+        self.state((state,))
+        self._header.state((state,))
+        for child in self._header.children.values():
+            child.state((state,))
+        self._header_month.state((state,))
+        self._header_year.state((state,))
+        self._l_year.state((state,))
+        self._r_year.state((state,))
+        self._l_month.state((state,))
+        self._r_month.state((state,))
+        for child in self._cal_frame.children.values():
+            child.state((state,))
+
+    def _set_button_state(self, button, disabled):
+        """Disable or enable button ('l_month', 'r_month', 'l_year' or 'r_year')."""
+        self._tk_command(str(getattr(self, '_' + button)), 'state', 'disabled' if disabled else '!disabled')
 
     def __getitem__(self, key):
         """Return the resource value for a KEY given as string."""
@@ -514,30 +774,71 @@ class Calendar(ttk.Frame):
             raise AttributeError("Calendar object has no attribute %s." % key)
 
     def __setitem__(self, key, value):
+        self.configure(**{key: value})
+
+    def _check_option(self, key, value):
+        """
+        Return the value to store for option key.
+
+        Raise an error if the option does not exist or if value is invalid,
+        without modifying the calendar.
+        """
         if key not in self._properties:
             raise AttributeError("Calendar object has no attribute %s." % key)
         elif key == 'date_pattern':
-            date_pattern = self._get_date_pattern(value)
-            self._properties[key] = date_pattern
+            # "short" is resolved by _set_option, with the locale given in the same call
+            self._get_date_pattern(value)  # raise an error if the pattern is invalid
+        elif key == "selectmode":
+            if value not in ("none", "day"):
+                raise ValueError("'selectmode' option should be 'none' or 'day'.")
+        elif key == "locale":
+            get_day_names('abbreviated', locale=value)  # raise an error if the locale is unknown
+        elif key == 'firstweekday':
+            if value not in ["monday", "sunday"]:
+                raise ValueError("'firstweekday' option should be 'monday' or 'sunday'.")
+        elif key == 'eventprovider':
+            if not (value is None or callable(value)):
+                raise TypeError("'eventprovider' option should be callable or None.")
+        elif key == 'eventstore':
+            if not isinstance(value, EventStore):
+                raise TypeError("expected %s or %s for the 'eventstore' option." % (EventStore, SQLiteEventStore))
+        elif key == 'eventproviderworkers':
+            return self._check_workers(value)
+        elif key == 'weekenddays':
+            self._check_weekenddays(value)
+        elif key == 'borderwidth':
+            try:
+                int(value)
+            except ValueError:
+                raise ValueError('expected integer for the borderwidth option.')
+        elif key == 'state':
+            if value not in ['normal', 'disabled']:
+                raise ValueError("bad state '%s': must be disabled or normal" % value)
+        elif key in ("maxdate", "mindate"):
+            if isinstance(value, self.datetime):
+                return value.date()
+            elif not (value is None or isinstance(value, self.date)):
+                raise TypeError("expected %s for the '%s' option." % (self.date, key))
+        elif key == "tooltipdelay":
+            try:
+                int(value)
+            except ValueError:
+                raise ValueError('expected integer for the delay option.')
+        return value
+
+    def _set_option(self, key, value):
+        """Set option key to value, already checked by _check_option."""
+        if key == 'date_pattern':
+            self._properties[key] = self._get_date_pattern(value)
         else:
             if key == "selectmode":
-                if value == "none":
-                    for week in self._calendar:
-                        for day in week:
-                            day.unbind("<1>")
-                elif value == "day":
-                    for week in self._calendar:
-                        for day in week:
-                            day.bind("<1>", self._on_click)
-                else:
-                    raise ValueError("'selectmode' option should be 'none' or 'day'.")
+                self._bind_days(value == "day")
             elif key == "locale":
                 self._day_names = get_day_names('abbreviated', locale=value)
                 self._month_names = get_month_names('wide', locale=value)
                 self._properties['date_pattern'] = self._get_date_pattern("short", value)
-                for i, l in enumerate(self._week_days):
-                    l.configure(text=self._day_names[i])
-                self._header_month.configure(text=self._month_names[self._date.month].title())
+                self._display_week_days()
+                self._display_header()
             elif key == 'textvariable':
                 try:
                     if self._textvariable is not None:
@@ -548,80 +849,54 @@ class Calendar(ttk.Frame):
                     if self._textvariable is not None:
                         self._textvariable.trace_vdelete('w', self._textvariable_trace_id)
                     if value is not None:
-                        value.trace('w', self._textvariable_trace)
+                        self._textvariable_trace_id = value.trace('w', self._textvariable_trace)
                 self._textvariable = value
                 value.set(value.get())
             elif key == 'showweeknumbers':
-                if value:
-                    for wlabel in self._week_nbs:
-                        wlabel.grid()
-                else:
-                    for wlabel in self._week_nbs:
-                        wlabel.grid_remove()
+                self._show_week_numbers(value)
             elif key == 'firstweekday':
-                if value not in ["monday", "sunday"]:
-                    raise ValueError("'firstweekday' option should be 'monday' or 'sunday'.")
-                self._cal.firstweekday = (value == 'sunday') * 6
-                for label, day in zip(self._week_days, self._cal.iterweekdays()):
-                    label.configure(text=self._day_names[day % 7])
-            elif key == 'weekenddays':
-                self._check_weekenddays(value)
+                self._model.firstweekday = (value == 'sunday') * 6
+                self._display_week_days()
+                # the visible date ranges have changed
+                self._provided.clear()
+                self._cancel_provider_loading()
+            elif key == 'eventprovider':
+                self._provided.clear()
+                self._cancel_provider_loading()
+            elif key == 'eventstore':
+                self._set_calevent_store(value)
+            elif key == 'eventproviderworkers':
+                self._cancel_provider_loading()
+                if self._provider_executor is not None:
+                    self._provider_executor.shutdown(wait=False)
+                    self._provider_executor = None
             elif key == 'borderwidth':
-                try:
-                    bd = int(value)
-                    self._cal_frame.pack_configure(padx=bd, pady=bd)
-                except ValueError:
-                    raise ValueError('expected integer for the borderwidth option.')
+                self._set_borderwidth(int(value))
             elif key == 'state':
-                if value not in ['normal', 'disabled']:
-                    raise ValueError("bad state '%s': must be disabled or normal" % value)
-                else:
-                    state = '!' * (value == 'normal') + 'disabled'
-                    self.state((state,))
-                    self._header.state((state,))
-                    for child in self._header.children.values():
-                        child.state((state,))
-                    self._header_month.state((state,))
-                    self._header_year.state((state,))
-                    self._l_year.state((state,))
-                    self._r_year.state((state,))
-                    self._l_month.state((state,))
-                    self._r_month.state((state,))
-                    for child in self._cal_frame.children.values():
-                        child.state((state,))
+                self._set_state(value == 'disabled')
+                for week in self._shown_days:
+                    for shown in week:
+                        shown[2] = value == 'disabled'
             elif key == "maxdate":
                 if value is not None:
-                    if isinstance(value, self.datetime):
-                        value = value.date()
-                    elif not isinstance(value, self.date):
-                        raise TypeError("expected %s for the 'maxdate' option." % self.date)
-
                     mindate = self['mindate']
                     if mindate is not None and mindate > value:
-                        self._properties['mindate'] = value
+                        self._properties['mindate'] = self._model.mindate = value
                         self._date = self._date.replace(year=value.year, month=value.month)
                     elif self._date > value:
                         self._date = self._date.replace(year=value.year, month=value.month)
-                self._r_month.state(['!disabled'])
-                self._r_year.state(['!disabled'])
-                self._l_month.state(['!disabled'])
-                self._l_year.state(['!disabled'])
+                for button in ('r_month', 'r_year', 'l_month', 'l_year'):
+                    self._set_button_state(button, False)
             elif key == "mindate":
                 if value is not None:
-                    if isinstance(value, self.datetime):
-                        value = value.date()
-                    elif not isinstance(value, self.date):
-                        raise TypeError("expected %s for the 'mindate' option." % self.date)
                     maxdate = self['maxdate']
                     if maxdate is not None and maxdate < value:
-                        self._properties['maxdate'] = value
+                        self._properties['maxdate'] = self._model.maxdate = value
                         self._date = self._date.replace(year=value.year, month=value.month)
                     elif self._date < value:
                         self._date = self._date.replace(year=value.year, month=value.month)
-                self._r_month.state(['!disabled'])
-                self._r_year.state(['!disabled'])
-                self._l_month.state(['!disabled'])
-                self._l_year.state(['!disabled'])
+                for button in ('r_month', 'r_year', 'l_month', 'l_year'):
+                    self._set_button_state(button, False)
             elif key == "font":
                 font = Font(self, value)
                 prop = font.actual()
@@ -629,90 +904,303 @@ class Calendar(ttk.Frame):
                 prop["size"] += 1
                 self._header_font.configure(**prop)
                 size = max(prop["size"], 10)
-                self.style.configure('R.%s.TButton' % self._style_prefixe, arrowsize=size)
-                self.style.configure('L.%s.TButton' % self._style_prefixe, arrowsize=size)
+                self._style_configure('R.%s.TButton' % self._style_prefixe, arrowsize=size)
+                self._style_configure('L.%s.TButton' % self._style_prefixe, arrowsize=size)
             elif key == "normalbackground":
-                self.style.configure('cal.%s.TFrame' % self._style_prefixe, background=value)
-                self.style.configure('normal.%s.TLabel' % self._style_prefixe, background=value)
-                self.style.configure('normal_om.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('cal.%s.TFrame' % self._style_prefixe, background=value)
+                self._style_configure('normal.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('normal_om.%s.TLabel' % self._style_prefixe, background=value)
             elif key == "normalforeground":
-                self.style.configure('normal.%s.TLabel' % self._style_prefixe, foreground=value)
+                self._style_configure('normal.%s.TLabel' % self._style_prefixe, foreground=value)
             elif key == "bordercolor":
-                self.style.configure('cal.%s.TFrame' % self._style_prefixe, background=value)
+                self._style_configure('cal.%s.TFrame' % self._style_prefixe, background=value)
             elif key == "othermonthforeground":
-                self.style.configure('normal_om.%s.TLabel' % self._style_prefixe, foreground=value)
+                self._style_configure('normal_om.%s.TLabel' % self._style_prefixe, foreground=value)
             elif key == "othermonthbackground":
-                self.style.configure('normal_om.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('normal_om.%s.TLabel' % self._style_prefixe, background=value)
             elif key == "othermonthweforeground":
-                self.style.configure('we_om.%s.TLabel' % self._style_prefixe, foreground=value)
+                self._style_configure('we_om.%s.TLabel' % self._style_prefixe, foreground=value)
             elif key == "othermonthwebackground":
-                self.style.configure('we_om.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('we_om.%s.TLabel' % self._style_prefixe, background=value)
             elif key == "selectbackground":
-                self.style.configure('sel.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('sel.%s.TLabel' % self._style_prefixe, background=value)
             elif key == "selectforeground":
-                self.style.configure('sel.%s.TLabel' % self._style_prefixe, foreground=value)
+                self._style_configure('sel.%s.TLabel' % self._style_prefixe, foreground=value)
             elif key == "disabledselectbackground":
-                self.style.map('sel.%s.TLabel' % self._style_prefixe, background=[('disabled', value)])
+                self._style_map('sel.%s.TLabel' % self._style_prefixe, background=[('disabled', value)])
             elif key == "disabledselectforeground":
-                self.style.map('sel.%s.TLabel' % self._style_prefixe, foreground=[('disabled', value)])
+                self._style_map('sel.%s.TLabel' % self._style_prefixe, foreground=[('disabled', value)])
             elif key == "disableddaybackground":
-                self.style.map('%s.TLabel' % self._style_prefixe, background=[('disabled', value)])
+                self._style_map('%s.TLabel' % self._style_prefixe, background=[('disabled', value)])
             elif key == "disableddayforeground":
-                self.style.map('%s.TLabel' % self._style_prefixe, foreground=[('disabled', value)])
+                self._style_map('%s.TLabel' % self._style_prefixe, foreground=[('disabled', value)])
             elif key == "weekendbackground":
-                self.style.configure('we.%s.TLabel' % self._style_prefixe, background=value)
-                self.style.configure('we_om.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('we.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('we_om.%s.TLabel' % self._style_prefixe, background=value)
             elif key == "weekendforeground":
-                self.style.configure('we.%s.TLabel' % self._style_prefixe, foreground=value)
+                self._style_configure('we.%s.TLabel' % self._style_prefixe, foreground=value)
             elif key == "headersbackground":
-                self.style.configure('headers.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('headers.%s.TLabel' % self._style_prefixe, background=value)
             elif key == "headersforeground":
-                self.style.configure('headers.%s.TLabel' % self._style_prefixe, foreground=value)
+                self._style_configure('headers.%s.TLabel' % self._style_prefixe, foreground=value)
             elif key == "background":
-                self.style.configure('main.%s.TFrame' % self._style_prefixe, background=value)
-                self.style.configure('main.%s.TLabel' % self._style_prefixe, background=value)
-                self.style.configure('R.%s.TButton' % self._style_prefixe, background=value,
-                                     bordercolor=value,
-                                     lightcolor=value, darkcolor=value)
-                self.style.configure('L.%s.TButton' % self._style_prefixe, background=value,
-                                     bordercolor=value,
-                                     lightcolor=value, darkcolor=value)
+                self._style_configure('main.%s.TFrame' % self._style_prefixe, background=value)
+                self._style_configure('main.%s.TLabel' % self._style_prefixe, background=value)
+                self._style_configure('R.%s.TButton' % self._style_prefixe, background=value,
+                                      bordercolor=value,
+                                      lightcolor=value, darkcolor=value)
+                self._style_configure('L.%s.TButton' % self._style_prefixe, background=value,
+                                      bordercolor=value,
+                                      lightcolor=value, darkcolor=value)
             elif key == "foreground":
-                self.style.configure('R.%s.TButton' % self._style_prefixe, arrowcolor=value)
-                self.style.configure('L.%s.TButton' % self._style_prefixe, arrowcolor=value)
-                self.style.configure('main.%s.TLabel' % self._style_prefixe, foreground=value)
+                self._style_configure('R.%s.TButton' % self._style_prefixe, arrowcolor=value)
+                self._style_configure('L.%s.TButton' % self._style_prefixe, arrowcolor=value)
+                self._style_configure('main.%s.TLabel' % self._style_prefixe, foreground=value)
             elif key == "disabledbackground":
-                self.style.map('%s.TButton' % self._style_prefixe,
-                               background=[('active', '!disabled', self.style.lookup('TEntry', 'selectbackground', ('focus',))),
-                                           ('disabled', value)],)
-                self.style.map('main.%s.TFrame' % self._style_prefixe,
-                               background=[('disabled', value)])
-                self.style.map('main.%s.TLabel' % self._style_prefixe,
-                               background=[('disabled', value)])
+                self._style_map('%s.TButton' % self._style_prefixe,
+                                background=[('active', '!disabled', self.style.lookup('TEntry', 'selectbackground', ('focus',))),
+                                            ('disabled', value)],)
+                self._style_map('main.%s.TFrame' % self._style_prefixe,
+                                background=[('disabled', value)])
+                self._style_map('main.%s.TLabel' % self._style_prefixe,
+                                background=[('disabled', value)])
             elif key == "disabledforeground":
-                self.style.map('%s.TButton' % self._style_prefixe,
-                               arrowcolor=[('disabled', value)])
-                self.style.map('main.%s.TLabel' % self._style_prefixe,
-                               foreground=[('disabled', value)])
+                self._style_map('%s.TButton' % self._style_prefixe,
+                                arrowcolor=[('disabled', value)])
+                self._style_map('main.%s.TLabel' % self._style_prefixe,
+                                foreground=[('disabled', value)])
             elif key == "cursor":
                 ttk.Frame.configure(self, cursor=value)
             elif key == "tooltipbackground":
-                self.style.configure('%s.tooltip.TLabel' % self._style_prefixe,
-                                     background=value)
+                self._style_configure('%s.tooltip.TLabel' % self._style_prefixe,
+                                      background=value)
             elif key == "tooltipforeground":
-                self.style.configure('%s.tooltip.TLabel' % self._style_prefixe,
-                                     foreground=value)
+                self._style_configure('%s.tooltip.TLabel' % self._style_prefixe,
+                                      foreground=value)
             elif key == "tooltipalpha":
                 self.tooltip_wrapper.configure(alpha=value)
             elif key == "tooltipdelay":
                 self.tooltip_wrapper.configure(delay=value)
             self._properties[key] = value
-            if key in ['showothermonthdays', 'firstweekday', 'weekenddays',
-                       'maxdate', 'mindate']:
+            if key in ['weekenddays', 'maxdate', 'mindate', 'showothermonthdays']:
+                setattr(self._model, key, value)
+            if key in ['eventprovider', 'eventstore']:
+                self._calevents_changed()
+                self._check_sel_date()
+                self._btns_date_range()
+            elif key in ['showothermonthdays', 'firstweekday', 'weekenddays',
+                         'maxdate', 'mindate', 'eventproviderworkers']:
                 self._display_calendar()
                 self._check_sel_date()
                 self._btns_date_range()
 
+    @contextmanager
+    def _coalesce_styles(self):
+        """Apply the style changes made inside the block once per style name, at the end."""
+        self._style_changes = OrderedDict()
+        try:
+            yield
+        finally:
+            changes, self._style_changes = self._style_changes, None
+            for (method, name), options in changes.items():
+                getattr(self.style, method)(name, **options)
+
+    @contextmanager
+    def _tk_batch(self):
+        """Send the Tcl commands given to _tk_command inside the block in a single call, at the end."""
+        if self._tk_commands is not None:
+            # nested block
+            yield
+            return
+        self._tk_commands = []
+        try:
+            yield
+        finally:
+            commands, self._tk_commands = self._tk_commands, None
+            if len(commands) == 1:
+                self.tk.call(*commands[0])
+            elif commands:
+                self.tk.call('::tkcalendar::eval_commands', tuple(commands))
+
+    def _tk_command(self, *args):
+        """Call the Tcl command args, at the end of the current _tk_batch block if any."""
+        if self._tk_commands is None:
+            self.tk.call(*args)
+        else:
+            self._tk_commands.append(args)
+
+    def _style_configure(self, name, **kw):
+        if self._style_changes is None:
+            self.style.configure(name, **kw)
+        else:
+            self._style_changes.setdefault(('configure', name), {}).update(kw)
+
+    def _style_map(self, name, **kw):
+        if self._style_changes is None:
+            self.style.map(name, **kw)
+        else:
+            self._style_changes.setdefault(('map', name), {}).update(kw)
+
+    def _get_style_key(self):
+        """Return the key of the shared styles matching the calendar options."""
+        return (self.tk.interpaddr(),
+                tuple(self._properties[key] for key in self._style_options)
+                + (max(self._header_font.actual()["size"], 10),))
+
+    def _acquire_style_family(self):
+        """
+        Use the shared styles matching the calendar options in sharedstyle
+        mode, styles for this calendar only otherwise.
+
+        Return whether the styles are new and have to be set up.
+        """
+        if self._properties['sharedstyle']:
+            key = self._get_style_key()
+            family = self._style_families.get(key)
+        else:
+            key = (self.tk.interpaddr(), None)
+            family = None
+        new = family is None
+        if new:
+            free = self._free_style_families.get(key[0])
+            if free:
+                family = free.pop()
+            else:
+                family = _StyleFamily('tkcalendar%i' % next(self._style_family_ids))
+            family.key = key
+            if key[1] is not None:
+                self._style_families[key] = family
+        family.users += 1
+        self._style_family = family
+        self._style_prefixe = family.prefix
+        return new
+
+    def _release_style_family(self):
+        """Stop using the styles, the tag styles being already released."""
+        family, self._style_family = self._style_family, None
+        family.users -= 1
+        if not family.users:
+            if family.key[1] is not None:
+                del self._style_families[family.key]
+            self._free_style_families.setdefault(family.key[0], []).append(family)
+
+    def _update_style_family(self):
+        """Switch to the styles matching the sharedstyle option and the style options."""
+        family = self._style_family
+        if self._properties['sharedstyle']:
+            if family.key == self._get_style_key():
+                return
+        elif family.key[1] is None:
+            return
+        for tag in list(self._tag_styles):
+            self._release_tag_style(tag)
+        self._release_style_family()
+        old_prefix = self._style_prefixe
+        setup_style = self._acquire_style_family()
+        self._rename_styles(old_prefix)
+        if setup_style:
+            self._setup_style()
+        # the tag styles are taken again when the days are displayed
+        self._display_calendar()
+
+    def _rename_styles(self, old_prefix):
+        """Replace old_prefix by the current style prefix in the styles of the widgets."""
+        prefix = self._style_prefixe
+
+        def rename(style):
+            if style.startswith(old_prefix + '.'):
+                return prefix + style[len(old_prefix):]
+            return style.replace('.%s.' % old_prefix, '.%s.' % prefix, 1)
+
+        with self._tk_batch():
+            widgets = [self]
+            while widgets:
+                widget = widgets.pop()
+                widgets.extend(widget.winfo_children())
+                if isinstance(widget, ttk.Widget):
+                    # not widget.cget since the calendar overrides it
+                    style = self.tk.call(str(widget), 'cget', '-style')
+                    if style:
+                        self._tk_command(str(widget), 'configure', '-style', rename(str(style)))
+        for week in self._shown_days:
+            for shown in week:
+                shown[1] = rename(shown[1])
+        if self._style_changes is not None:
+            # style changes of the ongoing configure call
+            self._style_changes = OrderedDict(((method, rename(name)), options)
+                                              for (method, name), options in self._style_changes.items())
+
+    def _tag_style(self, tag):
+        """
+        Return the style name of tag.
+
+        The style is only taken when the tag is first displayed: the tags
+        with the same options use the same style of the family, whose name
+        is reused once no displayed tag uses it anymore.
+        """
+        try:
+            return self._tag_styles[tag]
+        except KeyError:
+            pass
+        props = self._tags[tag]
+        family = self._style_family
+        # the values, e.g. a font given as a list, may be unhashable
+        key = tuple(sorted((option, str(value)) for option, value in props.items()))
+        try:
+            entry = family.tags[key]
+        except KeyError:
+            options = {}
+            if family.free_tags:
+                name = family.free_tags.pop()
+                # reset the options of the previous tags to the ones of the normal days
+                normal = 'normal.%s.TLabel' % family.prefix
+                for option in self.style.configure(name) or {}:
+                    value = self.style.lookup(normal, option)
+                    if value != '':
+                        options[option] = value
+            else:
+                name = 'tag%i.%s.TLabel' % (len(family.tags), family.prefix)
+            options.update(props)
+            self.style.configure(name, **options)
+            entry = family.tags[key] = [name, 0, props]
+            family.tag_keys[name] = key
+        entry[1] += 1
+        self._tag_styles[tag] = entry[0]
+        return entry[0]
+
+    def _release_tag_style(self, tag):
+        """Stop using the style of tag."""
+        name = self._tag_styles.pop(tag, None)
+        family = self._style_family
+        if name is None:
+            return
+        key = family.tag_keys[name]
+        entry = family.tags[key]
+        entry[1] -= 1
+        if not entry[1]:
+            del family.tags[key]
+            del family.tag_keys[name]
+            family.free_tags.append(name)
+
+    def _set_calevent_store(self, store):
+        """Use store for the calendar events."""
+        self._model.store = store
+        self.calevents = store.events  # special events displayed in colors and with tooltips to show content
+        self._calevent_dates = store.dates  # list of event ids for each date
+        for tag in store.tag_names():
+            if tag not in self._tags:
+                self._tag_initialize(tag)
+
+    @staticmethod
+    def _check_workers(workers):
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            raise ValueError("expected integer for the 'eventproviderworkers' option.")
+        if workers < 0:
+            raise ValueError("'eventproviderworkers' option should be positive or 0.")
+        return workers
+
     @staticmethod
     def _check_weekenddays(weekenddays):
         try:
@@ -797,6 +1285,12 @@ class Calendar(ttk.Frame):
         self.style.configure('%s.TButton' % self._style_prefixe, background=bg,
                              arrowcolor=fg, arrowsize=size, bordercolor=bg,
                              relief="flat", lightcolor=bg, darkcolor=bg)
+        # the arrows are configured separately by configure and the style
+        # names are reused after the destruction of the calendar
+        for button in ('L', 'R'):
+            self.style.configure('%s.%s.TButton' % (button, self._style_prefixe), background=bg,
+                                 arrowcolor=fg, arrowsize=size, bordercolor=bg,
+                                 lightcolor=bg, darkcolor=bg)
         self.style.configure('%s.tooltip.TLabel' % self._style_prefixe,
                              background=self._properties['tooltipbackground'],
                              foreground=self._properties['tooltipforeground'])
@@ -820,226 +1314,360 @@ class Calendar(ttk.Frame):
                        background=[('disabled', dis_day_bg)],
                        foreground=[('disabled', dis_day_fg)])
 
-    # --- display
-    def _display_calendar(self):
-        """Display the days of the current month (the one in self._date)."""
-        year, month = self._date.year, self._date.month
-
-        # update header text (Month, Year)
-        header = self._month_names[month]
-        self._header_month.configure(text=header.title())
-        self._header_year.configure(text=str(year))
+    def _update_theme(self, done):
+        """Configure the styles in the new theme, done being the set of the already configured styles."""
+        family = self._style_family
+        if family.prefix in done:
+            # shared styles configured by another calendar
+            return
+        done.add(family.prefix)
+        self._setup_style()
+        # the styles are defined per theme
+        for name, users, props in family.tags.values():
+            self.style.configure(name, **props)
+
+    def destroy(self):
+        for after_id in self._imports.values():
+            self.after_cancel(after_id)
+        self._imports.clear()
+        self._cancel_provider_loading()
+        if self._provider_executor is not None:
+            self._provider_executor.shutdown(wait=False)
+            self._provider_executor = None
+        _ThemeCoordinator.unregister(self)
+        self.tooltip_wrapper.destroy()
+        if self._textvariable is not None:
+            try:
+                self._textvariable.trace_remove('write', self._textvariable_trace_id)
+            except AttributeError:
+                self._textvariable.trace_vdelete('w', self._textvariable_trace_id)
+            self._textvariable = None
+        if self._style_family is not None:
+            for tag in list(self._tag_styles):
+                self._release_tag_style(tag)
+            self._release_style_family()
+        ttk.Frame.destroy(self)
+        for font in (self._font, self._header_font):
+            if font.delete_font:
+                # do not wait for the garbage collection of the calendar
+                self.tk.call('font', 'delete', font.name)
+                font.delete_font = False
 
-        # remove previous tooltips
-        self.tooltip_wrapper.remove_all()
+    # --- display
+    @contextmanager
+    def batch(self):
+        """
+        Context manager deferring the display updates until the end of the block.
 
-        # update calendar shown dates
-        if self['showothermonthdays']:
-            self._display_days_with_othermonthdays()
-        else:
-            self._display_days_without_othermonthdays()
+        Inside the block, the calendar only records which days, header items
+        and buttons need to be redrawn, they are redrawn once when the
+        outermost block exits::
 
-        self._display_selection()
-        maxdate = self['maxdate']
-        mindate = self['mindate']
+            with cal.batch():
+                cal.calevent_remove('all')
+                for date, text in events:
+                    cal.calevent_create(date, text)
+                cal.configure(mindate=start, maxdate=end)
 
-        if maxdate is not None:
-            mi, mj = self._get_day_coords(maxdate)
-            if mi is not None:
-                for j in range(mj + 1, 7):
-                    self._calendar[mi][j].state(['disabled'])
-                for i in range(mi + 1, 6):
-                    for j in range(7):
-                        self._calendar[i][j].state(['disabled'])
+        The display updates of a hidden (unmapped) calendar are deferred the
+        same way until it is mapped.
+        """
+        self._batch_level += 1
+        try:
+            yield self
+        finally:
+            self._batch_level -= 1
+            if not self._batch_level:
+                self._flush_batch()
+
+    def _flush_batch(self):
+        """Redraw what has been recorded during the batch."""
+        dirty = self._dirty
+        self._dirty = set()
+        if not self.winfo_exists():
+            return
+        with self._tk_batch():
+            if 'buttons' in dirty:
+                # moving the displayed month in the allowed range is recorded
+                # as a full display update
+                self._batch_level += 1
+                try:
+                    self._update_btns_date_range()
+                finally:
+                    self._batch_level -= 1
+                dirty |= self._dirty
+                self._dirty = set()
+            if 'calendar' in dirty:
+                self._display_calendar()
+            else:
+                dirty.discard('buttons')
+                selection = 'selection' in dirty
+                dirty.discard('selection')
+                for date in dirty:
+                    self._reset_day(date)
+                    self._show_event(date)
+                if selection or self._sel_date in dirty:
+                    self._display_selection()
 
-        if mindate is not None:
-            mi, mj = self._get_day_coords(mindate)
-            if mi is not None:
-                for j in range(mj):
-                    self._calendar[mi][j].state(['disabled'])
-                for i in range(mi):
-                    for j in range(7):
-                        self._calendar[i][j].state(['disabled'])
-
-    def _display_days_without_othermonthdays(self):
-        year, month = self._date.year, self._date.month
-
-        cal = self._cal.monthdays2calendar(year, month)
-        while len(cal) < 6:
-            cal.append([(0, i) for i in range(7)])
-
-        week_days = {i: 'normal.%s.TLabel' % self._style_prefixe for i in range(7)}  # style names depending on the type of day
-        week_days[self['weekenddays'][0] - 1] = 'we.%s.TLabel' % self._style_prefixe
-        week_days[self['weekenddays'][1] - 1] = 'we.%s.TLabel' % self._style_prefixe
-        _, week_nb, d = self._date.isocalendar()
-        if d == 7 and self['firstweekday'] == 'sunday':
-            week_nb += 1
-        modulo = max(week_nb, 52)
+    def _display_calendar(self):
+        """Display the days of the current month (the one in self._date)."""
+        if self._batch_level:
+            self._dirty.add('calendar')
+            return
+        self._redraw_count += 1
+        if self._date != self._tooltip_month:
+            # only the tooltip texts of the displayed month are kept
+            self._tooltip_texts.clear()
+            self._tooltip_month = self._date
+        with self._tk_batch():
+            self._display_header()
+            self._load_provided_events()
+
+            self._display_days()
+
+    def _display_header(self):
+        """Display the current month and year in the header."""
+        header = (self._month_names[self._date.month].title(), str(self._date.year))
+        self._set_header(*(new if new != old else None
+                           for new, old in zip(header, self._shown_header)))
+        self._shown_header = header
+
+    def _display_week_days(self):
+        """Display the week day names."""
+        for i, day in enumerate(self._model.weekdays()):
+            self._set_week_day(i, self._day_names[day % 7])
+
+    def _display_days(self):
+        """Display the days and week numbers computed by the model, only sending the changes to Tk."""
+        cells, week_nbs = self._model.cells(self._provided.get((self._date.year, self._date.month)))
+        prefix = self._style_prefixe
+        shown_tags = set()
         for i_week in range(6):
-            if i_week == 0 or cal[i_week][0][0]:
-                self._week_nbs[i_week].configure(text=str((week_nb + i_week - 1) % modulo + 1))
-            else:
-                self._week_nbs[i_week].configure(text='')
+            if week_nbs[i_week] != self._shown_week_nbs[i_week]:
+                self._set_week_number(i_week, week_nbs[i_week])
+                self._shown_week_nbs[i_week] = week_nbs[i_week]
             for i_day in range(7):
-                day_number, week_day = cal[i_week][i_day]
-                style = week_days[i_day]
-                label = self._calendar[i_week][i_day]
-                label.state(['!disabled'])
-                if day_number:
-                    txt = str(day_number)
-                    label.configure(text=txt, style=style)
-                    date = self.date(year, month, day_number)
-                    if date in self._calevent_dates:
-                        ev_ids = self._calevent_dates[date]
-                        i = len(ev_ids) - 1
-                        while i >= 0 and not self.calevents[ev_ids[i]]['tags']:
-                            i -= 1
-                        if i >= 0:
-                            tag = self.calevents[ev_ids[i]]['tags'][-1]
-                            label.configure(style='tag_%s.%s.TLabel' % (tag, self._style_prefixe))
-                        text = '\n'.join(['➢ {}'.format(self.calevents[ev]['text']) for ev in ev_ids])
-                        self.tooltip_wrapper.add_tooltip(label, text)
+                text, style, disabled, date = cells[7 * i_week + i_day]
+                if style.startswith('tag_'):
+                    shown_tags.add(style[4:])
+                    style = self._tag_style(style[4:])
                 else:
-                    label.configure(text='', style=style)
-
-    def _display_days_with_othermonthdays(self):
-        year, month = self._date.year, self._date.month
-
-        cal = self._cal.monthdatescalendar(year, month)
+                    style = '%s.%s.TLabel' % (style, prefix)
+                self._set_day(i_week, i_day, text, style, disabled)
+                self._set_day_tooltip(i_week, i_day,
+                                      None if date is None else partial(self._get_tooltip_text, date))
+        # release the styles of the tags which are no longer displayed
+        for tag in [tag for tag in self._tag_styles if tag not in shown_tags]:
+            self._release_tag_style(tag)
+
+    def _set_day(self, w, d, text=None, style=None, disabled=None):
+        """Configure the label of day (w, d), None meaning no change, only sending the changes to Tk."""
+        shown = self._shown_days[w][d]
+        options = []
+        if text is not None and text != shown[0]:
+            options += ['-text', text]
+            shown[0] = text
+        if style is not None and style != shown[1]:
+            options += ['-style', style]
+            shown[1] = style
+        label = str(self._calendar[w][d])
+        if options:
+            self._tk_command(label, 'configure', *options)
+        if disabled is not None and disabled != shown[2]:
+            shown[2] = disabled
+            self._tk_command(label, 'state', 'disabled' if disabled else '!disabled')
+
+    def _set_header(self, month=None, year=None):
+        """Configure the header labels, None meaning no change."""
+        if month is not None:
+            self._tk_command(str(self._header_month), 'configure', '-text', month)
+        if year is not None:
+            self._tk_command(str(self._header_year), 'configure', '-text', year)
+
+    def _set_week_day(self, i, text):
+        self._tk_command(str(self._week_days[i]), 'configure', '-text', text)
+
+    def _set_week_number(self, i, text):
+        self._tk_command(str(self._week_nbs[i]), 'configure', '-text', text)
+
+    def _set_day_tooltip(self, w, d, text):
+        """Set the tooltip text (or function returning it) of day (w, d), None for no tooltip."""
+        self.tooltip_wrapper.set_tooltip_text(self._calendar[w][d], text)
+
+    def _load_provided_events(self):
+        """Get the events of the displayed month from the eventprovider, if not cached."""
+        provider = self['eventprovider']
+        if provider is None:
+            return
+        key = (self._date.year, self._date.month)
+        try:
+            store = self._provided.pop(key)
+        except KeyError:
+            if self['eventproviderworkers']:
+                self._load_provided_events_async(provider, key)
+                return
+            store = EventStore()
+            store.add_many(self._check_calevents(provider(*self._model.grid_range())))
+        self._cache_provided_events(key, store)
+
+    def _cache_provided_events(self, key, store):
+        """Put the provided events of month key in the cache."""
+        self._provided[key] = store
+        self._tooltip_texts.clear()
+        if len(self._provided) > self.eventprovider_cache_size:
+            self._provided.popitem(last=False)
+
+    def _load_provided_events_async(self, provider, key):
+        """Call the eventprovider in a worker thread for month key."""
+        # the loading of the previously displayed months is no longer needed
+        for month, future in list(self._provider_pending.items()):
+            if month != key:
+                future.cancel()
+                del self._provider_pending[month]
+        if key in self._provider_pending:
+            return
+        if self._provider_executor is None:
+            self._provider_executor = ThreadPoolExecutor(self['eventproviderworkers'])
+        # the worker only gets the events, the tags are initialized in the main thread
+        future = self._provider_executor.submit(lambda r: list(provider(*r)), self._model.grid_range())
+        future.month = key
+        future.add_done_callback(self._provider_queue.put)
+        self._provider_pending[key] = future
+        if self._provider_poll_id is None:
+            self._provider_poll_id = self.after(self.eventprovider_poll_delay,
+                                                self._poll_provided_events)
+
+    def _poll_provided_events(self):
+        """Add the events loaded in the background to the cache (main thread only)."""
+        self._provider_poll_id = None
+        refresh = False
+        error = None
+        while True:
+            try:
+                future = self._provider_queue.get_nowait()
+            except queue.Empty:
+                break
+            key = future.month
+            if self._provider_pending.get(key) is not future:
+                continue  # stale result
+            del self._provider_pending[key]
+            try:
+                events = self._check_calevents(future.result())
+            except Exception as e:
+                error = e  # raised once the other results are processed
+                continue
+            store = EventStore()
+            store.add_many(events)
+            self._cache_provided_events(key, store)
+            refresh = refresh or key == (self._date.year, self._date.month)
+        if self._provider_pending:
+            self._provider_poll_id = self.after(self.eventprovider_poll_delay,
+                                                self._poll_provided_events)
+        if refresh:
+            self._display_calendar()
+        if error is not None:
+            raise error
+
+    def _cancel_provider_loading(self):
+        """Cancel the background loading of the provided events."""
+        for future in self._provider_pending.values():
+            future.cancel()
+        self._provider_pending.clear()
+        if self._provider_poll_id is not None:
+            self.after_cancel(self._provider_poll_id)
+            self._provider_poll_id = None
+
+    def _get_day_events(self, date):
+        """Return the list of the events displayed on date."""
+        return self._model.day_events(date, self._provided.get((self._date.year, self._date.month)))
+
+    def _get_tooltip_text(self, date):
+        """Return the tooltip text of date (called when the tooltip is displayed)."""
+        try:
+            return self._tooltip_texts[date]
+        except KeyError:
+            text = '\n'.join(['➢ {}'.format(ev.text) for ev in self._get_day_events(date)])
+            self._tooltip_texts[date] = text
+            return text
 
-        next_m = month + 1
-        y = year
-        if next_m == 13:
-            next_m = 1
-            y += 1
-        if len(cal) < 6:
-            if cal[-1][-1].month == month:
-                i = 0
-            else:
-                i = 1
-            cal.append(self._cal.monthdatescalendar(y, next_m)[i])
-            if len(cal) < 6:
-                cal.append(self._cal.monthdatescalendar(y, next_m)[i + 1])
-
-        week_days = {i: 'normal' for i in range(7)}  # style names depending on the type of day
-        week_days[self['weekenddays'][0] - 1] = 'we'
-        week_days[self['weekenddays'][1] - 1] = 'we'
-        prev_m = (month - 2) % 12 + 1
-        months = {month: '.%s.TLabel' % self._style_prefixe,
-                  next_m: '_om.%s.TLabel' % self._style_prefixe,
-                  prev_m: '_om.%s.TLabel' % self._style_prefixe}
-
-        week_nb = cal[0][1].isocalendar()[1]
-        modulo = max(week_nb, 52)
-        for i_week in range(6):
-            self._week_nbs[i_week].configure(text=str((week_nb + i_week - 1) % modulo + 1))
-            for i_day in range(7):
-                style = week_days[i_day] + months[cal[i_week][i_day].month]
-                label = self._calendar[i_week][i_day]
-                label.state(['!disabled'])
-                txt = str(cal[i_week][i_day].day)
-                label.configure(text=txt, style=style)
-                if cal[i_week][i_day] in self._calevent_dates:
-                    date = cal[i_week][i_day]
-                    ev_ids = self._calevent_dates[date]
-                    i = len(ev_ids) - 1
-                    while i >= 0 and not self.calevents[ev_ids[i]]['tags']:
-                        i -= 1
-                    if i >= 0:
-                        tag = self.calevents[ev_ids[i]]['tags'][-1]
-                        label.configure(style='tag_%s.%s.TLabel' % (tag, self._style_prefixe))
-                    text = '\n'.join(['➢ {}'.format(self.calevents[ev]['text']) for ev in ev_ids])
-                    self.tooltip_wrapper.add_tooltip(label, text)
+    def _calevents_changed(self):
+        """Redisplay the calendar after a change of the events of several days."""
+        self._tooltip_texts.clear()
+        self._display_calendar()
 
     def _get_day_coords(self, date):
-        y1, y2 = date.year, self._date.year
-        m1, m2 = date.month, self._date.month
-        if y1 == y2 or (y1 - y2 == 1 and m1 == 1 and m2 == 12) or (y2 - y1 == 1 and m2 == 1 and m1 == 12):
-            _, w, d = date.isocalendar()
-            _, wn, dn = self._date.isocalendar()
-            if self['firstweekday'] == 'sunday':
-                d %= 7
-                if d == 0:
-                    w += 1
-                if dn == 7:
-                    wn += 1
-            else:
-                d -= 1
-            w -= wn
-            w %= max(52, wn)
-            if 0 <= w < 6:
-                return w, d
-            else:
-                return None, None
-        else:
-            return None, None
+        """Return the (row, column) of date in the grid, (None, None) if it is not displayed."""
+        return self._model.day_coords(date)
 
     def _display_selection(self):
         """Highlight selected day."""
+        if self._batch_level:
+            self._dirty.add('selection')
+            return
         if self._sel_date is not None:
             w, d = self._get_day_coords(self._sel_date)
-            if w is not None:
-                label = self._calendar[w][d]
-                if label.cget('text'):
-                    label.configure(style='sel.%s.TLabel' % self._style_prefixe)
+            if w is not None and self._shown_days[w][d][0]:
+                self._set_day(w, d, style='sel.%s.TLabel' % self._style_prefixe)
 
     def _reset_day(self, date):
         """Restore usual week day colors."""
-        month = date.month
+        if self._batch_level:
+            self._dirty.add(date)
+            return
         w, d = self._get_day_coords(date)
         if w is not None:
-            self.tooltip_wrapper.remove_tooltip(self._calendar[w][d])
-            week_end = [0, 6] if self['firstweekday'] == 'sunday' else [5, 6]
-            if month == date.month:
-                if d in week_end:
-                    self._calendar[w][d].configure(style='we.%s.TLabel' % self._style_prefixe)
-                else:
-                    self._calendar[w][d].configure(style='normal.%s.TLabel' % self._style_prefixe)
-            else:
-                if d in week_end:
-                    self._calendar[w][d].configure(style='we_om.%s.TLabel' % self._style_prefixe)
-
-                else:
-                    self._calendar[w][d].configure(style='normal_om.%s.TLabel' % self._style_prefixe)
+            self._set_day_tooltip(w, d, None)
+            self._set_day_style(w, d, '%s.%s.TLabel' % (self._model.day_style(date), self._style_prefixe))
+
+    def _set_day_style(self, w, d, style):
+        """Set the style of day (w, d), releasing the tag style it replaces if no other day shows it."""
+        old = self._shown_days[w][d][1]
+        self._set_day(w, d, style=style)
+        if old == style or old not in self._tag_styles.values():
+            return
+        if any(shown[1] == old for week in self._shown_days for shown in week):
+            return
+        for tag in [tag for tag, name in self._tag_styles.items() if name == old]:
+            self._release_tag_style(tag)
 
     def _remove_selection(self):
         """Remove highlight of selected day."""
+        if self._batch_level:
+            if self._sel_date is not None:
+                self._dirty.add(self._sel_date)
+            return
         if self._sel_date is not None:
-            if self._sel_date in self._calevent_dates:
+            if self._get_day_events(self._sel_date):
                 self._show_event(self._sel_date)
             else:
                 w, d = self._get_day_coords(self._sel_date)
                 if w is not None:
-                    week_end = [0, 6] if self['firstweekday'] == 'sunday' else [5, 6]
-                    if self._sel_date.month == self._date.month:
-                        if d in week_end:
-                            self._calendar[w][d].configure(style='we.%s.TLabel' % self._style_prefixe)
-                        else:
-                            self._calendar[w][d].configure(style='normal.%s.TLabel' % self._style_prefixe)
-                    else:
-                        if d in week_end:
-                            self._calendar[w][d].configure(style='we_om.%s.TLabel' % self._style_prefixe)
-                        else:
-                            self._calendar[w][d].configure(style='normal_om.%s.TLabel' % self._style_prefixe)
+                    self._set_day(w, d, style='%s.%s.TLabel' % (self._model.day_style(self._sel_date),
+                                                                 self._style_prefixe))
 
     def _show_event(self, date):
         """Display events on date if visible."""
+        # the events of date have changed
+        self._tooltip_texts.pop(date, None)
+        if self._batch_level:
+            self._dirty.add(date)
+            return
         w, d = self._get_day_coords(date)
         if w is not None:
-            label = self._calendar[w][d]
-            if not label.cget('text'):
+            if not self._shown_days[w][d][0]:
                 # this is an other month's day and showothermonth is False
                 return
-            ev_ids = self._calevent_dates[date]
-            i = len(ev_ids) - 1
-            while i >= 0 and not self.calevents[ev_ids[i]]['tags']:
-                i -= 1
-            if i >= 0:
-                tag = self.calevents[ev_ids[i]]['tags'][-1]
-                label.configure(style='tag_%s.%s.TLabel' % (tag, self._style_prefixe))
-            text = '\n'.join(['➢ {}'.format(self.calevents[ev]['text']) for ev in ev_ids])
-            self.tooltip_wrapper.remove_tooltip(label)
-            self.tooltip_wrapper.add_tooltip(label, text)
+            day_tags = self._model.visible_tags(date, date, self._provided.get((self._date.year, self._date.month)))
+            if date not in day_tags:
+                # no event
+                return
+            tag = day_tags[date]
+            if tag is None:
+                # no event has tags
+                self._reset_day(date)
+            else:
+                self._set_day_style(w, d, self._tag_style(tag))
+            self._set_day_tooltip(w, d, partial(self._get_tooltip_text, date))
 
     def check_date_range(self, date):
         """
@@ -1050,122 +1678,83 @@ class Calendar(ttk.Frame):
         Return date if date is in the allowed date range, return the closest
         bound otherwise.
         """
-        maxdate = self['maxdate']
-        mindate = self['mindate']
-        if maxdate is not None and date > maxdate:
-            return maxdate
-        elif mindate is not None and date < mindate:
-            return mindate
-        else:
-            return date
+        return self._model.check_date_range(date)
 
     def _check_sel_date(self):
-
-        if self._sel_date is not None:
-            maxdate = self['maxdate']
-            mindate = self['mindate']
-            if maxdate is not None and self._sel_date > maxdate:
-                self._sel_date = maxdate
-                self._display_selection()
-            elif mindate is not None and self._sel_date < mindate:
-                self._sel_date = mindate
-                self._display_selection()
+        """Move the selection in the allowed date range."""
+        if self._model.check_selection():
+            self._display_selection()
 
     def _btns_date_range(self):
         """Disable/enable buttons depending on allowed date range."""
-        maxdate = self['maxdate']
-        mindate = self['mindate']
-
-        if maxdate is not None:
-            max_year, max_month = maxdate.year, maxdate.month
-            if self._date > maxdate:
-                self._date = self._date.replace(year=max_year, month=max_month)
-                self._display_calendar()
-
-            dy = max_year - self._date.year
-            if dy == 0:
-                self._r_year.state(['disabled'])
-                if self._date.month == max_month:
-                    self._r_month.state(['disabled'])
-                else:
-                    self._r_month.state(['!disabled'])
-            elif dy == 1:
-                if self._date.month > max_month:
-                    self._r_year.state(['disabled'])
-                else:
-                    self._r_year.state(['!disabled'])
-                    self._r_month.state(['!disabled'])
-            else:  # dy > 1
-                self._r_year.state(['!disabled'])
-                self._r_month.state(['!disabled'])
-
-        if mindate is not None:
-            min_year, min_month = mindate.year, mindate.month
-            if self._date < mindate:
-                self._date = self._date.replace(year=min_year, month=min_month)
-                self._display_calendar()
-
-            dy = self._date.year - min_year
-            if dy == 0:
-                self._l_year.state(['disabled'])
-                if self._date.month == min_month:
-                    self._l_month.state(['disabled'])
-                else:
-                    self._l_month.state(['!disabled'])
-            elif dy == 1:
-                if self._date.month >= min_month:
-                    self._l_year.state(['!disabled'])
-                    self._l_month.state(['!disabled'])
-                else:
-                    self._l_year.state(['disabled'])
-            else:  # dy > 1
-                self._l_year.state(['!disabled'])
-                self._l_month.state(['!disabled'])
+        if self._batch_level:
+            self._dirty.add('buttons')
+            return
+        self._update_btns_date_range()
+
+    def _update_btns_date_range(self):
+        """Disable/enable buttons right away, even during a batch."""
+        if self._model.check_month():
+            self._display_calendar()
+        for button, disabled in self._model.navigation_state().items():
+            self._set_button_state(button, disabled)
 
     # --- callbacks
     def _next_month(self):
         """Display the next month."""
-        year, month = self._date.year, self._date.month
-        self._date = self._date + \
-            self.timedelta(days=calendar.monthrange(year, month)[1])
+        self._model.next_month()
         self._display_calendar()
         self.event_generate('<<CalendarMonthChanged>>')
         self._btns_date_range()
 
     def _prev_month(self):
         """Display the previous month."""
-        self._date = self._date - self.timedelta(days=1)
-        self._date = self._date.replace(day=1)
+        self._model.prev_month()
         self._display_calendar()
         self.event_generate('<<CalendarMonthChanged>>')
         self._btns_date_range()
 
     def _next_year(self):
         """Display the next year."""
-        year = self._date.year
-        self._date = self._date.replace(year=year + 1)
+        self._model.next_year()
         self._display_calendar()
         self.event_generate('<<CalendarMonthChanged>>')
         self._btns_date_range()
 
     def _prev_year(self):
         """Display the previous year."""
-        year = self._date.year
-        self._date = self._date.replace(year=year - 1)
+        self._model.prev_year()
         self._display_calendar()
         self.event_generate('<<CalendarMonthChanged>>')
         self._btns_date_range()
 
     # --- bindings
+    def _on_map(self, event):
+        """Display what has changed while the calendar was hidden."""
+        if self._unmapped:
+            self._unmapped = False
+            self._batch_level -= 1
+            if not self._batch_level:
+                self._flush_batch()
+
+    def _on_unmap(self, event):
+        """Defer the display updates until the calendar is mapped again."""
+        if not self._unmapped:
+            self._unmapped = True
+            self._batch_level += 1
+
     def _on_click(self, event):
         """Select the day on which the user clicked."""
+        label = event.widget
+        self._select_day(label.cget("text"), label.cget("style"), "disabled" in label.state(),
+                         label in self._calendar[0])
+
+    def _select_day(self, day, style, disabled, first_week):
+        """Select the clicked day, given its text, style and state and whether it is in the first week."""
         if self._properties['state'] == 'normal':
-            label = event.widget
-            if "disabled" not in label.state():
-                day = label.cget("text")
-                style = label.cget("style")
+            if not disabled:
                 if style in ['normal_om.%s.TLabel' % self._style_prefixe, 'we_om.%s.TLabel' % self._style_prefixe]:
-                    if label in self._calendar[0]:
+                    if first_week:
                         self._prev_month()
                     else:
                         self._next_month()
@@ -1244,7 +1833,7 @@ class Calendar(ttk.Frame):
         elif not isinstance(date, self.date):
             raise TypeError("expected %s for the 'date' argument." % self.date)
 
-        self._date = self._date.replace(month=date.month, year=date.year)
+        self._model.see(date)
         self._display_calendar()
         self._btns_date_range()
 
@@ -1289,12 +1878,9 @@ class Calendar(ttk.Frame):
                 else:
                     try:
                         self._sel_date = self.parse_date(date)
-                    except Exception as e:
+                    except Exception:
                         raise ValueError("%r is not a valid date." % date)
-                if self['mindate'] is not None and self._sel_date < self['mindate']:
-                    self._sel_date = self['mindate']
-                elif self['maxdate'] is not None and self._sel_date > self['maxdate']:
-                    self._sel_date = self['maxdate']
+                self._sel_date = self._model.check_date_range(self._sel_date)
                 if self._textvariable is not None:
                     self._textvariable.set(self.format_date(self._sel_date))
 
@@ -1315,14 +1901,37 @@ class Calendar(ttk.Frame):
             return ""
 
     # --- events
-    def calevent_create(self, date, text, tags=[]):
+    @staticmethod
+    def _check_calevent_dates(date, recurrence, enddate):
+        """Check the date options of an event and return (date, enddate)."""
+        if isinstance(date, Calendar.datetime):
+            date = date.date()
+        if not isinstance(date, Calendar.date):
+            raise TypeError("date option should be a %s instance" % (Calendar.date))
+        if not (recurrence is None or isinstance(recurrence, Recurrence)):
+            raise TypeError("recurrence option should be a %s instance" % (Recurrence))
+        if enddate is not None:
+            if isinstance(enddate, Calendar.datetime):
+                enddate = enddate.date()
+            if not isinstance(enddate, Calendar.date):
+                raise TypeError("enddate option should be a %s instance" % (Calendar.date))
+            if enddate < date:
+                raise ValueError("enddate should not be before date")
+            if recurrence is not None:
+                raise ValueError("recurring events cannot have an enddate")
+            if enddate == date:
+                enddate = None
+        return date, enddate
+
+    def calevent_create(self, date, text, tags=[], recurrence=None, enddate=None):
         """
         Add new event in calendar and return event id.
 
         Options:
 
             date : datetime.date or datetime.datetime
-                event date
+                event date, first day for multi-day events and first
+                occurrence date for recurring events
 
             text : str
                 text to put in the tooltip associated to date.
@@ -1332,41 +1941,123 @@ class Calendar(ttk.Frame):
                 the way the event is displayed. If there are several events on
                 the same day, the lowest one (on the tooltip list) which has
                 tags determines the colors of the day.
+
+            recurrence : None (default) or Recurrence
+                recurrence rule of the event (see :class:`Recurrence`). The
+                occurrences of recurring events are displayed after the
+                other events of the day.
+
+            enddate : None (default), datetime.date or datetime.datetime
+                last day of a multi-day event, the event is displayed on all
+                days from date to enddate (both included), after the single
+                day events. Recurring events cannot have an enddate.
         """
-        if isinstance(date, Calendar.datetime):
-            date = date.date()
-        if not isinstance(date, Calendar.date):
-            raise TypeError("date option should be a %s instance" % (Calendar.date))
-        if self.calevents:
-            ev_id = max(self.calevents) + 1
-        else:
-            ev_id = 0
+        date, enddate = self._check_calevent_dates(date, recurrence, enddate)
         if isinstance(tags, str):
             tags_ = [tags]
         else:
             tags_ = list(tags)
-        self.calevents[ev_id] = {'date': date, 'text': text, 'tags': tags_}
+        ev_id = self._model.store.add(date, text, tags_, recurrence, enddate)
         for tag in tags_:
             if tag not in self._tags:
                 self._tag_initialize(tag)
-        if date not in self._calevent_dates:
-            self._calevent_dates[date] = [ev_id]
+        if recurrence is None and enddate is None:
+            self._show_event(date)
         else:
-            self._calevent_dates[date].append(ev_id)
-        self._show_event(date)
+            self._calevents_changed()
         return ev_id
 
+    def _check_calevents(self, events):
+        """
+        Check the (date, text, tags, recurrence, enddate) tuples of events
+        and return them with all the options, initializing the new tags.
+        """
+        new_events = []
+        for event in events:
+            date, text = event[:2]
+            tags = event[2] if len(event) > 2 else []
+            recurrence = event[3] if len(event) > 3 else None
+            enddate = event[4] if len(event) > 4 else None
+            date, enddate = self._check_calevent_dates(date, recurrence, enddate)
+            if isinstance(tags, str):
+                tags_ = [tags]
+            else:
+                tags_ = list(tags)
+            for tag in tags_:
+                if tag not in self._tags:
+                    self._tag_initialize(tag)
+            new_events.append((date, text, tags_, recurrence, enddate))
+        return new_events
+
+    def calevent_create_many(self, events):
+        """
+        Add several events in calendar and return the list of their ids.
+
+            events : iterable of (date, text, tags, recurrence, enddate) tuples
+                see calevent_create options, tags, recurrence and enddate
+                can be omitted.
+
+        Unlike successive calls to calevent_create, the calendar display is
+        refreshed only once, after all the events have been added.
+        """
+        new_events = self._check_calevents(events)
+        if not new_events:
+            return []
+        ev_ids = self._model.store.add_many(new_events)
+        self._calevents_changed()
+        return ev_ids
+
+    def calevent_import(self, events, chunksize=1000, callback=None):
+        """
+        Add events in calendar progressively, without blocking the GUI.
+
+            events : iterable of (date, text, tags, recurrence, enddate) tuples
+                see calevent_create_many, e.g. the generator returned by
+                tkcalendar.ical.read_ics.
+
+            chunksize : int
+                number of events added at once, the next chunk is added when
+                the GUI is idle.
+
+            callback : None or function
+                function called with the list of the ids of the new events
+                once they have all been added.
+
+        The events iterable is consumed lazily, one chunk at a time.
+        """
+        try:
+            chunksize = int(chunksize)
+        except (TypeError, ValueError):
+            raise ValueError("expected integer for the 'chunksize' argument.")
+        if chunksize < 1:
+            raise ValueError("'chunksize' argument should be positive.")
+        iterator = iter(events)
+        ev_ids = []
+
+        def add_chunk():
+            del self._imports[iterator]
+            chunk = list(islice(iterator, chunksize))
+            if chunk:
+                ev_ids.extend(self.calevent_create_many(chunk))
+            if len(chunk) == chunksize:
+                self._imports[iterator] = self.after_idle(add_chunk)
+            elif callback is not None:
+                callback(ev_ids)
+
+        self._imports[iterator] = self.after_idle(add_chunk)
+
     def _calevent_remove(self, ev_id):
         """Remove event ev_id."""
+        store = self._model.store
+        single = ev_id in store and not (store.is_recurring(ev_id) or store.is_span(ev_id))
         try:
-            date = self.calevents[ev_id]['date']
+            date = store.remove(ev_id)
         except KeyError:
             ValueError("event %s does not exists" % ev_id)
         else:
-            del self.calevents[ev_id]
-            self._calevent_dates[date].remove(ev_id)
-            if not self._calevent_dates[date]:
-                del self._calevent_dates[date]
+            if not single:
+                self._calevents_changed()
+            elif not self._get_day_events(date):
                 self._reset_day(date)
             else:
                 self._show_event(date)
@@ -1386,14 +2077,24 @@ class Calendar(ttk.Frame):
         if ev_ids:
             if 'all' in ev_ids:
                 ev_ids = self.get_calevents()
-            for ev_id in ev_ids:
-                self._calevent_remove(ev_id)
         else:
             date = kw.get('date')
             tag = kw.get('tag')
-            evs = self.get_calevents(tag=tag, date=date)
-            for ev_id in evs:
-                self._calevent_remove(ev_id)
+            ev_ids = self.get_calevents(tag=tag, date=date)
+        if len(ev_ids) == 1:
+            self._calevent_remove(ev_ids[0])
+        else:
+            self.calevent_remove_many(ev_ids)
+
+    def calevent_remove_many(self, ev_ids):
+        """
+        Remove the events whose ids are in the iterable ev_ids.
+
+        Unlike successive calls to calevent_remove, the calendar display is
+        refreshed only once, after all the events have been removed.
+        """
+        if self._model.store.remove_many(ev_ids):
+            self._calevents_changed()
 
     def calevent_cget(self, ev_id, option):
         """Return value of given option for the event ev_id."""
@@ -1405,13 +2106,18 @@ class Calendar(ttk.Frame):
             try:
                 return ev[option]
             except KeyError:
+                if option in ('recurrence', 'enddate'):
+                    return None
                 raise ValueError('unknown option "%s"' % option)
 
     def calevent_configure(self, ev_id, **kw):
         """
         Configure the event ev_id.
 
-        Keyword options: date, text, tags (see calevent_create options).
+        Keyword options: date, text, tags, recurrence, enddate (see calevent_create options).
+
+        Changing the date of a multi-day event shifts the whole event unless
+        enddate is also given.
         """
         try:
             ev = self.calevents[ev_id]
@@ -1421,37 +2127,47 @@ class Calendar(ttk.Frame):
             text = kw.pop('text', None)
             tags = kw.pop('tags', None)
             date = kw.pop('date', None)
+            change_recurrence = 'recurrence' in kw
+            recurrence = kw.pop('recurrence', ev.recurrence)
+            change_enddate = 'enddate' in kw
+            enddate = kw.pop('enddate', None)
             if kw:
-                raise KeyError('Invalid keyword option(s) %s, valid options are "text", "tags" and "date".' % (kw.keys(),))
-            else:
-                if text is not None:
-                    ev['text'] = str(text)
-                if tags is not None:
-                    if isinstance(tags, str):
-                        tags_ = [tags]
-                    else:
-                        tags_ = list(tags)
-                    for tag in tags_:
-                        if tag not in self._tags:
-                            self._tag_initialize(tag)
-                    ev['tags'] = tags_
-                if date is not None:
-                    if isinstance(date, Calendar.datetime):
-                        date = date.date()
-                    if not isinstance(date, Calendar.date):
-                        raise TypeError("date option should be a %s instance" % (Calendar.date))
-                    old_date = ev['date']
-                    self._calevent_dates[old_date].remove(ev_id)
-                    if not self._calevent_dates[old_date]:
+                raise KeyError('Invalid keyword option(s) %s, valid options are "text", "tags", "date", "recurrence" and "enddate".' % (kw.keys(),))
+            store = self._model.store
+            single = not (store.is_recurring(ev_id) or store.is_span(ev_id))
+            new_date, enddate = self._check_calevent_dates(ev.date if date is None else date,
+                                                           recurrence, enddate)
+            if not change_enddate and recurrence is not None and store.is_span(ev_id):
+                raise ValueError("recurring events cannot have an enddate")
+            # whether the event stays displayed on a single day
+            still_single = single and recurrence is None and enddate is None
+            if text is not None:
+                store.set_text(ev_id, str(text))
+            if tags is not None:
+                if isinstance(tags, str):
+                    tags_ = [tags]
+                else:
+                    tags_ = list(tags)
+                for tag in tags_:
+                    if tag not in self._tags:
+                        self._tag_initialize(tag)
+                store.set_tags(ev_id, tags_)
+            if date is not None:
+                old_date = store.move(ev_id, new_date)
+                if still_single:
+                    if not self._get_day_events(old_date):
                         self._reset_day(old_date)
                     else:
                         self._show_event(old_date)
-                    ev['date'] = date
-                    if date not in self._calevent_dates:
-                        self._calevent_dates[date] = [ev_id]
-                    else:
-                        self._calevent_dates[date].append(ev_id)
-                self._show_event(ev['date'])
+            if change_enddate:
+                store.set_enddate(ev_id, enddate)
+            if change_recurrence:
+                store.set_recurrence(ev_id, recurrence)
+            if still_single:
+                self._show_event(new_date)
+            else:
+                # the event is displayed on several days
+                self._calevents_changed()
 
     def calevent_raise(self, ev_id, above=None):
         """
@@ -1462,14 +2178,18 @@ class Calendar(ttk.Frame):
                 of tooltip event list.
 
         The day's colors are determined by the last tag of the lowest event
-        which has tags.
+        which has tags. Recurring and multi-day events cannot be raised.
         """
         try:
-            date = self.calevents[ev_id]['date']
+            date = self.calevents[ev_id].date
         except KeyError:
             raise ValueError("event %s does not exists" % ev_id)
         else:
-            evs = self._calevent_dates[date]
+            if self._model.store.is_recurring(ev_id):
+                raise ValueError("event %s is a recurring event" % ev_id)
+            if self._model.store.is_span(ev_id):
+                raise ValueError("event %s is a multi-day event" % ev_id)
+            evs = self._model.store.day_order(date)
             if above is None:
                 evs.remove(ev_id)
                 evs.insert(0, ev_id)
@@ -1480,6 +2200,7 @@ class Calendar(ttk.Frame):
                     evs.remove(ev_id)
                     index = evs.index(above)
                     evs.insert(index, ev_id)
+            self._model.store.set_day_order(date, evs)
             self._show_event(date)
 
     def calevent_lower(self, ev_id, below=None):
@@ -1491,14 +2212,18 @@ class Calendar(ttk.Frame):
                 bottom of tooltip event list.
 
         The day's colors are determined by the last tag of the lowest event
-        which has tags.
+        which has tags. Recurring and multi-day events cannot be lowered.
         """
         try:
-            date = self.calevents[ev_id]['date']
+            date = self.calevents[ev_id].date
         except KeyError:
             raise ValueError("event %s does not exists" % ev_id)
         else:
-            evs = self._calevent_dates[date]
+            if self._model.store.is_recurring(ev_id):
+                raise ValueError("event %s is a recurring event" % ev_id)
+            if self._model.store.is_span(ev_id):
+                raise ValueError("event %s is a multi-day event" % ev_id)
+            evs = self._model.store.day_order(date)
             if below is None:
                 evs.remove(ev_id)
                 evs.append(ev_id)
@@ -1509,37 +2234,86 @@ class Calendar(ttk.Frame):
                     evs.remove(ev_id)
                     index = evs.index(below) + 1
                     evs.insert(index, ev_id)
+            self._model.store.set_day_order(date, evs)
             self._show_event(date)
 
-    def get_calevents(self, date=None, tag=None):
+    def get_calevents(self, date=None, tag=None, start=None, end=None):
         """
         Return event ids of events with given tag and on given date.
 
         If only date is given, return event ids of all events on date.
         If only tag is given, return event ids of all events with tag.
         If both options are None, return all event ids.
+
+        start and end (datetime.date or datetime.datetime) restrict the
+        search to the events between start and end (both included), they are
+        taken into account only if date is None. The event ids are then
+        sorted by date.
         """
         if date is not None:
             if isinstance(date, Calendar.datetime):
                 date = date.date()
             if not isinstance(date, Calendar.date):
                 raise TypeError("date option should be a %s instance" % (Calendar.date))
-            try:
-                if tag is not None:
-                    return tuple(ev_id for ev_id in self._calevent_dates[date] if tag in self.calevents[ev_id]['tags'])
-                else:
-                    return tuple(self._calevent_dates[date])
-            except KeyError:
-                return ()
+            ev_ids = self._model.store.day(date)
+            if tag is not None:
+                return tuple(ev_id for ev_id in ev_ids if self._model.store.has_tag(ev_id, tag))
+            else:
+                return tuple(ev_ids)
+        elif start is not None or end is not None:
+            if isinstance(start, Calendar.datetime):
+                start = start.date()
+            if isinstance(end, Calendar.datetime):
+                end = end.date()
+            if not (start is None or isinstance(start, Calendar.date)):
+                raise TypeError("start option should be a %s instance" % (Calendar.date))
+            if not (end is None or isinstance(end, Calendar.date)):
+                raise TypeError("end option should be a %s instance" % (Calendar.date))
+            ev_ids = self._model.store.ids(start, end)
+            if tag is not None:
+                return tuple(ev_id for ev_id in ev_ids if self._model.store.has_tag(ev_id, tag))
+            else:
+                return tuple(ev_ids)
         elif tag is not None:
-            return tuple(ev_id for ev_id, prop in self.calevents.items() if tag in prop['tags'])
+            return tuple(self._model.store.tag_ids(tag))
         else:
             return tuple(self.calevents.keys())
 
+    def eventprovider_invalidate(self, year=None, month=None):
+        """
+        Discard the cached events given by the eventprovider.
+
+        If year and month are given, only discard the events of the months
+        displaying days of this month (the month itself and the adjacent
+        ones). If only year is given, discard the events of the months
+        displaying days of this year. Otherwise discard all cached events.
+
+        The calendar is refreshed if the displayed month is concerned.
+        """
+        if year is None:
+            self._provided.clear()
+            self._cancel_provider_loading()
+            refresh = True
+        else:
+            # months are numbered from year 0 to compare them easily
+            if month is None:
+                first, last = year * 12 - 1, year * 12 + 12
+            else:
+                first = year * 12 + month - 2
+                last = first + 2
+            for key in list(self._provided):
+                if first <= key[0] * 12 + key[1] - 1 <= last:
+                    del self._provided[key]
+            for key in list(self._provider_pending):
+                if first <= key[0] * 12 + key[1] - 1 <= last:
+                    self._provider_pending.pop(key).cancel()
+            refresh = first <= self._date.year * 12 + self._date.month - 1 <= last
+        if refresh and self['eventprovider'] is not None:
+            self._calevents_changed()
+
     def _tag_initialize(self, tag):
-        props = dict(foreground='white', background='royal blue')
-        self._tags[tag] = props
-        self.style.configure('tag_%s.%s.TLabel' % (tag, self._style_prefixe), **props)
+        # the style is created when the tag is displayed
+        self._tags[tag] = dict(foreground='white', background='royal blue')
 
     def tag_config(self, tag, **kw):
         """
@@ -1552,8 +2326,14 @@ class Calendar(ttk.Frame):
         props = dict(foreground='white', background='royal blue')  # default
         props.update(self._tags[tag])
         props.update(kw)
-        self.style.configure('tag_%s.%s.TLabel' % (tag, self._style_prefixe), **props)
         self._tags[tag] = props
+        if tag in self._tag_styles:
+            # displayed tag
+            style = self._tag_styles[tag]
+            self._release_tag_style(tag)
+            if self._tag_style(tag) != style:
+                # the days with the tag use another style
+                self._display_calendar()
 
     def tag_cget(self, tag, option):
         """Return the value of the tag's option."""
@@ -1582,10 +2362,18 @@ class Calendar(ttk.Frame):
         except KeyError:
             raise ValueError('tag "%s" does not exists' % tag)
         else:
-            for props in self.calevents.values():
-                if tag in props['tags']:
-                    props['tags'].remove(tag)
-            self._display_calendar()
+            self._release_tag_style(tag)
+            ev_ids = self._model.store.delete_tag(tag)
+            store = self._model.store
+            if any(store.is_recurring(ev_id) or store.is_span(ev_id) for ev_id in ev_ids):
+                self._calevents_changed()
+                return
+            # only redraw the visible days of the events which had the tag
+            for date in set(self.calevents[ev_id].date for ev_id in ev_ids):
+                self._reset_day(date)
+                self._show_event(date)
+                if date == self._sel_date:
+                    self._display_selection()
 
     # --- other methods
     def keys(self):
@@ -1603,12 +2391,18 @@ class Calendar(ttk.Frame):
         The values for resources are specified as keyword
         arguments. To get an overview about
         the allowed keyword arguments call the method :meth:`~Calendar.keys`.
+
+        All the values are checked before any change is made, then the
+        calendar is redrawn once and each style updated once.
         """
         if not isinstance(cnf, dict):
             raise TypeError("Expected a dictionary or keyword arguments.")
         kwargs = cnf.copy()
         kwargs.update(kw)
-        for item, value in kwargs.items():
-            self[item] = value
+        options = [(key, self._check_option(key, value)) for key, value in kwargs.items()]
+        with self.batch(), self._coalesce_styles():
+            for key, value in options:
+                self._set_option(key, value)
+            self._update_style_family()
 
     config = configure
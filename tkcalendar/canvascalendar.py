@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+Calendar widget drawn on a single canvas
+"""
+
+
+try:
+    import tkinter as tk
+except ImportError:
+    import Tkinter as tk
+
+from tkcalendar.calendar_ import Calendar
+
+
+class CanvasCalendar(Calendar):
+    """
+    Calendar widget drawn on a single canvas.
+
+    It has the same options, methods and virtual events as :class:`Calendar`
+    but the header, the week numbers and the days are canvas items instead
+    of about 60 ttk widgets, which makes it lighter when many calendars are
+    displayed at once. The colors are still given by the ttk styles of the
+    calendar.
+    """
+
+    _buttons = ('l_month', 'r_month', 'l_year', 'r_year')
+
+    def _create_widgets(self, showweeknumbers, selectmode, bd):
+        """Create the canvas items of the header, the week day names, the week numbers and the days."""
+        self._bd = bd
+        self._showweeknumbers = showweeknumbers
+        self._disabled = False
+        self._buttons_disabled = dict.fromkeys(self._buttons, False)
+        self._day_tooltips = [[None] * 7 for i in range(6)]  # tooltip text (or function returning it) of each day
+        self._hovered = None  # (w, d) of the day under the mouse
+        self._colors = {}  # {(style name, disabled): (background, foreground)}
+        self._redraw_id = None
+        # geometry, set by _update_size and _layout
+        self._button_boxes = {}
+        self._grid_origin = (0, 0)
+        self._cell_size = (1, 1)
+
+        self._canvas = c = tk.Canvas(self, borderwidth=0, highlightthickness=0)
+        # --- *-- header: month - year
+        c.create_rectangle(0, 0, 0, 0, width=0, tags='header')
+        for button in self._buttons:
+            c.create_polygon(0, 0, 0, 0, 0, 0, width=0, tags=('button', button))
+        c.create_text(0, 0, font=self._header_font, tags=('header_text', 'month'))
+        c.create_text(0, 0, font=self._header_font, tags=('header_text', 'year'))
+        # --- *-- calendar
+        c.create_rectangle(0, 0, 0, 0, width=0, tags='border')
+        c.create_rectangle(0, 0, 0, 0, width=0, tags=('headers', 'weeknb', 'corner'))
+        self._week_day_items = []
+        for i in range(7):
+            self._week_day_items.append((c.create_rectangle(0, 0, 0, 0, width=0, tags='headers'),
+                                         c.create_text(0, 0, font=self._font, tags='headers_text')))
+        self._week_nb_items = []
+        self._day_items = []
+        for i in range(6):
+            self._week_nb_items.append((c.create_rectangle(0, 0, 0, 0, width=0, tags=('headers', 'weeknb')),
+                                        c.create_text(0, 0, font=self._font, anchor='e',
+                                                      tags=('headers_text', 'weeknb'))))
+            self._day_items.append([(c.create_rectangle(0, 0, 0, 0, width=0, tags='day'),
+                                     c.create_text(0, 0, font=self._font, tags='day_text'))
+                                    for j in range(7)])
+        if not showweeknumbers:
+            c.itemconfigure('weeknb', state='hidden')
+        self._display_week_days()
+
+        c.bind('<Configure>', self._layout)
+        c.bind('<1>', self._on_canvas_click)
+        c.bind('<Motion>', self._on_motion)
+        self.tooltip_wrapper.add_tooltip(c, self._get_hovered_tooltip)
+        c.pack(fill='both', expand=True)
+        self._update_size()
+        self._schedule_redraw()  # the styles may already exist in sharedstyle mode
+
+    def destroy(self):
+        if self._redraw_id is not None:
+            self.after_cancel(self._redraw_id)
+            self._redraw_id = None
+        Calendar.destroy(self)
+
+    # --- geometry
+    def _update_size(self):
+        """Compute the minimum size of the items and set the requested size of the canvas."""
+        digit = self._font.measure('0')
+        linespace = self._font.metrics('linespace')
+        width = max([4 * digit] + [self._font.measure(self._day_names[i]) for i in range(7)])
+        self._min_cell_size = (width + 4, linespace + 4)
+        self._week_nb_width = 2 * digit + 5
+        self._arrow_size = max(self._header_font.actual()['size'], 10)
+        self._header_digit = self._header_font.measure('0')
+        self._header_height = max(self._header_font.metrics('linespace'), self._arrow_size) + 8
+        header_width = 4 * self._arrow_size + 14 * self._header_digit + 36
+        wn = self._week_nb_width + 1 if self._showweeknumbers else 0
+        self._canvas.configure(width=max(header_width, 2 * self._bd + wn + 7 * (self._min_cell_size[0] + 1)),
+                               height=self._header_height + 2 * self._bd + 7 * (self._min_cell_size[1] + 1))
+        self._layout()
+
+    def _layout(self, event=None):
+        """Place the items according to the current size of the canvas."""
+        c = self._canvas
+        if c.winfo_ismapped():
+            width, height = c.winfo_width(), c.winfo_height()
+        else:
+            width, height = int(c.cget('width')), int(c.cget('height'))
+        # --- *-- header
+        hh = self._header_height
+        arrow = self._arrow_size
+        digit = self._header_digit
+        c.coords('header', 0, 0, width, hh)
+        x = 2
+        self._button_boxes['l_month'] = (x, 2, x + arrow, hh - 2)
+        c.coords('month', x + arrow + 4 + 5 * digit, hh / 2)
+        x += arrow + 8 + 10 * digit
+        self._button_boxes['r_month'] = (x, 2, x + arrow, hh - 2)
+        x = width - 2 - arrow
+        self._button_boxes['r_year'] = (x, 2, x + arrow, hh - 2)
+        c.coords('year', x - 4 - 2 * digit, hh / 2)
+        x -= arrow + 8 + 4 * digit
+        self._button_boxes['l_year'] = (x, 2, x + arrow, hh - 2)
+        size = arrow / 4.
+        for button, (x0, y0, x1, y1) in self._button_boxes.items():
+            x, y = (x0 + x1) / 2., (y0 + y1) / 2.
+            if button[0] == 'l':
+                c.coords(button, x + size, y - 2 * size, x - size, y, x + size, y + 2 * size)
+            else:
+                c.coords(button, x - size, y - 2 * size, x + size, y, x - size, y + 2 * size)
+        # --- *-- calendar
+        bd = self._bd
+        x0, y0 = bd, hh + bd
+        c.coords('border', x0, y0, width - bd, height - bd)
+        wn = self._week_nb_width + 1 if self._showweeknumbers else 0
+        h0 = self._min_cell_size[1] + 1  # height of the week day names
+        cw = max((width - 2 * bd - wn) / 7., 1)
+        ch = max((height - hh - 2 * bd - h0) / 6., 1)
+        self._grid_origin = (x0 + wn, y0 + h0)
+        self._cell_size = (cw, ch)
+        c.coords('corner', x0, y0, x0 + wn - 1, y0 + h0 - 1)
+        for i, (rect, text) in enumerate(self._week_day_items):
+            x = x0 + wn + i * cw
+            c.coords(rect, x, y0, x + cw, y0 + h0 - 1)
+            c.coords(text, x + cw / 2, y0 + h0 / 2.)
+        for w in range(6):
+            y = y0 + h0 + w * ch
+            rect, text = self._week_nb_items[w]
+            c.coords(rect, x0, y, x0 + wn - 1, y + ch)
+            c.coords(text, x0 + wn - 3, y + ch / 2)
+            for d, (rect, text) in enumerate(self._day_items[w]):
+                x = x0 + wn + d * cw
+                c.coords(rect, x, y, x + cw - 1, y + ch - 1)
+                c.coords(text, x + cw / 2, y + ch / 2)
+
+    def _day_at(self, x, y):
+        """Return the (w, d) grid coordinates of the day at canvas position (x, y), None if there is no day there."""
+        w = int((y - self._grid_origin[1]) // self._cell_size[1])
+        d = int((x - self._grid_origin[0]) // self._cell_size[0])
+        if 0 <= w < 6 and 0 <= d < 7:
+            return w, d
+        return None
+
+    def _button_at(self, x, y):
+        """Return the name of the button at canvas position (x, y), None if there is no button there."""
+        for button, (x0, y0, x1, y1) in self._button_boxes.items():
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return button
+        return None
+
+    # --- colors
+    def _get_colors(self, style, disabled=False):
+        """Return the (background, foreground) colors of style."""
+        try:
+            return self._colors[style, disabled]
+        except KeyError:
+            state = ['disabled'] if disabled else []
+            colors = (self.style.lookup(style, 'background', state),
+                      self.style.lookup(style, 'foreground', state))
+            self._colors[style, disabled] = colors
+            return colors
+
+    def _schedule_redraw(self):
+        """Redraw all the items with the current style colors when idle."""
+        self._colors.clear()
+        if self._redraw_id is None:
+            self._redraw_id = self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_id = None
+        with self._tk_batch():
+            self._itemconfigure('header', '-fill',
+                                self._get_colors('main.%s.TFrame' % self._style_prefixe, self._disabled)[0])
+            self._itemconfigure('header_text', '-fill',
+                                self._get_colors('main.%s.TLabel' % self._style_prefixe, self._disabled)[1])
+            for button in self._buttons:
+                self._draw_button(button)
+            self._itemconfigure('border', '-fill', self._get_colors('cal.%s.TFrame' % self._style_prefixe)[0])
+            bg, fg = self._get_colors('headers.%s.TLabel' % self._style_prefixe, self._disabled)
+            self._itemconfigure('headers', '-fill', bg)
+            self._itemconfigure('headers_text', '-fill', fg)
+            for w in range(6):
+                for d in range(7):
+                    self._draw_day(w, d)
+
+    def _itemconfigure(self, item, *options):
+        """Configure canvas item, at the end of the current _tk_batch block if any."""
+        self._tk_command(str(self._canvas), 'itemconfigure', item, *options)
+
+    def _draw_button(self, button):
+        disabled = self._disabled or self._buttons_disabled[button]
+        color = self.style.lookup('%s.%s.TButton' % (button[0].upper(), self._style_prefixe), 'arrowcolor',
+                                  ['disabled'] if disabled else [])
+        self._itemconfigure(button, '-fill', color)
+
+    def _draw_day(self, w, d):
+        text, style, disabled = self._shown_days[w][d]
+        bg, fg = self._get_colors(style, disabled)
+        rect, text_item = self._day_items[w][d]
+        self._itemconfigure(rect, '-fill', bg)
+        self._itemconfigure(text_item, '-text', text, '-fill', fg)
+
+    def _setup_style(self, event=None):
+        Calendar._setup_style(self, event)
+        self._schedule_redraw()
+
+    def _update_theme(self, done):
+        Calendar._update_theme(self, done)
+        self._schedule_redraw()
+
+    def _rename_styles(self, old_prefix):
+        Calendar._rename_styles(self, old_prefix)
+        self._schedule_redraw()
+
+    def _style_configure(self, name, **kw):
+        Calendar._style_configure(self, name, **kw)
+        self._schedule_redraw()
+
+    def _style_map(self, name, **kw):
+        Calendar._style_map(self, name, **kw)
+        self._schedule_redraw()
+
+    def _release_tag_style(self, tag):
+        # the style name may be reused with other colors
+        style = self._tag_styles.get(tag)
+        self._colors.pop((style, False), None)
+        self._colors.pop((style, True), None)
+        Calendar._release_tag_style(self, tag)
+
+    def tag_config(self, tag, **kw):
+        Calendar.tag_config(self, tag, **kw)
+        self._schedule_redraw()
+
+    # --- display hooks
+    def _bind_days(self, bind):
+        """Nothing to do, the clicks are dispatched by _on_canvas_click."""
+        pass
+
+    def _show_week_numbers(self, show):
+        self._showweeknumbers = show
+        self._canvas.itemconfigure('weeknb', state='' if show else 'hidden')
+        self._update_size()
+
+    def _set_borderwidth(self, bd):
+        self._bd = bd
+        self._update_size()
+
+    def _set_state(self, disabled):
+        self.state(['disabled' if disabled else '!disabled'])
+        self._disabled = disabled
+        self._canvas.configure(state='disabled' if disabled else 'normal')
+        # the state of the days is updated after this call
+        self._schedule_redraw()
+
+    def _set_button_state(self, button, disabled):
+        self._buttons_disabled[button] = disabled
+        self._draw_button(button)
+
+    def _set_option(self, key, value):
+        Calendar._set_option(self, key, value)
+        if key in ('font', 'locale'):
+            self._update_size()
+
+    def _set_header(self, month=None, year=None):
+        if month is not None:
+            self._itemconfigure('month', '-text', month)
+        if year is not None:
+            self._itemconfigure('year', '-text', year)
+
+    def _set_week_day(self, i, text):
+        self._itemconfigure(self._week_day_items[i][1], '-text', text)
+
+    def _set_week_number(self, i, text):
+        self._itemconfigure(self._week_nb_items[i][1], '-text', text)
+
+    def _set_day(self, w, d, text=None, style=None, disabled=None):
+        """Configure the items of day (w, d), None meaning no change, only redrawing them if needed."""
+        shown = self._shown_days[w][d]
+        new = [shown[0] if text is None else text,
+               shown[1] if style is None else style,
+               shown[2] if disabled is None else disabled]
+        if new != shown:
+            shown[:] = new
+            self._draw_day(w, d)
+
+    def _set_day_tooltip(self, w, d, text):
+        self._day_tooltips[w][d] = text
+
+    def _get_hovered_tooltip(self):
+        """Return the tooltip text of the day under the mouse, None if there is none."""
+        if self._hovered is None:
+            return None
+        w, d = self._hovered
+        text = self._day_tooltips[w][d]
+        if text is None or self._shown_days[w][d][2]:
+            return None
+        return text() if callable(text) else text
+
+    # --- bindings
+    def _on_canvas_click(self, event):
+        """Select the day or activate the button on which the user clicked."""
+        x, y = self._canvas.canvasx(event.x), self._canvas.canvasy(event.y)
+        day = self._day_at(x, y)
+        if day is not None:
+            if self._properties['selectmode'] == 'day':
+                w, d = day
+                self._select_day(*self._shown_days[w][d], first_week=w == 0)
+            return
+        button = self._button_at(x, y)
+        if button is not None and not self._disabled and not self._buttons_disabled[button]:
+            {'l_month': self._prev_month, 'r_month': self._next_month,
+             'l_year': self._prev_year, 'r_year': self._next_year}[button]()
+
+    def _on_motion(self, event):
+        """Restart the tooltip display when the mouse moves to another day."""
+        day = self._day_at(self._canvas.canvasx(event.x), self._canvas.canvasy(event.y))
+        if day != self._hovered:
+            self._hovered = day
+            self.tooltip_wrapper.restart_tooltip(self._canvas)
@@ -32,7 +32,7 @@ except ImportError:
     import Tkinter as tk
     import ttk
 
-from tkcalendar.calendar_ import Calendar
+from tkcalendar.calendar_ import Calendar, _ThemeCoordinator
 
 # temporary fix for issue #61 and https://bugs.python.org/issue38661
 MAPS = {'winnative': {'focusfill': [('readonly', 'focus', 'SystemHighlight')],
@@ -133,7 +133,6 @@ class DateEntry(ttk.Entry):
         self.parse_date = self._calendar.parse_date
 
         # style
-        self._theme_name = ''   # to detect theme changes
         self.style = ttk.Style(self)
         self._setup_style()
         self.configure(style=style)
@@ -159,8 +158,7 @@ class DateEntry(ttk.Entry):
 
         # --- bindings
         # reconfigure style if theme changed
-        self.bind('<<ThemeChanged>>',
-                  lambda e: self.after(10, self._on_theme_change))
+        _ThemeCoordinator.register(self)
         # determine new downarrow button bbox
         self.bind('<Configure>', self._determine_downarrow_name)
         self.bind('<Map>', self._determine_downarrow_name)
@@ -183,8 +181,12 @@ class DateEntry(ttk.Entry):
 
     def _setup_style(self, event=None):
         """Style configuration to make the DateEntry look like a Combobbox."""
+        self._copy_combobox_style()
+        self._schedule_downarrow_name()
+
+    def _copy_combobox_style(self):
+        """Make the DateEntry style look like the combobox one."""
         self.style.layout('DateEntry', self.style.layout('TCombobox'))
-        self.update_idletasks()
         conf = self.style.configure('TCombobox')
         if conf:
             self.style.configure('DateEntry', **conf)
@@ -196,6 +198,9 @@ class DateEntry(ttk.Entry):
                 # temporary fix for issue #61 and https://bugs.python.org/issue38661
                 maps = MAPS.get(self.style.theme_use(), MAPS['default'])
                 self.style.map('DateEntry', **maps)
+
+    def _schedule_downarrow_name(self):
+        """Determine the downarrow button name once the new style is taken into account."""
         try:
             self.after_cancel(self._determine_downarrow_name_after_id)
         except ValueError:
@@ -231,12 +236,13 @@ class DateEntry(ttk.Entry):
                 self.state(['!active'])
                 ttk.Entry.configure(self, cursor=self._cursor)
 
-    def _on_theme_change(self):
-        theme = self.style.theme_use()
-        if self._theme_name != theme:
-            # the theme has changed, update the DateEntry style to look like a combobox
-            self._theme_name = theme
-            self._setup_style()
+    def _update_theme(self, done):
+        """Update the DateEntry style after a theme change, done being the set of the already updated styles."""
+        if 'DateEntry' not in done:
+            # the style is shared by all the DateEntry widgets
+            done.add('DateEntry')
+            self._copy_combobox_style()
+        self._schedule_downarrow_name()
 
     def _on_b1_press(self, event):
         """Trigger self.drop_down on downarrow button press and set widget state to ['pressed', 'active']."""
@@ -320,6 +326,7 @@ class DateEntry(ttk.Entry):
         except ValueError:
             # nothing to cancel
             pass
+        _ThemeCoordinator.unregister(self)
         ttk.Entry.destroy(self)
 
     def drop_down(self):
@@ -0,0 +1,616 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+with contributions from:
+  - Neal Probert (https://github.com/nprobert)
+  - arahorn28 (https://github.com/arahorn28)
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+Storage of the calendar events
+"""
+
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import timedelta
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+class CalEvent(Mapping):
+    """
+    Record of a calendar event.
+
+    The fields are attributes, recurrence and enddate being None for the
+    events without recurrence rule or enddate. The tags are stored as a
+    tuple, shared between the events having the same tags.
+
+    The record is also a read-only mapping {'date': ..., 'text': ...,
+    'tags': [...]}, with 'recurrence' or 'enddate' keys when they are set,
+    like the dictionaries formerly used to store the events.
+    """
+
+    __slots__ = ('date', 'text', 'tags', 'recurrence', 'enddate')
+
+    def __init__(self, date, text, tags, recurrence=None, enddate=None):
+        self.date = date
+        self.text = text
+        self.tags = tags
+        self.recurrence = recurrence
+        self.enddate = enddate
+
+    def __getitem__(self, key):
+        if key == 'tags':
+            return list(self.tags)
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None or key in ('date', 'text'):
+                return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield 'date'
+        yield 'text'
+        yield 'tags'
+        if self.recurrence is not None:
+            yield 'recurrence'
+        if self.enddate is not None:
+            yield 'enddate'
+
+    def __len__(self):
+        return 3 + (self.recurrence is not None) + (self.enddate is not None)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, dict(self))
+
+
+class EventStore(object):
+    """
+    In-memory storage of the calendar events.
+
+    Besides the events themselves, the store keeps a sorted index of the
+    dates that have events so that range queries cost O(log n + k) and an
+    index of the events of each tag so that tag queries cost O(k).
+
+    Recurring events are stored once, with their recurrence rule, and are
+    not part of the date index: their occurrences are computed for the
+    requested date ranges only.
+
+    Likewise, events spanning several days are stored once, as an interval
+    (date, enddate), in a list sorted by start date. Since the longest span
+    is known, the spans overlapping a date range are found by bisection.
+    """
+
+    cache_size = 12  # number of date ranges whose occurrences are cached
+
+    def __init__(self):
+        self.events = {}  # {ev_id: CalEvent, ...}
+        self.dates = {}  # {date: [ev_id, ...], ...}, ids in tooltip order
+        self._sorted_dates = []  # sorted keys of self.dates
+        self._next_id = 0  # id of the next created event
+        self._tag_index = {}  # {tag: set of ev_ids, ...}
+        # {date: tag, ...} last tag of the last single day event of date having tags
+        self._day_tags = {}
+        self._tag_tuples = {}  # {tags: tags, ...} to share the tag tuples between events
+        self._recurring = {}  # {ev_id: (date, recurrence rule), ...}
+        self._spans = []  # sorted list of (date, ev_id) for the events with an enddate
+        self._span_lengths = {}  # {length in days: number of spans, ...}
+        self._max_span = 0  # length in days of the longest span
+        # {(start, end): {date: [ev_id, ...], ...}, ...} cached occurrences of the recurring events
+        self._occurrences = OrderedDict()
+
+    def __len__(self):
+        return len(self.events)
+
+    def __contains__(self, ev_id):
+        return ev_id in self.events
+
+    def _index(self, date, ev_id):
+        """Add ev_id to the events of date."""
+        try:
+            self.dates[date].append(ev_id)
+        except KeyError:
+            self.dates[date] = [ev_id]
+            insort(self._sorted_dates, date)
+        tags = self.events[ev_id].tags
+        if tags:
+            self._day_tags[date] = tags[-1]
+
+    def _update_day_tag(self, date):
+        """Find again the display tag of the single day events of date."""
+        events = self.events
+        for ev_id in reversed(self.dates.get(date, ())):
+            tags = events[ev_id].tags
+            if tags:
+                self._day_tags[date] = tags[-1]
+                return
+        self._day_tags.pop(date, None)
+
+    def _index_tags(self, tags, ev_id):
+        """Add ev_id to the events of each tag."""
+        for tag in tags:
+            try:
+                self._tag_index[tag].add(ev_id)
+            except KeyError:
+                self._tag_index[tag] = {ev_id}
+
+    def _unindex_tags(self, tags, ev_id):
+        """Remove ev_id from the events of each tag."""
+        for tag in tags:
+            ev_ids = self._tag_index.get(tag)
+            if ev_ids is not None:
+                ev_ids.discard(ev_id)
+                if not ev_ids:
+                    del self._tag_index[tag]
+
+    def _intern_tags(self, tags):
+        """Return the shared tuple equal to tags."""
+        tags = tuple(tags)
+        return self._tag_tuples.setdefault(tags, tags)
+
+    def _unindex(self, date, ev_id):
+        """Remove ev_id from the events of date."""
+        ev_ids = self.dates[date]
+        ev_ids.remove(ev_id)
+        if not ev_ids:
+            del self.dates[date]
+            del self._sorted_dates[bisect_left(self._sorted_dates, date)]
+        self._update_day_tag(date)
+
+    def _index_span(self, ev_id, date, enddate):
+        """Add the interval of event ev_id to the span index."""
+        insort(self._spans, (date, ev_id))
+        length = (enddate - date).days
+        self._span_lengths[length] = self._span_lengths.get(length, 0) + 1
+        if length > self._max_span:
+            self._max_span = length
+
+    def _unindex_span(self, ev_id, date, enddate):
+        """Remove the interval of event ev_id from the span index."""
+        del self._spans[bisect_left(self._spans, (date, ev_id))]
+        length = (enddate - date).days
+        self._span_lengths[length] -= 1
+        if not self._span_lengths[length]:
+            del self._span_lengths[length]
+            if length == self._max_span:
+                self._max_span = max(self._span_lengths) if self._span_lengths else 0
+
+    def _index_event(self, ev_id, ev):
+        """Add event ev_id to the index matching its kind."""
+        if ev.recurrence is not None:
+            self._recurring[ev_id] = (ev.date, ev.recurrence)
+            self._occurrences.clear()
+        elif ev.enddate is not None:
+            self._index_span(ev_id, ev.date, ev.enddate)
+        else:
+            self._index(ev.date, ev_id)
+
+    def _unindex_event(self, ev_id, ev):
+        """Remove event ev_id from the index matching its kind."""
+        if ev.recurrence is not None:
+            del self._recurring[ev_id]
+            self._occurrences.clear()
+        elif ev.enddate is not None:
+            self._unindex_span(ev_id, ev.date, ev.enddate)
+        else:
+            self._unindex(ev.date, ev_id)
+
+    def _reset(self):
+        """Restart the ids from 0 and drop the shared tag tuples once the store is empty."""
+        self._next_id = 0
+        self._tag_tuples.clear()
+
+    def _new_id(self):
+        """
+        Return a new event id.
+
+        Ids are allocated in increasing order and are not reused after the
+        removal of an event, unless the store has been emptied.
+        """
+        ev_id = self._next_id
+        self._next_id += 1
+        return ev_id
+
+    def _new_event(self, date, text, tags, recurrence=None, enddate=None):
+        """Return the record of a new event."""
+        return CalEvent(date, text, self._intern_tags(tags), recurrence,
+                        None if recurrence is not None else enddate)
+
+    def add(self, date, text, tags, recurrence=None, enddate=None):
+        """
+        Store new event and return its id.
+
+        An event with an enddate spans all days from date to enddate, both
+        included. Recurring events cannot have an enddate.
+        """
+        ev_id = self._new_id()
+        ev = self._new_event(date, text, tags, recurrence, enddate)
+        self.events[ev_id] = ev
+        self._index_event(ev_id, ev)
+        self._index_tags(ev.tags, ev_id)
+        return ev_id
+
+    def add_many(self, events):
+        """
+        Store several new events and return their ids.
+
+        The events are given as (date, text, tags[, recurrence[, enddate]])
+        tuples.
+
+        The date index is sorted only once, after all events have been added.
+        """
+        evs = self.events
+        dates = self.dates
+        day_tags = self._day_tags
+        new_dates = []
+        ev_ids = []
+        for event in events:
+            ev_id = self._new_id()
+            ev = self._new_event(*event)
+            evs[ev_id] = ev
+            ev_ids.append(ev_id)
+            self._index_tags(ev.tags, ev_id)
+            if ev.recurrence is not None or ev.enddate is not None:
+                self._index_event(ev_id, ev)
+                continue
+            date = ev.date
+            try:
+                dates[date].append(ev_id)
+            except KeyError:
+                dates[date] = [ev_id]
+                new_dates.append(date)
+            if ev.tags:
+                day_tags[date] = ev.tags[-1]
+        if new_dates:
+            self._sorted_dates.extend(new_dates)
+            self._sorted_dates.sort()
+        return ev_ids
+
+    def remove(self, ev_id):
+        """Remove event ev_id and return its date. Raise KeyError if it does not exist."""
+        ev = self.events.pop(ev_id)
+        self._unindex_event(ev_id, ev)
+        self._unindex_tags(ev.tags, ev_id)
+        if not self.events:
+            self._reset()
+        return ev.date
+
+    def remove_many(self, ev_ids):
+        """
+        Remove several events and return the set of their dates.
+
+        Unknown ids are ignored.
+        """
+        removed = {}  # {date: set of removed ids}
+        others = set()  # dates of the removed recurring and spanning events
+        for ev_id in ev_ids:
+            try:
+                ev = self.events.pop(ev_id)
+            except KeyError:
+                continue
+            self._unindex_tags(ev.tags, ev_id)
+            if ev.recurrence is not None or ev.enddate is not None:
+                self._unindex_event(ev_id, ev)
+                others.add(ev.date)
+            else:
+                removed.setdefault(ev.date, set()).add(ev_id)
+        dates = self.dates
+        emptied = False
+        for date, ids in removed.items():
+            remaining = [ev_id for ev_id in dates[date] if ev_id not in ids]
+            if remaining:
+                dates[date][:] = remaining
+            else:
+                del dates[date]
+                emptied = True
+            self._update_day_tag(date)
+        if emptied:
+            self._sorted_dates = [date for date in self._sorted_dates if date in dates]
+        if not self.events:
+            self._reset()
+        others.update(removed)
+        return others
+
+    def move(self, ev_id, date):
+        """
+        Change the date of event ev_id and return the previous one.
+
+        Spanning events are shifted as a whole, keeping their length.
+        """
+        ev = self.events[ev_id]
+        old_date = ev.date
+        self._unindex_event(ev_id, ev)
+        ev.date = date
+        if ev.enddate is not None:
+            ev.enddate += date - old_date
+        self._index_event(ev_id, ev)
+        return old_date
+
+    def set_recurrence(self, ev_id, recurrence):
+        """
+        Replace the recurrence rule of event ev_id, None to make it a single event.
+
+        A spanning event given a recurrence rule loses its enddate.
+        """
+        ev = self.events[ev_id]
+        if recurrence is None and ev.recurrence is None:
+            return
+        self._unindex_event(ev_id, ev)
+        ev.enddate = None
+        ev.recurrence = recurrence
+        self._index_event(ev_id, ev)
+
+    def is_recurring(self, ev_id):
+        """Return whether event ev_id has a recurrence rule."""
+        return ev_id in self._recurring
+
+    def set_enddate(self, ev_id, enddate):
+        """
+        Replace the enddate of event ev_id, None to make it a single day event.
+
+        A recurring event given an enddate loses its recurrence rule.
+        """
+        ev = self.events[ev_id]
+        if enddate is None and ev.enddate is None:
+            return
+        self._unindex_event(ev_id, ev)
+        ev.recurrence = None
+        ev.enddate = enddate
+        self._index_event(ev_id, ev)
+
+    def is_span(self, ev_id):
+        """Return whether event ev_id spans several days."""
+        return self.events[ev_id].enddate is not None
+
+    def set_text(self, ev_id, text):
+        """Replace the text of event ev_id."""
+        self.events[ev_id].text = text
+
+    def set_tags(self, ev_id, tags):
+        """Replace the tags of event ev_id."""
+        ev = self.events[ev_id]
+        self._unindex_tags(ev.tags, ev_id)
+        ev.tags = self._intern_tags(tags)
+        self._index_tags(ev.tags, ev_id)
+        if ev.recurrence is None and ev.enddate is None:
+            self._update_day_tag(ev.date)
+
+    def delete_tag(self, tag):
+        """Remove tag from all events and return the sorted ids of these events."""
+        ev_ids = sorted(self._tag_index.pop(tag, ()))
+        dates = set()
+        for ev_id in ev_ids:
+            ev = self.events[ev_id]
+            ev.tags = self._intern_tags([t for t in ev.tags if t != tag])
+            if ev.recurrence is None and ev.enddate is None:
+                dates.add(ev.date)
+        for date in dates:
+            self._update_day_tag(date)
+        return ev_ids
+
+    def tag_ids(self, tag):
+        """Return the sorted ids of the events with given tag."""
+        return sorted(self._tag_index.get(tag, ()))
+
+    def has_tag(self, ev_id, tag):
+        """Return whether event ev_id has given tag."""
+        return ev_id in self._tag_index.get(tag, ())
+
+    def tag_names(self):
+        """Return the list of the tags of the stored events."""
+        return list(self._tag_index)
+
+    def day_order(self, date):
+        """Return the ids of the single day events of date, in tooltip order."""
+        return list(self.dates.get(date, ()))
+
+    def set_day_order(self, date, ev_ids):
+        """Reorder the single day events of date, ev_ids being all their ids."""
+        self.dates[date][:] = ev_ids
+        self._update_day_tag(date)
+
+    def close(self):
+        """Release the resources of the store."""
+        pass
+
+    def date_range(self, start=None, end=None):
+        """
+        Return the sorted list of the dates with events between start and end.
+
+        Both bounds are included, None means no bound. Only the single day
+        events are taken into account.
+        """
+        i = 0 if start is None else bisect_left(self._sorted_dates, start)
+        j = len(self._sorted_dates) if end is None else bisect_right(self._sorted_dates, end)
+        return self._sorted_dates[i:j]
+
+    def _single_days(self, start, end):
+        """Return {date: [ev_id, ...]} for the single day events between start and end."""
+        dates = self.dates
+        return {date: dates[date] for date in self.date_range(start, end)}
+
+    def _single_ids(self, start, end):
+        """Return the list of (date, ev_id) for the single day events between start and end, sorted by date."""
+        dates = self.dates
+        return [(date, ev_id) for date in self.date_range(start, end) for ev_id in dates[date]]
+
+    def _overlapping(self, start=None, end=None):
+        """
+        Yield (first, last, ev_id) for the spans overlapping the range
+        between start and end (both included, None means no bound),
+        first and last being the bounds of the overlap, in start order.
+        """
+        spans = self._spans
+        if not spans:
+            return
+        if start is None:
+            i = 0
+        else:
+            # a span overlapping the range cannot start more than
+            # self._max_span days before start
+            try:
+                i = bisect_left(spans, (start - timedelta(days=self._max_span),))
+            except OverflowError:
+                i = 0
+        events = self.events
+        for date, ev_id in spans[i:]:
+            if end is not None and date > end:
+                break
+            enddate = events[ev_id].enddate
+            if start is None:
+                yield date, enddate, ev_id
+            elif enddate >= start:
+                yield max(date, start), enddate if end is None else min(enddate, end), ev_id
+
+    def _expand(self, start, end):
+        """Return {date: [ev_id, ...]} for the occurrences of the recurring events between start and end."""
+        key = (start, end)
+        try:
+            return self._occurrences[key]
+        except KeyError:
+            pass
+        occurrences = {}
+        for ev_id, (ev_date, recurrence) in sorted(self._recurring.items(), key=lambda item: item[0]):
+            for date in recurrence.between(ev_date, start, end):
+                try:
+                    occurrences[date].append(ev_id)
+                except KeyError:
+                    occurrences[date] = [ev_id]
+        self._occurrences[key] = occurrences
+        if len(self._occurrences) > self.cache_size:
+            self._occurrences.popitem(last=False)
+        return occurrences
+
+    def _extra_days(self, start, end):
+        """
+        Return {date: [ev_id, ...]} for the spanning and recurring events
+        between start and end, the spanning events first.
+        """
+        extra = {}
+        one_day = timedelta(days=1)
+        for first, last, ev_id in self._overlapping(start, end):
+            date = first
+            while date <= last:
+                try:
+                    extra[date].append(ev_id)
+                except KeyError:
+                    extra[date] = [ev_id]
+                if date == last:
+                    break
+                date += one_day
+        if self._recurring:
+            for date, ev_ids in self._expand(start, end).items():
+                if date in extra:
+                    extra[date].extend(ev_ids)
+                else:
+                    extra[date] = ev_ids  # cached list, not to be modified
+        return extra
+
+    def days(self, start, end):
+        """
+        Return {date: [ev_id, ...]} for the dates between start and end.
+
+        The spanning events come after the single day events of the day,
+        and the occurrences of the recurring events last, sorted by id.
+        """
+        days = self._single_days(start, end)
+        for date, ev_ids in self._extra_days(start, end).items():
+            try:
+                days[date] = days[date] + ev_ids
+            except KeyError:
+                days[date] = ev_ids
+        return days
+
+    def _single_day_tags(self, start, end):
+        """Return {date: tag or None} for the dates of the single day events between start and end."""
+        day_tags = self._day_tags
+        return {date: day_tags.get(date) for date in self.date_range(start, end)}
+
+    def _get_tags(self, ev_ids):
+        """Return {ev_id: tags} for the events ev_ids."""
+        events = self.events
+        return {ev_id: events[ev_id].tags for ev_id in ev_ids}
+
+    def day_tags(self, start, end):
+        """
+        Return {date: tag} for the dates with events between start and end.
+
+        tag is the last tag of the last event of the day (in tooltip order)
+        which has tags, None if no event of the day has tags.
+        """
+        day_tags = self._single_day_tags(start, end)
+        extra = self._extra_days(start, end)
+        if extra:
+            ev_tags = self._get_tags(set(ev_id for ev_ids in extra.values() for ev_id in ev_ids))
+            for date, ev_ids in extra.items():
+                tag = day_tags.get(date)
+                for ev_id in ev_ids:
+                    tags = ev_tags[ev_id]
+                    if tags:
+                        tag = tags[-1]
+                day_tags[date] = tag
+        return day_tags
+
+    def _day_occurrences(self, date):
+        """
+        Return the ids of the recurring events occurring on date, sorted.
+
+        The occurrences are taken from a cached range covering date if
+        there is one, otherwise they are computed without being cached so
+        that single day queries do not evict the ranges of the calendar.
+        """
+        for (start, end), occurrences in reversed(self._occurrences.items()):
+            if start <= date <= end:
+                return occurrences.get(date, [])
+        return [ev_id for ev_id, (ev_date, recurrence) in sorted(self._recurring.items(), key=lambda item: item[0])
+                if recurrence.between(ev_date, date, date)]
+
+    def day(self, date):
+        """Return the list of the ids of the events occurring on date."""
+        ev_ids = self.dates.get(date, [])
+        extra = [ev_id for first, last, ev_id in self._overlapping(date, date)]
+        if self._recurring:
+            extra.extend(self._day_occurrences(date))
+        return ev_ids + extra if extra else ev_ids
+
+    def ids(self, start=None, end=None):
+        """
+        Return the ids of the events between start and end, sorted by date.
+
+        Spanning and recurring events are sorted by their first day in the
+        range.
+        """
+        ev_ids = self._single_ids(start, end)
+        others = [(first, ev_id) for first, last, ev_id in self._overlapping(start, end)]
+        if self._recurring:
+            for ev_id, (ev_date, recurrence) in self._recurring.items():
+                first = recurrence.first(ev_date, start, end)
+                if first is not None:
+                    others.append((first, ev_id))
+        if others:
+            others.sort()
+            ev_ids.extend(others)
+            ev_ids.sort(key=lambda item: item[0])
+        return [ev_id for date, ev_id in ev_ids]
+
+    def day_events(self, start, end):
+        """Return {date: [event, ...]} for the dates between start and end, in tooltip order."""
+        events = self.events
+        return {date: [events[ev_id] for ev_id in ev_ids]
+                for date, ev_ids in self.days(start, end).items()}
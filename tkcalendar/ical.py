@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+with contributions from:
+  - Neal Probert (https://github.com/nprobert)
+  - arahorn28 (https://github.com/arahorn28)
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+Streaming import/export of the calendar events in iCalendar (.ics) format
+"""
+
+
+import io
+import re
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from tkcalendar.recurrence import Recurrence
+
+
+_FREQUENCIES = {'DAILY': 'daily', 'WEEKLY': 'weekly', 'MONTHLY': 'monthly', 'YEARLY': 'yearly'}
+_WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+_DURATION = re.compile(r'^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+
+def _open(source, mode):
+    """Return (file object, whether it should be closed)."""
+    if hasattr(source, 'read' if mode == 'r' else 'write'):
+        return source, False
+    return io.open(source, mode, encoding='utf-8', newline=''), True
+
+
+def _unfold(lines):
+    """Yield the content lines of the file, unfolding the long ones."""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t'):
+            if current is not None:
+                current += line[1:]
+        else:
+            if current:
+                yield current
+            current = line
+    if current:
+        yield current
+
+
+def _split_line(line):
+    """Split content line into (name, {param: value}, value)."""
+    i = line.find(':')
+    if i < 0:
+        return line.upper(), {}, ''
+    if '"' in line[:i]:
+        # the ':' might be in a quoted parameter value
+        quoted = False
+        for i, c in enumerate(line):
+            if c == '"':
+                quoted = not quoted
+            elif c == ':' and not quoted:
+                break
+        else:
+            return line.upper(), {}, ''
+    head = line[:i].split(';')
+    if len(head) == 1:
+        return head[0].upper(), {}, line[i + 1:]
+    params = {}
+    for param in head[1:]:
+        key, _, value = param.partition('=')
+        params[key.upper()] = value.strip('"')
+    return head[0].upper(), params, line[i + 1:]
+
+
+def _split_list(value):
+    """Split value on the unescaped commas."""
+    return re.split(r'(?<!\\),', value)
+
+
+def _unescape(text):
+    return re.sub(r'\\([\\;,nN])', lambda m: '\n' if m.group(1) in 'nN' else m.group(1), text)
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _parse_date(value):
+    """
+    Return (date, time) for a DATE or DATE-TIME value, time being None for
+    a DATE. The time zone is ignored.
+    """
+    value = value.strip()
+    day = date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    if len(value) > 8 and value[8] == 'T':
+        return day, (int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    return day, None
+
+
+def _format_date(day):
+    return '%04i%02i%02i' % (day.year, day.month, day.day)
+
+
+def _parse_duration(value):
+    match = _DURATION.match(value.strip())
+    if match is None:
+        raise ValueError('invalid duration %r' % value)
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                         minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -duration if sign == '-' else duration
+
+
+def _parse_rrule(value, exceptions):
+    """Return the Recurrence matching value, None if the rule is not supported."""
+    parts = dict(part.partition('=')[::2] for part in value.upper().split(';') if part)
+    freq = _FREQUENCIES.get(parts.pop('FREQ', None))
+    if freq is None:
+        return None
+    opts = {'freq': freq, 'exceptions': exceptions}
+    parts.pop('WKST', None)
+    try:
+        if 'INTERVAL' in parts:
+            opts['interval'] = int(parts.pop('INTERVAL'))
+        if 'COUNT' in parts:
+            opts['count'] = int(parts.pop('COUNT'))
+        if 'UNTIL' in parts:
+            opts['until'] = _parse_date(parts.pop('UNTIL'))[0]
+        if 'BYDAY' in parts:
+            opts['byweekday'] = [_WEEKDAYS.index(day) for day in parts.pop('BYDAY').split(',')]
+        if parts:
+            return None  # BYMONTHDAY, BYSETPOS, ... are not supported
+        return Recurrence(**opts)
+    except ValueError:
+        return None
+
+
+def _make_event(props):
+    """Return the (date, text, tags, recurrence, enddate) tuple of a VEVENT, None if invalid."""
+    if 'DTSTART' not in props:
+        return None
+    params, value = props['DTSTART'][0]
+    try:
+        start, start_time = _parse_date(value)
+    except ValueError:
+        return None
+    enddate = None
+    try:
+        if 'DTEND' in props:
+            end, end_time = _parse_date(props['DTEND'][0][1])
+            # the end is exclusive
+            if end_time is None or (end_time == (0, 0, 0) and end > start):
+                end -= timedelta(days=1)
+            enddate = end
+        elif 'DURATION' in props:
+            duration = _parse_duration(props['DURATION'][0][1])
+            if start_time is None:
+                enddate = start + duration - timedelta(days=1)
+            else:
+                enddate = (datetime(start.year, start.month, start.day, *start_time) + duration
+                           - timedelta(microseconds=1)).date()
+    except ValueError:
+        enddate = None
+    if enddate is not None and enddate <= start:
+        enddate = None
+    text = _unescape(props['SUMMARY'][0][1]) if 'SUMMARY' in props else ''
+    tags = []
+    for params, value in props.get('CATEGORIES', ()):
+        tags.extend(_unescape(tag) for tag in _split_list(value) if tag)
+    recurrence = None
+    if 'RRULE' in props:
+        exceptions = []
+        for params, value in props.get('EXDATE', ()):
+            for exdate in value.split(','):
+                try:
+                    exceptions.append(_parse_date(exdate)[0])
+                except ValueError:
+                    pass
+        recurrence = _parse_rrule(props['RRULE'][0][1], exceptions)
+        if recurrence is not None:
+            enddate = None  # recurring events cannot span several days
+    return start, text, tags, recurrence, enddate
+
+
+def read_ics(source):
+    """
+    Read the events of an iCalendar file.
+
+    This is a generator yielding a (date, text, tags, recurrence, enddate)
+    tuple for each VEVENT, so that the whole file is never loaded in
+    memory. The tuples can be given to :meth:`Calendar.calevent_create_many`
+    or :meth:`Calendar.calevent_import`.
+
+    source : str or file object
+        path of the file or text file object
+
+    The SUMMARY of the event gives the text and its CATEGORIES the tags.
+    The time and time zone of the events are ignored. Recurrence rules which
+    cannot be represented by a :class:`Recurrence` (e.g. BYMONTHDAY) are
+    ignored, only the first occurrence of the event is then imported.
+    """
+    fileobj, close = _open(source, 'r')
+    try:
+        props = None  # {name: [(params, value), ...]} of the current VEVENT
+        depth = 0  # nesting level of the components inside the VEVENT (e.g. VALARM)
+        for line in _unfold(fileobj):
+            name, params, value = _split_line(line)
+            if name == 'BEGIN':
+                if props is not None:
+                    depth += 1
+                elif value.upper() == 'VEVENT':
+                    props = {}
+            elif name == 'END':
+                if depth:
+                    depth -= 1
+                elif props is not None:
+                    event = _make_event(props)
+                    props = None
+                    if event is not None:
+                        yield event
+            elif props is not None and not depth:
+                props.setdefault(name, []).append((params, value))
+    finally:
+        if close:
+            fileobj.close()
+
+
+def _fold(line):
+    """Fold line in lines of at most 75 octets."""
+    if len(line.encode('utf-8')) <= 75:
+        return line + '\r\n'
+    chunks = []
+    size = 0
+    start = 0
+    for i, c in enumerate(line):
+        n = len(c.encode('utf-8'))
+        if size + n > (75 if not chunks else 74):
+            chunks.append(line[start:i])
+            start = i
+            size = 0
+        size += n
+    chunks.append(line[start:])
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def _format_rrule(recurrence, start):
+    rule = ['FREQ=' + recurrence.freq.upper()]
+    if recurrence.interval != 1:
+        rule.append('INTERVAL=%i' % recurrence.interval)
+    if recurrence.byweekday is not None:
+        rule.append('BYDAY=' + ','.join(_WEEKDAYS[day] for day in recurrence.byweekday))
+    if recurrence.count is not None and recurrence.until is None:
+        rule.append('COUNT=%i' % recurrence.count)
+    elif recurrence.until is not None:
+        # UNTIL and COUNT cannot be both given, use the actual last occurrence
+        until = recurrence.until if recurrence.count is None else recurrence._last_occurrence(start)
+        rule.append('UNTIL=' + _format_date(until))
+    return ';'.join(rule)
+
+
+def write_ics(destination, events):
+    """
+    Write events in iCalendar format.
+
+    destination : str or file object
+        path of the file or text file object
+
+    events : iterable
+        event records, e.g. ``calendar.calevents.values()``, they are
+        written one at a time.
+
+    Each event becomes an all-day VEVENT, its tags being the CATEGORIES.
+    """
+    fileobj, close = _open(destination, 'w')
+    try:
+        prefix = uuid.uuid4().hex
+        stamp = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        fileobj.write('BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//tkcalendar//tkcalendar//EN\r\n')
+        for i, ev in enumerate(events):
+            start = ev['date']
+            enddate = ev.get('enddate') or start
+            lines = ['BEGIN:VEVENT',
+                     'UID:%s-%i@tkcalendar' % (prefix, i),
+                     'DTSTAMP:' + stamp,
+                     'DTSTART;VALUE=DATE:' + _format_date(start),
+                     'DTEND;VALUE=DATE:' + _format_date(enddate + timedelta(days=1)),
+                     'SUMMARY:' + _escape(str(ev['text']))]
+            if ev['tags']:
+                lines.append('CATEGORIES:' + ','.join(_escape(str(tag)) for tag in ev['tags']))
+            recurrence = ev.get('recurrence')
+            if recurrence is not None:
+                lines.append('RRULE:' + _format_rrule(recurrence, start))
+                if recurrence.exceptions:
+                    lines.append('EXDATE;VALUE=DATE:' + ','.join(_format_date(d)
+                                                                 for d in sorted(recurrence.exceptions)))
+            lines.append('END:VEVENT')
+            fileobj.write(''.join(_fold(line) for line in lines))
+        fileobj.write('END:VCALENDAR\r\n')
+    finally:
+        if close:
+            fileobj.close()
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+Display-independent part of the Calendar widget
+"""
+
+
+import calendar
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from tkcalendar.eventstore import EventStore
+
+
+class _MonthLayout(object):
+    """
+    Precomputed grid of a displayed month: the 42 dates (row by row), the
+    day numbers to display, whether the dates belong to the month, the six
+    week numbers and the {date: (row, column)} map.
+    """
+    __slots__ = ('dates', 'texts', 'in_month', 'week_nbs', 'coords')
+
+    def __init__(self, dates, texts, in_month, week_nbs):
+        self.dates = dates
+        self.texts = texts
+        self.in_month = in_month
+        self.week_nbs = week_nbs
+        self.coords = {date: divmod(i, 7) for i, date in enumerate(dates)}
+
+
+class CalendarModel(object):
+    """
+    Displayed month, selection, allowed date range and events of a calendar.
+
+    The model computes what the calendar displays without using Tkinter:
+    :meth:`~CalendarModel.cells` gives the descriptors of the 42 day cells
+    of the displayed month, which the :class:`Calendar` widget renders.
+    Style names are given without the widget specific suffix:
+    'normal', 'we' (week-end), 'normal_om' and 'we_om' (days of the
+    previous/next month), 'sel' (selected day) and 'tag_<tag>'.
+    """
+    layout_cache_size = 48  # number of month layouts cached, shared by all the models
+    # {(year, month, firstweekday, showothermonthdays): _MonthLayout} LRU cache
+    _layouts = OrderedDict()
+
+    def __init__(self, year, month, selection=None, firstweekday=0, weekenddays=(6, 7),
+                 mindate=None, maxdate=None, showothermonthdays=True, store=None):
+        """
+        Create a model displaying month of year.
+
+        Options:
+
+            selection : None (default) or datetime.date
+                selected date
+
+            firstweekday : int
+                first day of the week, 0 (monday) or 6 (sunday)
+
+            weekenddays : list
+                numbers of the week-end days in the week, starting at 1
+
+            mindate, maxdate : None (default) or datetime.date
+                allowed date range
+
+            showothermonthdays : bool
+                whether to display the days of the previous and next months
+
+            store : EventStore or SQLiteEventStore
+                storage of the events, by default a new in-memory EventStore
+        """
+        self.date = date(year, month, 1)  # first day of the displayed month
+        self.selection = selection
+        self.firstweekday = firstweekday
+        self.weekenddays = weekenddays
+        self.mindate = mindate
+        self.maxdate = maxdate
+        self.showothermonthdays = showothermonthdays
+        self.store = EventStore() if store is None else store
+
+    # --- layout
+    def month_layout(self):
+        """Return the layout of the displayed month, from the cache shared by all the models."""
+        key = (self.date.year, self.date.month, self.firstweekday, self.showothermonthdays)
+        layouts = CalendarModel._layouts
+        try:
+            layout = layouts.pop(key)
+        except KeyError:
+            layout = self._make_month_layout(*key)
+            while len(layouts) >= self.layout_cache_size:
+                layouts.popitem(last=False)
+        layouts[key] = layout
+        return layout
+
+    @staticmethod
+    def _make_month_layout(year, month, firstweekday, othermonthdays):
+        """Compute the layout of month, firstweekday being 0 (monday) or 6 (sunday)."""
+        first = date(year, month, 1)
+        _, week_nb, weekday = first.isocalendar()
+        start = first - timedelta(days=(weekday - 1 - firstweekday) % 7)
+        dates = tuple(start + timedelta(days=i) for i in range(42))
+        in_month = tuple(d.month == month for d in dates)
+        if othermonthdays:
+            texts = tuple(str(d.day) for d in dates)
+            week_nb = dates[1].isocalendar()[1]
+            modulo = max(week_nb, 52)
+            week_nbs = tuple(str((week_nb + i - 1) % modulo + 1) for i in range(6))
+        else:
+            texts = tuple(str(d.day) if m else '' for d, m in zip(dates, in_month))
+            if weekday == 7 and firstweekday == 6:
+                week_nb += 1
+            modulo = max(week_nb, 52)
+            # no week number for the empty weeks at the end of the month
+            week_nbs = tuple(str((week_nb + i - 1) % modulo + 1) if i == 0 or in_month[7 * i] else ''
+                             for i in range(6))
+        return _MonthLayout(dates, texts, in_month, week_nbs)
+
+    def weekdays(self):
+        """Return the numbers (0 is monday) of the week days in display order."""
+        return [(self.firstweekday + i) % 7 for i in range(7)]
+
+    def grid_range(self):
+        """Return the first and last dates of the six displayed weeks."""
+        dates = self.month_layout().dates
+        return dates[0], dates[41]
+
+    def day_coords(self, date):
+        """Return the (row, column) of date in the grid, (None, None) if it is not displayed."""
+        return self.month_layout().coords.get(date, (None, None))
+
+    def day_style(self, date):
+        """Return the style of date without events nor selection, date being displayed."""
+        column = self.day_coords(date)[1]
+        weekend = (column + 1) in self.weekenddays
+        if date.month != self.date.month and self.showothermonthdays:
+            return 'we_om' if weekend else 'normal_om'
+        return 'we' if weekend else 'normal'
+
+    def cells(self, provided=None):
+        """
+        Return the cells of the displayed month and its week numbers.
+
+        The cells are 42 (text, style, disabled, date) tuples, row by row,
+        date being the key of the tooltip of the day: its date if it has
+        events, None otherwise.
+
+        provided is an optional EventStore whose events are displayed
+        before the ones of the model store.
+        """
+        layout = self.month_layout()
+        weekend = [i - 1 for i in self.weekenddays]
+        styles = ['we' if i in weekend else 'normal' for i in range(7)]
+        if self.showothermonthdays:
+            om_styles = ['we_om' if i in weekend else 'normal_om' for i in range(7)]
+        else:
+            om_styles = styles
+        # grid indexes of the first and last allowed days
+        first, last = 0, 41
+        if self.maxdate is not None:
+            mi, mj = self.day_coords(self.maxdate)
+            if mi is not None:
+                last = 7 * mi + mj
+        if self.mindate is not None:
+            mi, mj = self.day_coords(self.mindate)
+            if mi is not None:
+                first = 7 * mi + mj
+        start, end = layout.dates[0], layout.dates[41]
+        if not self.showothermonthdays:
+            # only retrieve the events of the displayed month
+            start = self.date
+            end = self.date.replace(day=calendar.monthrange(self.date.year, self.date.month)[1])
+        day_tags = self.visible_tags(start, end, provided)
+        cells = []
+        for n, (day, text, in_month) in enumerate(zip(layout.dates, layout.texts, layout.in_month)):
+            style = styles[n % 7] if in_month else om_styles[n % 7]
+            key = None
+            if day in day_tags:
+                tag = day_tags[day]
+                if tag is not None:
+                    style = 'tag_%s' % tag
+                key = day
+            if day == self.selection and text:
+                style = 'sel'
+            cells.append((text, style, not first <= n <= last, key))
+        return cells, layout.week_nbs
+
+    # --- events
+    def visible_events(self, start, end, provided=None):
+        """
+        Return {date: [event, ...]} for the dates between start and end,
+        the events of the provided EventStore coming first.
+        """
+        day_events = self.store.day_events(start, end)
+        if provided is not None:
+            for day, evs in provided.day_events(start, end).items():
+                try:
+                    day_events[day] = evs + day_events[day]
+                except KeyError:
+                    day_events[day] = evs
+        return day_events
+
+    def day_events(self, date, provided=None):
+        """Return the list of the events displayed on date."""
+        return self.visible_events(date, date, provided).get(date, [])
+
+    def visible_tags(self, start, end, provided=None):
+        """
+        Return {date: tag} for the dates with events between start and end,
+        tag giving the colors of the day: the last tag of the last event
+        which has tags, None if no event has tags.
+        """
+        day_tags = self.store.day_tags(start, end)
+        if provided is not None:
+            # the provided events come first
+            for day, tag in provided.day_tags(start, end).items():
+                if day_tags.get(day) is None:
+                    day_tags[day] = tag
+        return day_tags
+
+    # --- date range
+    def check_date_range(self, date):
+        """Return date if it is in the allowed date range, the closest bound otherwise."""
+        if self.maxdate is not None and date > self.maxdate:
+            return self.maxdate
+        elif self.mindate is not None and date < self.mindate:
+            return self.mindate
+        else:
+            return date
+
+    def check_selection(self):
+        """Move the selection in the allowed date range, return whether it has changed."""
+        if self.selection is None:
+            return False
+        selection = self.check_date_range(self.selection)
+        changed = selection != self.selection
+        self.selection = selection
+        return changed
+
+    def check_month(self):
+        """Move the displayed month in the allowed date range, return whether it has changed."""
+        month = self.date
+        if self.maxdate is not None and month > self.maxdate:
+            month = self.maxdate.replace(day=1)
+        if self.mindate is not None and month < self.mindate:
+            month = self.mindate.replace(day=1)
+        changed = month != self.date
+        self.date = month
+        return changed
+
+    def navigation_state(self):
+        """
+        Return {button: disabled} for the navigation buttons ('l_month',
+        'r_month', 'l_year' and 'r_year') limited by the date range.
+
+        The buttons of a side without bound are not included.
+        """
+        state = {}
+        month = (self.date.year, self.date.month)
+        if self.maxdate is not None:
+            max_month = (self.maxdate.year, self.maxdate.month)
+            state['r_month'] = month >= max_month
+            state['r_year'] = (month[0] + 1, month[1]) > max_month
+        if self.mindate is not None:
+            min_month = (self.mindate.year, self.mindate.month)
+            state['l_month'] = month <= min_month
+            state['l_year'] = (month[0] - 1, month[1]) < min_month
+        return state
+
+    # --- navigation
+    def see(self, date):
+        """Display the month of date."""
+        self.date = date.replace(day=1)
+
+    def next_month(self):
+        """Display the next month."""
+        self.date += timedelta(days=calendar.monthrange(self.date.year, self.date.month)[1])
+
+    def prev_month(self):
+        """Display the previous month."""
+        self.date = (self.date - timedelta(days=1)).replace(day=1)
+
+    def next_year(self):
+        """Display the next year."""
+        self.date = self.date.replace(year=self.date.year + 1)
+
+    def prev_year(self):
+        """Display the previous year."""
+        self.date = self.date.replace(year=self.date.year - 1)
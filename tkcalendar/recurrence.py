@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+with contributions from:
+  - Neal Probert (https://github.com/nprobert)
+  - arahorn28 (https://github.com/arahorn28)
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+Recurrence rules of the calendar events
+"""
+
+
+import calendar
+
+date = calendar.datetime.date
+datetime = calendar.datetime.datetime
+timedelta = calendar.datetime.timedelta
+
+
+class Recurrence(object):
+    """
+    Recurrence rule of a calendar event.
+
+    The occurrences are never stored, they are computed on demand for a given
+    date range.
+    """
+
+    __slots__ = ('freq', 'interval', 'byweekday', 'until', 'count', 'exceptions', '_last')
+
+    FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly')
+
+    def __init__(self, freq='weekly', interval=1, byweekday=None, until=None,
+                 count=None, exceptions=()):
+        """
+        Create a recurrence rule.
+
+        Options
+        -------
+
+        freq : "daily", "weekly" (default), "monthly" or "yearly"
+            frequency of the recurrence, the event is repeated every day,
+            week, month or year, starting from its date. Monthly occurrences
+            are skipped for months which do not have the event's day of
+            month (e.g. the 31st) and yearly ones for years without the
+            event's day (February 29th).
+
+        interval : int
+            the event is repeated every interval days, weeks, months or years.
+
+        byweekday : list
+            for daily and weekly recurrences, days of the week on which the
+            event occurs, given as a list of integers between 0 (Monday) and
+            6 (Sunday). By default, weekly events occur on the weekday of
+            their date.
+
+        until : None (default), datetime.date or datetime.datetime
+            last possible date of the occurrences
+
+        count : None (default) or int
+            maximum number of occurrences (exceptions included)
+
+        exceptions : list
+            dates (datetime.date) on which the event does not occur
+        """
+        if freq not in self.FREQUENCIES:
+            raise ValueError("'freq' option should be 'daily', 'weekly', 'monthly' or 'yearly'.")
+        try:
+            interval = int(interval)
+        except (TypeError, ValueError):
+            raise ValueError("expected integer for the 'interval' option.")
+        if interval < 1:
+            raise ValueError("'interval' option should be positive.")
+        if byweekday is not None:
+            if freq not in ('daily', 'weekly'):
+                raise ValueError("'byweekday' option is only supported by daily and weekly recurrences.")
+            try:
+                byweekday = tuple(sorted(set(byweekday)))
+            except TypeError:
+                raise TypeError("'byweekday' option should be a list of integers between 0 and 6.")
+            if not byweekday or any(d not in range(7) for d in byweekday):
+                raise ValueError("'byweekday' option should be a list of integers between 0 and 6.")
+        if until is not None:
+            if isinstance(until, datetime):
+                until = until.date()
+            elif not isinstance(until, date):
+                raise TypeError("expected %s for the 'until' option." % date)
+        if count is not None:
+            try:
+                count = int(count)
+            except (TypeError, ValueError):
+                raise ValueError("expected integer for the 'count' option.")
+            if count < 1:
+                raise ValueError("'count' option should be positive.")
+        try:
+            exceptions = frozenset(d.date() if isinstance(d, datetime) else d for d in exceptions)
+        except TypeError:
+            raise TypeError("'exceptions' option should be a list of dates.")
+        self.freq = freq
+        self.interval = interval
+        self.byweekday = byweekday
+        self.until = until
+        self.count = count
+        self.exceptions = exceptions
+        self._last = None  # (start, last occurrence) cache for count
+
+    def __repr__(self):
+        opts = ['%r' % self.freq]
+        for opt in ('interval', 'byweekday', 'until', 'count'):
+            value = getattr(self, opt)
+            if value is not None and not (opt == 'interval' and value == 1):
+                opts.append('%s=%r' % (opt, value))
+        if self.exceptions:
+            opts.append('exceptions=%r' % sorted(self.exceptions))
+        return 'Recurrence(%s)' % ', '.join(opts)
+
+    def __eq__(self, other):
+        if not isinstance(other, Recurrence):
+            return NotImplemented
+        return all(getattr(self, opt) == getattr(other, opt)
+                   for opt in ('freq', 'interval', 'byweekday', 'until', 'count', 'exceptions'))
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    __hash__ = None
+
+    def _iter(self, start, first, last):
+        """
+        Yield the occurrences of the recurrence starting on start between
+        first and last (both included), ignoring until, count and exceptions.
+
+        first should not be before start.
+        """
+        interval = self.interval
+        if self.freq == 'daily':
+            k = -(-(first - start).days // interval)  # ceil
+            d = start + timedelta(days=k * interval)
+            step = timedelta(days=interval)
+            weekdays = self.byweekday
+            while d <= last:
+                if weekdays is None or d.weekday() in weekdays:
+                    yield d
+                d += step
+        elif self.freq == 'weekly':
+            weekdays = self.byweekday or (start.weekday(),)
+            week0 = start - timedelta(days=start.weekday())  # monday of start's week
+            k = (first - week0).days // 7
+            k += -k % interval
+            week = week0 + timedelta(days=7 * k)
+            step = timedelta(days=7 * interval)
+            while week <= last:
+                for wd in weekdays:
+                    d = week + timedelta(days=wd)
+                    if d > last:
+                        break
+                    if d >= first:
+                        yield d
+                week += step
+        else:
+            # months are numbered from year 0 to step over years easily
+            step = interval if self.freq == 'monthly' else 12 * interval
+            m0 = start.year * 12 + start.month - 1
+            m = first.year * 12 + first.month - 1
+            m += -(m - m0) % step
+            m_last = last.year * 12 + last.month - 1
+            day = start.day
+            while m <= m_last:
+                year, month = divmod(m, 12)
+                month += 1
+                if day <= calendar.monthrange(year, month)[1]:
+                    d = date(year, month, day)
+                    if first <= d <= last:
+                        yield d
+                m += step
+
+    def _last_occurrence(self, start):
+        """Return the last possible occurrence date, None if there is no limit."""
+        if self.count is None:
+            return self.until
+        if self._last is None or self._last[0] != start:
+            until = self.until or date.max
+            last = None
+            i = 0
+            first = start
+            # look for the count-th occurrence in chunks of about interval years
+            while last is None:
+                try:
+                    end = min(until, first + timedelta(days=366 * self.interval))
+                except OverflowError:
+                    end = until
+                try:
+                    for d in self._iter(start, first, end):
+                        i += 1
+                        if i == self.count:
+                            last = d
+                            break
+                except OverflowError:
+                    break
+                if end == until:
+                    break
+                first = end + timedelta(days=1)
+            self._last = (start, last or until)
+        return self._last[1]
+
+    def between(self, start, first, last):
+        """
+        Return the list of the occurrences between first and last (both
+        included) of an event starting on start.
+        """
+        first = max(first, start)
+        end = self._last_occurrence(start)
+        if end is not None:
+            last = min(last, end)
+        if first > last:
+            return []
+        exceptions = self.exceptions
+        occurrences = []
+        try:
+            for d in self._iter(start, first, last):
+                if d not in exceptions:
+                    occurrences.append(d)
+        except OverflowError:
+            pass
+        return occurrences
+
+    def first(self, start, first=None, last=None):
+        """
+        Return the first occurrence between first and last (both included,
+        None means no bound) of an event starting on start.
+
+        Return None if there is no such occurrence.
+        """
+        first = start if first is None else max(first, start)
+        end = self._last_occurrence(start)
+        if last is None:
+            last = date.max if end is None else end
+        elif end is not None:
+            last = min(last, end)
+        if first > last:
+            return None
+        exceptions = self.exceptions
+        try:
+            for d in self._iter(start, first, last):
+                if d not in exceptions:
+                    return d
+        except OverflowError:
+            pass
+        return None
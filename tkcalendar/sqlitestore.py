@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2019 Juliette Monsel <j_4321@protonmail.com>
+with contributions from:
+  - Neal Probert (https://github.com/nprobert)
+  - arahorn28 (https://github.com/arahorn28)
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+Persistent storage of the calendar events in a SQLite database
+"""
+
+
+import json
+import sqlite3
+from collections import OrderedDict
+from datetime import date, timedelta
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from tkcalendar.eventstore import CalEvent, EventStore
+from tkcalendar.recurrence import Recurrence
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    enddate TEXT,
+    span INTEGER NOT NULL DEFAULT 0,
+    text,
+    recurrence TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_date ON events (date, position);
+CREATE INDEX IF NOT EXISTS events_span ON events (span);
+CREATE TABLE IF NOT EXISTS tags (
+    event INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_event ON tags (event, position);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag, event);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+_SINGLE = "enddate IS NULL AND recurrence IS NULL"  # condition for the single day events
+
+_POSITION = "(SELECT COALESCE(MAX(position), -1) + 1 FROM events WHERE date = ?)"  # last position on a date
+
+_CHUNK = 500  # maximum number of ids in an "IN (...)" clause
+
+
+def _to_date(text):
+    """Convert an ISO formatted date to datetime.date."""
+    year, month, day = text.split('-')
+    return date(int(year), int(month), int(day))
+
+
+def _dump_recurrence(recurrence):
+    """Convert a recurrence rule to JSON."""
+    return json.dumps({'freq': recurrence.freq,
+                       'interval': recurrence.interval,
+                       'byweekday': None if recurrence.byweekday is None else list(recurrence.byweekday),
+                       'until': None if recurrence.until is None else recurrence.until.isoformat(),
+                       'count': recurrence.count,
+                       'exceptions': sorted(d.isoformat() for d in recurrence.exceptions)})
+
+
+def _load_recurrence(text):
+    """Create a recurrence rule from its JSON representation."""
+    opts = json.loads(text)
+    if opts['until'] is not None:
+        opts['until'] = _to_date(opts['until'])
+    opts['exceptions'] = [_to_date(d) for d in opts['exceptions']]
+    return Recurrence(**opts)
+
+
+class _EventView(Mapping):
+    """Read-only {ev_id: event} mapping of the events of a SQLiteEventStore."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, ev_id):
+        return self._store._get_events([ev_id])[ev_id]
+
+    def __iter__(self):
+        return iter([row[0] for row in self._store._conn.execute("SELECT id FROM events ORDER BY id")])
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, ev_id):
+        return ev_id in self._store
+
+
+class _DateView(Mapping):
+    """Read-only {date: [ev_id, ...]} mapping of the single day events of a SQLiteEventStore."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, date):
+        ev_ids = self._store.day_order(date)
+        if not ev_ids:
+            raise KeyError(date)
+        return ev_ids
+
+    def __iter__(self):
+        return iter(self._store.date_range())
+
+    def __len__(self):
+        return len(self._store.date_range())
+
+
+class SQLiteEventStore(EventStore):
+    """
+    Storage of the calendar events in a SQLite database.
+
+    The store has the same interface as :class:`EventStore` but the events
+    are written to the database as soon as they are created or modified,
+    so that they are available again when the store is reopened. The
+    database has indexes on the dates and tags of the events and only the
+    events of the requested dates are read from it.
+
+    The recurrence rules are also kept in memory to compute the
+    occurrences of the recurring events.
+    """
+
+    def __init__(self, filename=':memory:'):
+        """
+        Open the store.
+
+        filename : str
+            path of the database file, created if it does not exist.
+            By default, the database is kept in memory.
+        """
+        self._conn = sqlite3.connect(filename)
+        self._conn.executescript(_SCHEMA)
+        self.events = _EventView(self)  # read-only, use the methods of the store to modify the events
+        self.dates = _DateView(self)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        self._next_id = 0 if row is None else row[0]
+        self._recurring = {}  # {ev_id: (date, recurrence rule), ...}
+        for ev_id, ev_date, recurrence in self._conn.execute("SELECT id, date, recurrence FROM events "
+                                                             "WHERE recurrence IS NOT NULL"):
+            self._recurring[ev_id] = (_to_date(ev_date), _load_recurrence(recurrence))
+        self._occurrences = OrderedDict()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def __contains__(self, ev_id):
+        try:
+            return self._conn.execute("SELECT 1 FROM events WHERE id = ?", (ev_id,)).fetchone() is not None
+        except sqlite3.InterfaceError:
+            return False  # unsupported type, e.g. 'all'
+
+    def _get_row(self, ev_id, columns):
+        """Return the given columns of event ev_id. Raise KeyError if it does not exist."""
+        try:
+            row = self._conn.execute("SELECT %s FROM events WHERE id = ?" % columns, (ev_id,)).fetchone()
+        except sqlite3.InterfaceError:
+            row = None
+        if row is None:
+            raise KeyError(ev_id)
+        return row
+
+    def _get_events(self, ev_ids):
+        """Return {ev_id: event} for the existing events among ev_ids."""
+        events = {}
+        tags = {}
+        ev_ids = list(ev_ids)
+        for i in range(0, len(ev_ids), _CHUNK):
+            chunk = ev_ids[i:i + _CHUNK]
+            marks = ', '.join('?' * len(chunk))
+            rows = self._conn.execute("SELECT id, date, enddate, text, recurrence FROM events "
+                                      "WHERE id IN (%s)" % marks, chunk)
+            for ev_id, ev_date, enddate, text, recurrence in rows:
+                events[ev_id] = CalEvent(_to_date(ev_date), text, (),
+                                         None if recurrence is None else self._recurring[ev_id][1],
+                                         None if enddate is None else _to_date(enddate))
+            rows = self._conn.execute("SELECT event, tag FROM tags WHERE event IN (%s) "
+                                      "ORDER BY event, position" % marks, chunk)
+            for ev_id, tag in rows:
+                tags.setdefault(ev_id, []).append(tag)
+        for ev_id, ev_tags in tags.items():
+            events[ev_id].tags = tuple(ev_tags)
+        return events
+
+    @staticmethod
+    def _intern_tags(tags):
+        # the records only live until the next query, no need to share the tags
+        return tuple(tags)
+
+    def _save_next_id(self):
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('next_id', ?)", (self._next_id,))
+
+    def _reset_ids(self):
+        """Restart the ids from 0 if the store is empty."""
+        if self._conn.execute("SELECT 1 FROM events LIMIT 1").fetchone() is None:
+            self._next_id = 0
+            self._save_next_id()
+
+    def _insert(self, ev_id, ev):
+        """Insert the record ev of a new event in the database."""
+        ev_date = ev.date.isoformat()
+        enddate = ev.enddate
+        recurrence = ev.recurrence
+        self._conn.execute("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, %s)" % _POSITION,
+                           (ev_id, ev_date,
+                            None if enddate is None else enddate.isoformat(),
+                            0 if enddate is None else (enddate - ev.date).days,
+                            ev.text,
+                            None if recurrence is None else _dump_recurrence(recurrence),
+                            ev_date))
+        self._conn.executemany("INSERT INTO tags VALUES (?, ?, ?)",
+                               [(ev_id, i, tag) for i, tag in enumerate(ev.tags)])
+        if recurrence is not None:
+            self._recurring[ev_id] = (ev.date, recurrence)
+            self._occurrences.clear()
+
+    def add(self, date, text, tags, recurrence=None, enddate=None):
+        """
+        Store new event and return its id.
+
+        An event with an enddate spans all days from date to enddate, both
+        included. Recurring events cannot have an enddate.
+        """
+        with self._conn:
+            ev_id = self._new_id()
+            self._insert(ev_id, self._new_event(date, text, tags, recurrence, enddate))
+            self._save_next_id()
+        return ev_id
+
+    def add_many(self, events):
+        """
+        Store several new events and return their ids.
+
+        The events are given as (date, text, tags[, recurrence[, enddate]])
+        tuples. They are written in a single transaction.
+        """
+        ev_ids = []
+        with self._conn:
+            for event in events:
+                ev_id = self._new_id()
+                self._insert(ev_id, self._new_event(*event))
+                ev_ids.append(ev_id)
+            self._save_next_id()
+        return ev_ids
+
+    def remove(self, ev_id):
+        """Remove event ev_id and return its date. Raise KeyError if it does not exist."""
+        ev_date = self._get_row(ev_id, 'date')[0]
+        with self._conn:
+            self._conn.execute("DELETE FROM events WHERE id = ?", (ev_id,))
+            self._conn.execute("DELETE FROM tags WHERE event = ?", (ev_id,))
+            self._reset_ids()
+        if self._recurring.pop(ev_id, None) is not None:
+            self._occurrences.clear()
+        return _to_date(ev_date)
+
+    def remove_many(self, ev_ids):
+        """
+        Remove several events and return the set of their dates.
+
+        Unknown ids are ignored.
+        """
+        ev_ids = [ev_id for ev_id in ev_ids if isinstance(ev_id, int)]
+        dates = set()
+        with self._conn:
+            for i in range(0, len(ev_ids), _CHUNK):
+                chunk = ev_ids[i:i + _CHUNK]
+                marks = ', '.join('?' * len(chunk))
+                for ev_id, ev_date in self._conn.execute("SELECT id, date FROM events "
+                                                         "WHERE id IN (%s)" % marks, chunk).fetchall():
+                    dates.add(_to_date(ev_date))
+                    if self._recurring.pop(ev_id, None) is not None:
+                        self._occurrences.clear()
+                self._conn.execute("DELETE FROM events WHERE id IN (%s)" % marks, chunk)
+                self._conn.execute("DELETE FROM tags WHERE event IN (%s)" % marks, chunk)
+            if dates:
+                self._reset_ids()
+        return dates
+
+    def move(self, ev_id, date):
+        """
+        Change the date of event ev_id and return the previous one.
+
+        Spanning events are shifted as a whole, keeping their length.
+        """
+        old_date, enddate = self._get_row(ev_id, 'date, enddate')
+        old_date = _to_date(old_date)
+        if enddate is not None:
+            enddate = (_to_date(enddate) + (date - old_date)).isoformat()
+        with self._conn:
+            self._conn.execute("UPDATE events SET date = ?, enddate = ?, position = %s WHERE id = ?" % _POSITION,
+                               (date.isoformat(), enddate, date.isoformat(), ev_id))
+        if ev_id in self._recurring:
+            self._recurring[ev_id] = (date, self._recurring[ev_id][1])
+            self._occurrences.clear()
+        return old_date
+
+    def set_recurrence(self, ev_id, recurrence):
+        """
+        Replace the recurrence rule of event ev_id, None to make it a single event.
+
+        A spanning event given a recurrence rule loses its enddate.
+        """
+        ev_date = self._get_row(ev_id, 'date')[0]
+        if recurrence is None and ev_id not in self._recurring:
+            return
+        with self._conn:
+            self._conn.execute("UPDATE events SET recurrence = ?, enddate = NULL, span = 0, "
+                               "position = %s WHERE id = ?" % _POSITION,
+                               (None if recurrence is None else _dump_recurrence(recurrence), ev_date, ev_id))
+        if recurrence is None:
+            del self._recurring[ev_id]
+        else:
+            self._recurring[ev_id] = (_to_date(ev_date), recurrence)
+        self._occurrences.clear()
+
+    def set_enddate(self, ev_id, enddate):
+        """
+        Replace the enddate of event ev_id, None to make it a single day event.
+
+        A recurring event given an enddate loses its recurrence rule.
+        """
+        ev_date, old_enddate = self._get_row(ev_id, 'date, enddate')
+        if enddate is None and old_enddate is None:
+            return
+        with self._conn:
+            self._conn.execute("UPDATE events SET enddate = ?, span = ?, recurrence = NULL, "
+                               "position = %s WHERE id = ?" % _POSITION,
+                               (None if enddate is None else enddate.isoformat(),
+                                0 if enddate is None else (enddate - _to_date(ev_date)).days,
+                                ev_date, ev_id))
+        if self._recurring.pop(ev_id, None) is not None:
+            self._occurrences.clear()
+
+    def is_span(self, ev_id):
+        """Return whether event ev_id spans several days."""
+        return self._get_row(ev_id, 'enddate')[0] is not None
+
+    def set_text(self, ev_id, text):
+        """Replace the text of event ev_id."""
+        self._get_row(ev_id, 'id')
+        with self._conn:
+            self._conn.execute("UPDATE events SET text = ? WHERE id = ?", (text, ev_id))
+
+    def set_tags(self, ev_id, tags):
+        """Replace the tags of event ev_id."""
+        self._get_row(ev_id, 'id')
+        with self._conn:
+            self._conn.execute("DELETE FROM tags WHERE event = ?", (ev_id,))
+            self._conn.executemany("INSERT INTO tags VALUES (?, ?, ?)",
+                                   [(ev_id, i, tag) for i, tag in enumerate(tags)])
+
+    def delete_tag(self, tag):
+        """Remove tag from all events and return the sorted ids of these events."""
+        ev_ids = self.tag_ids(tag)
+        with self._conn:
+            self._conn.execute("DELETE FROM tags WHERE tag = ?", (tag,))
+        return ev_ids
+
+    def tag_ids(self, tag):
+        """Return the sorted ids of the events with given tag."""
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT event FROM tags WHERE tag = ? "
+                                                     "ORDER BY event", (tag,))]
+
+    def has_tag(self, ev_id, tag):
+        """Return whether event ev_id has given tag."""
+        return self._conn.execute("SELECT 1 FROM tags WHERE tag = ? AND event = ?",
+                                  (tag, ev_id)).fetchone() is not None
+
+    def tag_names(self):
+        """Return the list of the tags of the stored events."""
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT tag FROM tags")]
+
+    def day_order(self, date):
+        """Return the ids of the single day events of date, in tooltip order."""
+        return [row[0] for row in self._conn.execute("SELECT id FROM events WHERE date = ? AND %s "
+                                                     "ORDER BY position, id" % _SINGLE,
+                                                     (date.isoformat(),))]
+
+    def set_day_order(self, date, ev_ids):
+        """Reorder the single day events of date, ev_ids being all their ids."""
+        with self._conn:
+            self._conn.executemany("UPDATE events SET position = ? WHERE id = ?",
+                                   [(i, ev_id) for i, ev_id in enumerate(ev_ids)])
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+    def _range_query(self, query, start, end, params=()):
+        """Complete query with the conditions on the date bounds."""
+        params = list(params)
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start.isoformat())
+        if end is not None:
+            query += " AND date <= ?"
+            params.append(end.isoformat())
+        return query, params
+
+    def date_range(self, start=None, end=None):
+        """
+        Return the sorted list of the dates with events between start and end.
+
+        Both bounds are included, None means no bound. Only the single day
+        events are taken into account.
+        """
+        query, params = self._range_query("SELECT DISTINCT date FROM events WHERE %s" % _SINGLE, start, end)
+        return [_to_date(row[0]) for row in self._conn.execute(query + " ORDER BY date", params)]
+
+    def _single_ids(self, start, end):
+        """Return the list of (date, ev_id) for the single day events between start and end, sorted by date."""
+        query, params = self._range_query("SELECT date, id FROM events WHERE %s" % _SINGLE, start, end)
+        dates = {}  # convert each date only once
+        ev_ids = []
+        for ev_date, ev_id in self._conn.execute(query + " ORDER BY date, position, id", params):
+            try:
+                ev_ids.append((dates[ev_date], ev_id))
+            except KeyError:
+                dates[ev_date] = _to_date(ev_date)
+                ev_ids.append((dates[ev_date], ev_id))
+        return ev_ids
+
+    def _single_days(self, start, end):
+        """Return {date: [ev_id, ...]} for the single day events between start and end."""
+        days = {}
+        for ev_date, ev_id in self._single_ids(start, end):
+            try:
+                days[ev_date].append(ev_id)
+            except KeyError:
+                days[ev_date] = [ev_id]
+        return days
+
+    def _single_day_tags(self, start, end):
+        """Return {date: tag or None} for the dates of the single day events between start and end."""
+        day_tags = {ev_date.isoformat(): None for ev_date in self.date_range(start, end)}
+        query, params = self._range_query("SELECT date, tag FROM events JOIN tags ON tags.event = events.id "
+                                          "WHERE %s" % _SINGLE, start, end)
+        # the last tag of the last event with tags of each date comes last
+        for ev_date, tag in self._conn.execute(query + " ORDER BY date, events.position, id, "
+                                                       "tags.position", params):
+            day_tags[ev_date] = tag
+        return {_to_date(ev_date): tag for ev_date, tag in day_tags.items()}
+
+    def _get_tags(self, ev_ids):
+        """Return {ev_id: tags} for the events ev_ids."""
+        return {ev_id: ev.tags for ev_id, ev in self._get_events(ev_ids).items()}
+
+    def _overlapping(self, start=None, end=None):
+        """
+        Yield (first, last, ev_id) for the spans overlapping the range
+        between start and end (both included, None means no bound),
+        first and last being the bounds of the overlap, in start order.
+        """
+        lower = None
+        params = []
+        query = "SELECT date, enddate, id FROM events WHERE enddate IS NOT NULL"
+        if start is not None:
+            # a span overlapping the range cannot start more than
+            # the longest span before start
+            max_span = self._conn.execute("SELECT MAX(span) FROM events").fetchone()[0] or 0
+            try:
+                lower = start - timedelta(days=max_span)
+            except OverflowError:
+                lower = date.min
+            query += " AND enddate >= ?"
+            params.append(start.isoformat())
+        query, params = self._range_query(query, lower, end, params)
+        for ev_date, enddate, ev_id in self._conn.execute(query + " ORDER BY date, id", params).fetchall():
+            first, last = _to_date(ev_date), _to_date(enddate)
+            if start is not None:
+                first = max(first, start)
+                if end is not None:
+                    last = min(last, end)
+            yield first, last, ev_id
+
+    def day_events(self, start, end):
+        """Return {date: [event, ...]} for the dates between start and end, in tooltip order."""
+        days = self.days(start, end)
+        events = self._get_events(set(ev_id for ev_ids in days.values() for ev_id in ev_ids))
+        return {date: [events[ev_id] for ev_id in ev_ids] for date, ev_ids in days.items()}
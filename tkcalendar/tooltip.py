@@ -112,7 +112,7 @@ class TooltipWrapper:
         the Tooltip is displayed.
 
         """
-        self.widgets = {}  # {widget name: tooltip text, ...}
+        self.widgets = {}  # {widget name: tooltip text or function returning it, ...}
         # keep track of binding ids to cleanly remove them
         self.bind_enter_ids = {}  # {widget name: bind id, ...}
         self.bind_leave_ids = {}  # {widget name: bind id, ...}
@@ -152,13 +152,20 @@ class TooltipWrapper:
         self.tooltip.configure(**kwargs)
 
     def add_tooltip(self, widget, text):
-        """Add new widget to wrapper."""
+        """
+        Add new widget to wrapper.
+
+        text can also be a function without arguments returning the text,
+        it is then called each time the tooltip is displayed and the tooltip
+        is not displayed if it returns None. If text is None, the widget is
+        wrapped but has no tooltip until set_tooltip_text is called.
+        """
         self.widgets[str(widget)] = text
         self.bind_enter_ids[str(widget)] = widget.bind('<Enter>', self._on_enter)
         self.bind_leave_ids[str(widget)] = widget.bind('<Leave>', self._on_leave)
 
     def set_tooltip_text(self, widget, text):
-        """Change tooltip text for given widget."""
+        """Change tooltip text (or function returning it) for given widget, None to hide the tooltip."""
         self.widgets[str(widget)] = text
 
     def remove_all(self):
@@ -171,6 +178,17 @@ class TooltipWrapper:
         self.bind_enter_ids.clear()
         self.bind_leave_ids.clear()
 
+    def destroy(self):
+        """Cancel the pending tooltip display and destroy the tooltip."""
+        if self._timer_id is not None:
+            self.tooltip.after_cancel(self._timer_id)
+            self._timer_id = None
+        self.widgets.clear()
+        self.bind_enter_ids.clear()
+        self.bind_leave_ids.clear()
+        self.current_widget = None
+        self.tooltip.destroy()
+
     def remove_tooltip(self, widget):
         """Remove widget from wrapper."""
         try:
@@ -183,6 +201,17 @@ class TooltipWrapper:
         except KeyError:
             pass
 
+    def restart_tooltip(self, widget):
+        """
+        Hide the tooltip and restart the delay before displaying the one of
+        widget, e.g. when its text depends on the mouse position.
+        """
+        if self._timer_id is not None:
+            widget.after_cancel(self._timer_id)
+        self.tooltip.withdraw()
+        self.current_widget = widget
+        self._timer_id = widget.after(self._delay, self.display_tooltip)
+
     def _on_enter(self, event):
         """Change current widget and launch timer to display tooltip."""
         if not self.tooltip.winfo_ismapped():
@@ -218,7 +247,12 @@ class TooltipWrapper:
             disabled = self.current_widget.cget('state') == "disabled"
 
         if not disabled:
-            self.tooltip['text'] = self.widgets[str(self.current_widget)]
+            text = self.widgets[str(self.current_widget)]
+            if callable(text):
+                text = text()
+            if text is None:
+                return
+            self.tooltip['text'] = text
             self.tooltip.deiconify()
             x = self.current_widget.winfo_pointerx() + 14
             y = self.current_widget.winfo_rooty() + self.current_widget.winfo_height() + 2